@@ -1,6 +1,14 @@
 """Composants applicatifs partagés (middleware, handlers d'erreurs)."""
 
-from .correlation_id import CorrelationIdMiddleware
+from .correlation_id import CorrelationIdMiddleware, get_correlation_id
 from .error_handler import register_exception_handlers
+from .legacy_paths import LegacyPathRewriteMiddleware
+from .request_clock import RequestClockMiddleware
 
-__all__ = ["CorrelationIdMiddleware", "register_exception_handlers"]
+__all__ = [
+    "CorrelationIdMiddleware",
+    "LegacyPathRewriteMiddleware",
+    "RequestClockMiddleware",
+    "get_correlation_id",
+    "register_exception_handlers",
+]
@@ -2,28 +2,59 @@
 
 from __future__ import annotations
 
-from typing import Callable
 from uuid import uuid4
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.correlation import correlation_id_var, get_correlation_id
 
-class CorrelationIdMiddleware(BaseHTTPMiddleware):
-    """Injecte un identifiant de corrélation dans l'état de la requête."""
+__all__ = ["CorrelationIdMiddleware", "correlation_id_var", "get_correlation_id"]
 
-    def __init__(self, app, header_name: str = "X-Request-ID"):
-        super().__init__(app)
-        self.header_name = header_name
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Response]
-    ) -> Response:
-        incoming_id = request.headers.get(self.header_name)
-        trace_id = incoming_id or str(uuid4())
-        request.state.trace_id = trace_id
+class CorrelationIdMiddleware:
+    """Injecte un identifiant de corrélation dans l'état de la requête.
+
+    Middleware ASGI pur : ni tâche ni objets Request/Response supplémentaires
+    par requête, contrairement à ``BaseHTTPMiddleware``.
+    """
 
-        response = await call_next(request)
-        response.headers.setdefault(self.header_name, trace_id)
-        return response
+    def __init__(self, app: ASGIApp, header_name: str = "X-Request-ID"):
+        self.app = app
+        self.header_name = header_name
+        # Les en-têtes ASGI sont des octets en minuscules
+        self._raw_header_name = header_name.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace_id = None
+        for name, value in scope["headers"]:
+            if name == self._raw_header_name:
+                trace_id = value.decode("latin-1")
+                break
+        if not trace_id:
+            trace_id = str(uuid4())
+            # Identifiant généré visible en aval comme un en-tête entrant :
+            # observabilité et handlers d'erreurs réutilisent le même
+            scope["headers"] = [
+                *scope["headers"],
+                (self._raw_header_name, trace_id.encode("latin-1")),
+            ]
+        # request.state lit scope["state"]
+        scope.setdefault("state", {})["trace_id"] = trace_id
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if self.header_name not in headers:
+                    headers.append(self.header_name, trace_id)
+            await send(message)
+
+        token = correlation_id_var.set(trace_id)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            correlation_id_var.reset(token)
@@ -0,0 +1,33 @@
+"""Middleware de compatibilité pour les anciennes routes montées à la racine."""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class LegacyPathRewriteMiddleware:
+    """Réécrit ``/xxx/...`` en ``{target_prefix}/xxx/...`` pour les préfixes connus.
+
+    Remplace le double montage des routeurs à la racine : chaque route n'est
+    déclarée qu'une fois, sous ``target_prefix``.
+    """
+
+    def __init__(self, app: ASGIApp, prefixes: Iterable[str], target_prefix: str):
+        self.app = app
+        # Premier segment du chemin ("auth" pour "/auth/login")
+        self.segments = frozenset(p.strip("/") for p in prefixes if p.strip("/"))
+        self.target_prefix = target_prefix.rstrip("/")
+        self._raw_target_prefix = self.target_prefix.encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path[1:].split("/", 1)[0] in self.segments:
+                scope = dict(scope)
+                scope["path"] = self.target_prefix + path
+                raw_path = scope.get("raw_path")
+                if raw_path is not None:
+                    scope["raw_path"] = self._raw_target_prefix + raw_path
+        await self.app(scope, receive, send)
@@ -0,0 +1,35 @@
+"""Middleware figeant l'instant de référence de chaque requête."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.clock import request_now_var, request_today_var
+
+
+class RequestClockMiddleware:
+    """Pose ``request_now_var`` et ``request_today_var`` au début de la requête.
+
+    Les calculs dépendant de l'heure (ancienneté, mois courant, échéances...)
+    lisent ``app.core.clock.utcnow()`` / ``today()`` : un seul appel à
+    l'horloge par requête et des résultats cohérents entre objets d'une même
+    réponse.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = request_now_var.set(datetime.utcnow())
+        today_token = request_today_var.set(date.today())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_today_var.reset(today_token)
+            request_now_var.reset(token)
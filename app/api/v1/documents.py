@@ -77,7 +77,7 @@ def upload_document_alias(
     dependencies=[Depends(admin_required)],
 )
 def list_documents(db: Session = Depends(get_db)):
-    return db.query(Document).all()
+    return Document.list_as_dicts(db)
 
 
 # Endpoint attendu par tests: /documents/{intervention_id}
@@ -91,7 +91,7 @@ def list_documents_by_intervention(
     intervention_id: int,
     db: Session = Depends(get_db),
 ):
-    return db.query(Document).filter(Document.intervention_id == intervention_id).all()
+    return Document.list_as_dicts(db, intervention_id=intervention_id)
 
 
 @router.delete(
@@ -0,0 +1,28 @@
+"""Horloge de requête : un instant de référence unique par requête HTTP."""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+from datetime import date, datetime
+from typing import Optional
+
+# Instant de début de la requête en cours (posé par RequestClockMiddleware)
+request_now_var: ContextVar[Optional[datetime]] = ContextVar(
+    "request_now", default=None
+)
+# Date locale du début de la requête (date.today(), posée au même moment)
+request_today_var: ContextVar[Optional[date]] = ContextVar(
+    "request_today", default=None
+)
+
+
+def utcnow() -> datetime:
+    """Instant UTC de la requête en cours, datetime.utcnow() hors requête."""
+    now = request_now_var.get()
+    return now if now is not None else datetime.utcnow()
+
+
+def today() -> date:
+    """Date locale de la requête en cours, date.today() hors requête."""
+    current = request_today_var.get()
+    return current if current is not None else date.today()
@@ -1,9 +1,10 @@
 # app/core/config.py
 
 import os
-from typing import List
+from functools import cached_property
+from typing import FrozenSet, List, Optional, Tuple
 
-from pydantic import Field
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -44,6 +45,11 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = Field(default="db")
     POSTGRES_PORT: int = Field(default=5432)
 
+    # Pool de connexions SQLAlchemy
+    DB_POOL_SIZE: int = Field(default=20)
+    DB_MAX_OVERFLOW: int = Field(default=40)
+    DB_POOL_RECYCLE: int = Field(default=1800)  # secondes
+
     # Répertoire d’upload de fichiers
     UPLOAD_DIRECTORY: str = Field(default="app/static/uploads")
 
@@ -72,9 +78,35 @@ class Settings(BaseSettings):
     CORS_EXPOSE_HEADERS: List[str] = Field(default_factory=lambda: ["X-Request-ID"])
     CORS_ALLOW_CREDENTIALS: bool = Field(default=True)
 
+    @field_validator(
+        "CORS_ALLOW_ORIGINS",
+        "CORS_ALLOW_METHODS",
+        "CORS_ALLOW_HEADERS",
+        "CORS_EXPOSE_HEADERS",
+        mode="after",
+    )
+    @classmethod
+    def _freeze_cors_list(cls, value: List[str]) -> Tuple[str, ...]:
+        # Figées au chargement : pas de copie ni de mutation ultérieure
+        return tuple(value)
+
+    @cached_property
+    def cors_allow_origins_set(self) -> FrozenSet[str]:
+        """Origines CORS autorisées, pour des tests d'appartenance en O(1)."""
+        return frozenset(self.CORS_ALLOW_ORIGINS)
+
     # Scheduler toggle
     ENABLE_SCHEDULER: bool = Field(default=False)
 
+    # Routes API aussi servies à la racine (compatibilité), réécrites vers API_V1_STR
+    MOUNT_LEGACY_ROUTES: bool = Field(default=True)
+
+    # Schéma OpenAPI et pages /docs, /redoc (construits au premier appel)
+    ENABLE_OPENAPI: bool = Field(default=True)
+    # Schéma pré-généré (scripts/dump_openapi.py) servi tel quel, sans
+    # parcours des modèles au premier appel de /openapi.json
+    OPENAPI_SCHEMA_FILE: Optional[str] = Field(default=None)
+
     # Environment 
     ENVIRONMENT: str = Field(default="development")  # development, production
     DEBUG: bool = Field(default=False)
@@ -82,6 +114,19 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str = Field(default="INFO")
 
+    # OpenTelemetry - BatchSpanProcessor
+    OTEL_BSP_MAX_QUEUE_SIZE: int = Field(default=4096)
+    OTEL_BSP_MAX_EXPORT_BATCH_SIZE: int = Field(default=512)
+    OTEL_BSP_SCHEDULE_DELAY: int = Field(default=1000)  # millisecondes
+    OTEL_BSP_EXPORT_TIMEOUT: int = Field(default=10000)  # millisecondes
+
+    # OpenTelemetry - exporter OTLP gRPC ("gzip" ou "none")
+    OTEL_EXPORTER_OTLP_COMPRESSION: str = Field(default="gzip")
+    OTEL_MAX_CONCURRENT_EXPORTS: int = Field(default=1)  # exports OTLP en vol (>1 : opt-in)
+
+    # OpenTelemetry - commentaires SQL avec trace ID (coût par requête SQL)
+    OTEL_SQL_COMMENTER_ENABLED: bool = Field(default=False)
+
     @property
     def DATABASE_URL(self) -> str:
         return (
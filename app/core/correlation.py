@@ -0,0 +1,13 @@
+"""Identifiant de corrélation (X-Request-ID) de la requête en cours."""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+
+# Posé par CorrelationIdMiddleware, lisible sans objet Request (logs, services)
+correlation_id_var: ContextVar[str] = ContextVar("correlation_id", default="")
+
+
+def get_correlation_id() -> str:
+    """Retourne l'identifiant de corrélation de la requête en cours ("" hors requête)."""
+    return correlation_id_var.get()
@@ -7,6 +7,7 @@ from datetime import datetime
 from pathlib import Path
 
 from app.core.config import settings
+from app.core.correlation import get_correlation_id
 
 
 class JSONFormatter(logging.Formatter):
@@ -23,6 +24,11 @@ class JSONFormatter(logging.Formatter):
             "line": record.lineno,
         }
 
+        # Identifiant de corrélation de la requête en cours (X-Request-ID)
+        correlation_id = get_correlation_id()
+        if correlation_id:
+            log_entry["correlation_id"] = correlation_id
+
         # Add exception info if present
         if record.exc_info:
             log_entry["exception"] = self.formatException(record.exc_info)
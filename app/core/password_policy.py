@@ -1,7 +1,51 @@
 # app/core/password_policy.py
 
 import re
-from typing import List
+from typing import Iterator, List
+
+# Mots de passe courants interdits, stockés en minuscules
+COMMON_PASSWORDS = frozenset({
+    "password", "123456", "123456789", "qwerty", "abc123",
+    "password123", "admin", "root", "user", "test", "guest"
+})
+_COMMON_PASSWORDS_MAX_LEN = max(map(len, COMMON_PASSWORDS))
+
+
+def _iter_policy_failures(password: str) -> Iterator[str]:
+    """Produit paresseusement les erreurs de politique, dans l'ordre des règles."""
+    # Longueur minimale
+    if len(password) < 8:
+        yield "Le mot de passe doit contenir au moins 8 caractères"
+
+    # Lettre minuscule
+    if not re.search(r'[a-z]', password):
+        yield "Le mot de passe doit contenir au moins une lettre minuscule"
+
+    # Lettre majuscule
+    if not re.search(r'[A-Z]', password):
+        yield "Le mot de passe doit contenir au moins une lettre majuscule"
+
+    # Chiffre
+    if not re.search(r'[0-9]', password):
+        yield "Le mot de passe doit contenir au moins un chiffre"
+
+    # Caractère spécial
+    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        yield "Le mot de passe doit contenir au moins un caractère spécial (!@#$%^&*(),.?\":{}|<>)"
+
+    # Mots de passe courants interdits (lower() évité au-delà de la longueur max)
+    if (
+        len(password) <= _COMMON_PASSWORDS_MAX_LEN
+        and password.lower() in COMMON_PASSWORDS
+    ):
+        yield "Ce mot de passe est trop courant et n'est pas autorisé"
+
+
+def _any_policy_failure(password: str) -> bool:
+    """Retourne True dès la première règle non respectée."""
+    for _ in _iter_policy_failures(password):
+        return True
+    return False
 
 
 def validate_password_strength(password: str) -> List[str]:
@@ -21,37 +65,7 @@ def validate_password_strength(password: str) -> List[str]:
     Returns:
         List[str]: Liste des erreurs (vide si valide)
     """
-    errors = []
-    
-    # Longueur minimale
-    if len(password) < 8:
-        errors.append("Le mot de passe doit contenir au moins 8 caractères")
-    
-    # Lettre minuscule
-    if not re.search(r'[a-z]', password):
-        errors.append("Le mot de passe doit contenir au moins une lettre minuscule")
-    
-    # Lettre majuscule
-    if not re.search(r'[A-Z]', password):
-        errors.append("Le mot de passe doit contenir au moins une lettre majuscule")
-    
-    # Chiffre
-    if not re.search(r'[0-9]', password):
-        errors.append("Le mot de passe doit contenir au moins un chiffre")
-    
-    # Caractère spécial
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-        errors.append("Le mot de passe doit contenir au moins un caractère spécial (!@#$%^&*(),.?\":{}|<>)")
-    
-    # Mots de passe courants interdits
-    common_passwords = [
-        "password", "123456", "123456789", "qwerty", "abc123", 
-        "password123", "admin", "root", "user", "test", "guest"
-    ]
-    if password.lower() in common_passwords:
-        errors.append("Ce mot de passe est trop courant et n'est pas autorisé")
-    
-    return errors
+    return list(_iter_policy_failures(password))
 
 
 def is_password_valid(password: str) -> bool:
@@ -64,4 +78,4 @@ def is_password_valid(password: str) -> bool:
     Returns:
         bool: True si le mot de passe est valide
     """
-    return len(validate_password_strength(password)) == 0
\ No newline at end of file
+    return not _any_policy_failure(password)
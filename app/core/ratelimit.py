@@ -1,21 +1,60 @@
 # app/core/ratelimit.py
 
-from collections import defaultdict
+from collections import OrderedDict, deque
 from time import time
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 WINDOW = 60  # fenêtre en secondes
 LIMIT = 120  # requêtes par fenêtre
-_hits = defaultdict(list)
+MAX_TRACKED_CLIENTS = 10000  # borne mémoire : IP les moins récentes évincées (LRU)
 
+# Réponse 429 pré-encodée : le rejet n'alloue aucun objet Response
+_REJECT_BODY = b'{"detail":"Too Many Requests"}'
+_REJECT_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_REJECT_BODY)).encode()),
+    (b"retry-after", str(WINDOW).encode()),
+]
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        ip = request.client.host
-        now = time()
-        _hits[ip] = [t for t in _hits[ip] if now - t < WINDOW] + [now]
-        if len(_hits[ip]) > LIMIT:
-            return JSONResponse({"detail": "Too Many Requests"}, status_code=429)
-        return await call_next(request)
+# IP -> horodatages des dernières requêtes ; LIMIT + 1 suffisent pour décider
+_hits: "OrderedDict[str, deque]" = OrderedDict()
+
+
+def _register_hit(ip: str, now: float) -> bool:
+    """Enregistre une requête et retourne True si la limite est dépassée."""
+    hits = _hits.get(ip)
+    if hits is None:
+        hits = _hits[ip] = deque(maxlen=LIMIT + 1)
+        if len(_hits) > MAX_TRACKED_CLIENTS:
+            _hits.popitem(last=False)
+    else:
+        _hits.move_to_end(ip)
+
+    cutoff = now - WINDOW
+    while hits and hits[0] <= cutoff:
+        hits.popleft()
+    hits.append(now)
+    return len(hits) > LIMIT
+
+
+class RateLimitMiddleware:
+    """Limite le débit par IP cliente (middleware ASGI pur)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            client = scope.get("client")
+            if _register_hit(client[0] if client else "", time()):
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": 429,
+                        "headers": _REJECT_HEADERS,
+                    }
+                )
+                await send({"type": "http.response.body", "body": _REJECT_BODY})
+                return
+        await self.app(scope, receive, send)
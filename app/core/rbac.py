@@ -1,12 +1,15 @@
 # app/core/rbac.py
 
+import sys
+from functools import lru_cache
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from jose import JWTError
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.security import decode_jwt
 from app.db.database import get_db
 
 # OAuth2 JWT
@@ -18,7 +21,7 @@ def decode_token(token: str) -> dict:
     Décode le JWT et retourne le payload, ou lève une erreur si invalide.
     """
     try:
-        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        return decode_jwt(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Token invalide ou expiré"
@@ -43,10 +46,16 @@ def get_current_user(
     role = payload.get("role")
     if not role:
         raise HTTPException(status_code=403, detail="Rôle manquant dans le token")
+    if type(role) is str:
+        # Interné : partage l'objet (et son hash) avec les littéraux de rôles
+        role = sys.intern(role)
 
     # Identifiants possibles dans le token
     user_id = payload.get("user_id")
     sub = payload.get("sub")  # peut être un email ou un id
+    sub_str = sub if isinstance(sub, str) or sub is None else str(sub)
+    # isdigit seul accepte "١٢" ou "²" : id numérique en chiffres ASCII uniquement
+    sub_is_digit = sub_str is not None and sub_str.isascii() and sub_str.isdigit()
 
     # Tente de récupérer un utilisateur réel si possible
     user_obj = None
@@ -55,17 +64,15 @@ def get_current_user(
             user_obj = get_user_by_id(db, int(user_id))
         except Exception:
             user_obj = None
-    elif sub is not None:
+    elif sub_str is not None:
         # Essaye d'interpréter sub comme id numérique, sinon email
         try:
-            numeric_id = int(str(sub))
-            user_obj = get_user_by_id(db, numeric_id)
+            if sub_is_digit:
+                user_obj = get_user_by_id(db, int(sub_str))
+            else:
+                user_obj = get_user_by_email(db, sub_str)
         except Exception:
-            # sinon, tente par email
-            try:
-                user_obj = get_user_by_email(db, str(sub))
-            except Exception:
-                user_obj = None
+            user_obj = None
 
     if user_obj is not None:
         if not getattr(user_obj, "is_active", True):
@@ -84,8 +91,8 @@ def get_current_user(
     try:
         if user_id is not None:
             fallback_id = int(user_id)
-        elif sub is not None and str(sub).isdigit():
-            fallback_id = int(str(sub))
+        elif sub_is_digit:
+            fallback_id = int(sub_str)
     except Exception:
         fallback_id = None
 
@@ -100,16 +107,25 @@ def get_current_user(
 def require_roles(*roles: str):
     """
     Fabrique une dépendance FastAPI pour n'autoriser que certains rôles.
+
+    Les rôles sont normalisés (triés) afin que ``require_roles("a", "b")`` et
+    ``require_roles("b", "a")`` renvoient le même objet dépendance, ce qui
+    permet à FastAPI de le dédupliquer dans l'arbre de dépendances.
     """
+    return _build_role_checker(tuple(sorted(roles)))
+
+
+@lru_cache(maxsize=None)
+def _build_role_checker(roles: tuple):
+    allowed = frozenset(sys.intern(r) for r in roles)
 
     def role_checker(current_user=Depends(get_current_user)):
         # Supporte current_user en dict ou objet
-        role_value = None
         if isinstance(current_user, dict):
             role_value = current_user.get("role")
         else:
             role_value = getattr(current_user, "role", None)
-        if role_value not in roles:
+        if role_value not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Accès réservé aux rôles : {roles}",
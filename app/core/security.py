@@ -1,15 +1,24 @@
 # app/core/security.py
 
 import os
+from calendar import timegm
 from datetime import datetime, timedelta
 
+import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
+from jose import JWTError, jws, jwt
+from jose.exceptions import ExpiredSignatureError, JWSError, JWTClaimsError
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
+# orjson (extension C) accélère le parsing du payload JWT ; repli sur json sinon
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    from json import loads as _json_loads
+
 # Configuration du hash de mot de passe
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -27,28 +36,57 @@ def get_password_hash(password: str) -> str:
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Vérifie si le mot de passe correspond au hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Vérifie si le mot de passe correspond au hash (appel direct à bcrypt)"""
+    if isinstance(hashed_password, str):
+        hashed_password = hashed_password.encode()
+    return bcrypt.checkpw(plain_password.encode(), hashed_password)
 
 
 def validate_password_policy(password: str) -> None:
     """
     Valide la politique de mot de passe selon les critères OWASP Go-Prod.
-    
+
     Raises:
         HTTPException: Si le mot de passe ne respecte pas la politique
     """
     from app.core.password_policy import validate_password_strength
-    
+
     errors = validate_password_strength(password)
     if errors:
         error_message = "Mot de passe invalide: " + "; ".join(errors)
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, 
-            detail=error_message
+            status_code=status.HTTP_400_BAD_REQUEST, detail=error_message
         )
 
 
+def _rsa_key_available(path: str) -> bool:
+    return settings.JWT_ALGORITHM == "RS256" and bool(path) and os.path.exists(path)
+
+
+def reload_keys() -> None:
+    """
+    Résout une fois pour toutes l'algorithme et les clés JWT (RSA ou HMAC).
+
+    À rappeler après une rotation des clés : les appels à create_access_token
+    et verify_token n'interrogent plus le système de fichiers.
+    """
+    global _SIGNING_KEY, _SIGNING_ALG, _VERIFY_KEY, _VERIFY_ALGS
+
+    if _rsa_key_available(settings.JWT_PRIVATE_KEY_PATH):
+        _SIGNING_KEY, _SIGNING_ALG = settings.get_jwt_private_key(), "RS256"
+    else:
+        # Fallback HMAC pour compatibilité/tests
+        _SIGNING_KEY, _SIGNING_ALG = settings.SECRET_KEY, settings.ALGORITHM
+
+    if _rsa_key_available(settings.JWT_PUBLIC_KEY_PATH):
+        _VERIFY_KEY, _VERIFY_ALGS = settings.get_jwt_public_key(), ["RS256"]
+    else:
+        _VERIFY_KEY, _VERIFY_ALGS = settings.SECRET_KEY, [settings.ALGORITHM]
+
+
+reload_keys()
+
+
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     """Crée un token JWT d'accès avec expiration (RSA ou HMAC selon config)"""
     to_encode = data.copy()
@@ -56,29 +94,60 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
         expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
     to_encode.update({"exp": expire})
-    
-    # Utiliser RSA si les clés sont disponibles, sinon fallback HMAC
-    if settings.JWT_ALGORITHM == "RS256" and settings.JWT_PRIVATE_KEY_PATH and os.path.exists(settings.JWT_PRIVATE_KEY_PATH):
-        private_key = settings.get_jwt_private_key()
-        return jwt.encode(to_encode, private_key, algorithm="RS256")
-    else:
-        # Fallback HMAC pour compatibilité/tests
-        return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jwt.encode(to_encode, _SIGNING_KEY, algorithm=_SIGNING_ALG)
+
+
+def _validate_claims(claims: dict) -> None:
+    """
+    Valide les claims standards comme ``jose.jwt.decode`` sans audience.
+
+    exp / nbf / iat doivent être numériques, exp passé ou nbf futur rejettent
+    le token ; sub doit être une chaîne ; un token portant aud est refusé
+    (aucune audience attendue).
+    """
+    now = timegm(datetime.utcnow().utctimetuple())
+    for name in ("exp", "nbf", "iat"):
+        if name in claims and (
+            isinstance(claims[name], bool) or not isinstance(claims[name], (int, float))
+        ):
+            raise JWTClaimsError(f"Claim {name} must be an integer.")
+    if "exp" in claims and claims["exp"] < now:
+        raise ExpiredSignatureError("Signature has expired.")
+    if "nbf" in claims and claims["nbf"] > now:
+        raise JWTClaimsError("The token is not yet valid (nbf)")
+    if "sub" in claims and not isinstance(claims["sub"], str):
+        raise JWTClaimsError("Subject must be a string.")
+    if "aud" in claims:
+        raise JWTClaimsError("Invalid audience")
+
+
+def decode_jwt(token: str, key: str, algorithms: list) -> dict:
+    """
+    Équivalent de ``jose.jwt.decode`` dont le payload est parsé avec orjson.
+
+    La signature est vérifiée par ``jws.verify`` puis les claims standards
+    (exp, nbf, iat, sub) sont validés ici, sans API privée de jose.
+    """
+    try:
+        payload = jws.verify(token, key, algorithms)
+    except JWSError as e:
+        raise JWTError(e)
+
+    try:
+        claims = _json_loads(payload)
+    except ValueError as e:
+        raise JWTError(f"Invalid payload string: {e}")
+    if not isinstance(claims, dict):
+        raise JWTError("Invalid payload string: must be a json object")
+
+    _validate_claims(claims)
+    return claims
 
 
 def verify_token(token: str) -> dict:
     """Vérifie et décode un token JWT (RSA ou HMAC selon config)"""
     try:
-        # Essayer RSA d'abord si configuré
-        if settings.JWT_ALGORITHM == "RS256" and settings.JWT_PUBLIC_KEY_PATH and os.path.exists(settings.JWT_PUBLIC_KEY_PATH):
-            public_key = settings.get_jwt_public_key()
-            payload = jwt.decode(token, public_key, algorithms=["RS256"])
-        else:
-            # Fallback HMAC
-            payload = jwt.decode(
-                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-            )
-        return payload
+        return decode_jwt(token, _VERIFY_KEY, algorithms=_VERIFY_ALGS)
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
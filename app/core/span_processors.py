@@ -0,0 +1,36 @@
+# app/core/span_processors.py
+
+"""
+Span processors OpenTelemetry propres à l'application.
+
+Module importé à la demande par app.core.tracing : il dépend du SDK
+OpenTelemetry, chargé uniquement lorsqu'un exporter est configuré.
+"""
+
+import itertools
+from typing import Sequence
+
+from opentelemetry.sdk.trace import SpanProcessor
+
+
+class RoundRobinSpanProcessor(SpanProcessor):
+    """
+    Répartit les spans terminés entre plusieurs processors en tourniquet.
+
+    Chaque BatchSpanProcessor n'a qu'un thread d'export : en répartissant sur N
+    processors, N exports OTLP peuvent être en vol simultanément.
+    """
+
+    def __init__(self, processors: Sequence[SpanProcessor]):
+        self._processors = tuple(processors)
+        self._next = itertools.cycle(self._processors)
+
+    def on_end(self, span) -> None:
+        next(self._next).on_end(span)
+
+    def shutdown(self) -> None:
+        for processor in self._processors:
+            processor.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return all(p.force_flush(timeout_millis) for p in self._processors)
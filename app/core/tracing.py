@@ -5,30 +5,54 @@ Configuration OpenTelemetry pour traçage distribué Go-Prod.
 """
 
 import os
-from typing import Optional
+import sys
+from typing import TYPE_CHECKING, Optional
 
+# SDK, exporters (grpc/protobuf) et instrumentations sont importés à la
+# demande : les processus sans exporter configuré ne les chargent jamais
 from opentelemetry import trace
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.requests import RequestsInstrumentor
-from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
 
 from app.core.config import settings
 from app.core.logging import get_logger
 
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace import TracerProvider
+
 logger = get_logger(__name__)
 
+# Endpoints de monitoring exclus du tracing FastAPI (surchargeable par l'env)
+_DEFAULT_EXCLUDED_URLS = "/health,/live,/ready,/metrics"
+
+# Endpoint du collecteur OTLP, lu une seule fois à l'import
+_OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+
+# En-tête d'authentification OTLP, calculé une seule fois
+_OTLP_HEADERS = (
+    {"authorization": f"Bearer {token}"}
+    if (token := os.getenv("OTEL_EXPORTER_OTLP_HEADERS"))
+    else None
+)
+
+# Keepalive du canal gRPC : la connexion vers le collecteur reste ouverte
+# entre deux exports au lieu d'être rétablie à chaque batch. Des options
+# identiques pour tous les exporters leur font partager la même connexion
+# HTTP/2 via le pool global de sous-canaux gRPC.
+_OTLP_CHANNEL_OPTIONS = (
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    # Pings illimités sans données : le keepalive ne s'arrête pas en période calme
+    ("grpc.http2.max_pings_without_data", 0),
+)
+
 
 class TracingService:
     """Service de configuration OpenTelemetry."""
     
     def __init__(self):
-        self.tracer_provider: Optional[TracerProvider] = None
+        self.tracer_provider: Optional["TracerProvider"] = None
         self.tracer = None
         self.instrumented = False
+        self._has_exporter = False
     
     def initialize_tracing(self, app=None):
         """
@@ -41,7 +65,25 @@ class TracingService:
             logger.info("Tracing déjà initialisé")
             return
         
+        # En tests : pas d'export ni d'instrumentation (hooks SQL par requête)
+        if "pytest" in sys.modules or settings.ENVIRONMENT == "test":
+            trace.set_tracer_provider(trace.NoOpTracerProvider())
+            self.tracer = trace.get_tracer(__name__)
+            self.instrumented = True
+            logger.info("Tracing désactivé (environnement de test)")
+            return
+        
+        # Ni collecteur ni mode debug : aucun span exporté, SDK jamais importé
+        if not (_OTLP_ENDPOINT or settings.DEBUG):
+            self.tracer = trace.get_tracer(__name__)
+            self.instrumented = True
+            logger.info("Aucun exporter configuré, tracing désactivé")
+            return
+        
         try:
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+
             # Configuration du service resource
             resource = Resource.create({
                 "service.name": settings.PROJECT_NAME,
@@ -57,8 +99,11 @@ class TracingService:
             # Configurer les exporters
             self._configure_exporters()
             
-            # Instrumentation automatique
-            self._setup_instrumentations(app)
+            # Instrumentation automatique, inutile si aucun span n'est exporté
+            if self._has_exporter:
+                self._setup_instrumentations(app)
+            else:
+                logger.info("Aucun exporter configuré, instrumentation ignorée")
             
             # Obtenir le tracer
             self.tracer = trace.get_tracer(__name__)
@@ -74,19 +119,21 @@ class TracingService:
         """Configure les exporters de spans."""
         
         # OTLP Exporter (Jaeger, etc.)
-        otlp_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+        otlp_endpoint = _OTLP_ENDPOINT
         if otlp_endpoint:
             try:
-                otlp_exporter = OTLPSpanExporter(
-                    endpoint=otlp_endpoint,
-                    headers=(
-                        {"authorization": f"Bearer {os.getenv('OTEL_EXPORTER_OTLP_HEADERS')}"}
-                        if os.getenv('OTEL_EXPORTER_OTLP_HEADERS')
-                        else {}
-                    ),
-                )
-                span_processor = BatchSpanProcessor(otlp_exporter)
+                processors = [
+                    self._batch_processor(self._otlp_exporter(otlp_endpoint))
+                    for _ in range(max(1, settings.OTEL_MAX_CONCURRENT_EXPORTS))
+                ]
+                if len(processors) == 1:
+                    span_processor = processors[0]
+                else:
+                    from app.core.span_processors import RoundRobinSpanProcessor
+
+                    span_processor = RoundRobinSpanProcessor(processors)
                 self.tracer_provider.add_span_processor(span_processor)
+                self._has_exporter = True
                 logger.info(f"OTLP exporter configuré: {otlp_endpoint}")
                 
             except Exception as e:
@@ -94,28 +141,75 @@ class TracingService:
         
         # Console exporter pour développement
         if settings.DEBUG:
+            from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
             console_exporter = ConsoleSpanExporter()
-            console_processor = BatchSpanProcessor(console_exporter)
+            console_processor = self._batch_processor(console_exporter)
             self.tracer_provider.add_span_processor(console_processor)
+            self._has_exporter = True
             logger.info("Console exporter activé (mode debug)")
     
+    @staticmethod
+    def _otlp_exporter(otlp_endpoint: str):
+        """Crée un exporter OTLP gRPC vers le collecteur."""
+        from grpc import Compression
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
+            OTLPSpanExporter,
+        )
+
+        return OTLPSpanExporter(
+            endpoint=otlp_endpoint,
+            headers=_OTLP_HEADERS,
+            compression=(
+                Compression.Gzip
+                if settings.OTEL_EXPORTER_OTLP_COMPRESSION.lower() == "gzip"
+                else Compression.NoCompression
+            ),
+            channel_options=_OTLP_CHANNEL_OPTIONS,
+        )
+    
+    @staticmethod
+    def _batch_processor(exporter):
+        """Crée un BatchSpanProcessor dimensionné depuis les settings."""
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+        return BatchSpanProcessor(
+            exporter,
+            max_queue_size=settings.OTEL_BSP_MAX_QUEUE_SIZE,
+            max_export_batch_size=settings.OTEL_BSP_MAX_EXPORT_BATCH_SIZE,
+            schedule_delay_millis=settings.OTEL_BSP_SCHEDULE_DELAY,
+            export_timeout_millis=settings.OTEL_BSP_EXPORT_TIMEOUT,
+        )
+    
     def _setup_instrumentations(self, app=None):
         """Configure l'instrumentation automatique."""
         
         try:
+            from opentelemetry.instrumentation.requests import RequestsInstrumentor
+            from opentelemetry.instrumentation.sqlalchemy import (
+                SQLAlchemyInstrumentor,
+            )
+
             # FastAPI instrumentation
             if app:
+                from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
+                # Liste passée à l'instrumentor : l'environnement du process
+                # n'est pas modifié
                 FastAPIInstrumentor.instrument_app(
                     app,
                     tracer_provider=self.tracer_provider,
-                    excluded_urls="/health,/live,/ready,/metrics",  # Exclure les endpoints de monitoring
+                    excluded_urls=os.getenv(
+                        "OTEL_PYTHON_FASTAPI_EXCLUDED_URLS", _DEFAULT_EXCLUDED_URLS
+                    ),
                 )
                 logger.info("Instrumentation FastAPI activée")
             
             # SQLAlchemy instrumentation
             SQLAlchemyInstrumentor().instrument(
                 tracer_provider=self.tracer_provider,
-                enable_commenter=True,  # Ajouter des commentaires SQL avec trace ID
+                # Commentaires SQL avec trace ID, désactivés par défaut
+                enable_commenter=settings.OTEL_SQL_COMMENTER_ENABLED,
             )
             logger.info("Instrumentation SQLAlchemy activée")
             
@@ -141,8 +235,7 @@ class TracingService:
     def add_span_attributes(self, span, attributes: dict):
         """Ajoute des attributs à un span."""
         if span:
-            for key, value in attributes.items():
-                span.set_attribute(key, value)
+            span.set_attributes(attributes)
     
     def record_exception(self, span, exception: Exception):
         """Enregistre une exception dans un span."""
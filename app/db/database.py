@@ -1,17 +1,25 @@
 # app/db/database.py
 
+import os
 import sys
+import threading
 from typing import Generator
 
 from sqlalchemy import create_engine
 from sqlalchemy.exc import NoSuchModuleError, OperationalError
-from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+# Initialisation de Base (style déclaratif SQLAlchemy 2.0)
+class Base(DeclarativeBase):
+    pass
 
-# Initialisation de Base
-Base = declarative_base()
 
 # URL principale construite depuis les settings
 DATABASE_URL = settings.DATABASE_URL
@@ -25,8 +33,9 @@ def _create_default_engine():
       bascule sur SQLite en mémoire.
     Ce fallback évite l'échec d'import lors des tests qui remplacent get_db.
     """
-    # En mode test (pytest), on force SQLite en mémoire pour isolation/rapidité
-    if "pytest" in sys.modules:
+    # En mode test (pytest), on force SQLite en mémoire pour isolation/rapidité.
+    # La variable posée par pytest est testée d'abord (lookup le moins coûteux)
+    if os.getenv("PYTEST_CURRENT_TEST") or "pytest" in sys.modules:
         return create_engine(
             "sqlite://",
             connect_args={"check_same_thread": False},
@@ -34,12 +43,19 @@ def _create_default_engine():
         )
 
     try:
-        eng = create_engine(DATABASE_URL)
+        eng = create_engine(
+            DATABASE_URL,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_pre_ping=True,  # écarte les connexions mortes avant usage
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_use_lifo=True,  # garde un noyau de connexions chaudes
+        )
     except (NoSuchModuleError, ModuleNotFoundError, ImportError) as exc:
-        print(
+        logger.warning(
             "Creation de l'engine Postgres impossible (driver manquant), "
-            "fallback SQLite memoire: "
-            f"{getattr(exc, 'msg', str(exc))}"
+            "fallback SQLite memoire: %s",
+            getattr(exc, "msg", exc),
         )
         return create_engine(
             "sqlite://",
@@ -48,9 +64,9 @@ def _create_default_engine():
         )
     except Exception as exc:
         # Toute autre erreur de création doit être remontée pour faciliter le debug
-        print(
-            "Creation de l'engine Postgres impossible: "
-            f"{getattr(exc, 'msg', str(exc))}"
+        logger.error(
+            "Creation de l'engine Postgres impossible: %s",
+            getattr(exc, "msg", exc),
         )
         raise
 
@@ -61,48 +77,66 @@ def _create_default_engine():
         with eng.connect() as _:
             pass
     except OperationalError as exc:
-        print(
-            "Connexion PostgreSQL indisponible (engine conservé): "
-            f"{getattr(exc, 'orig', exc)}"
+        logger.warning(
+            "Connexion PostgreSQL indisponible (engine conservé): %s",
+            getattr(exc, "orig", exc),
         )
     except Exception as exc:
-        print(
-            "Verification de l'engine Postgres échouée (engine conservé): "
-            f"{getattr(exc, 'msg', str(exc))}"
+        logger.warning(
+            "Verification de l'engine Postgres échouée (engine conservé): %s",
+            getattr(exc, "msg", exc),
         )
     return eng
 
 
 engine = _create_default_engine()
+# Le backend est figé à la création de l'engine : inutile de le recalculer
+_IS_SQLITE = engine.url.get_backend_name() == "sqlite"
 
-_SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Les objets restent chargés après commit : pas de SELECT implicite à la
+# relecture d'un attribut (la session de get_db est fermée après la réponse)
+_SessionFactory = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 # Initialisation paresseuse du schéma en mode SQLite mémoire
 _schema_initialized = False
+_schema_lock = threading.Lock()
 
-# Assure le schéma si des tests utilisent directement SessionLocal sans
-# passer par get_db
-if engine.url.get_backend_name() == "sqlite":
-    try:
+
+def _ensure_schema() -> None:
+    """Crée le schéma une seule fois, même si plusieurs threads s'y présentent."""
+    global _schema_initialized
+    if _schema_initialized:
+        return
+    with _schema_lock:
+        if _schema_initialized:
+            return
         # Import des modèles pour enregistrer toutes les tables
-        import app.models  # noqa: F401
+        from app.models import load_all_models
+
+        load_all_models()
 
         Base.metadata.create_all(bind=engine)
         _schema_initialized = True
+
+
+# Assure le schéma si des tests utilisent directement SessionLocal sans
+# passer par get_db
+if _IS_SQLITE:
+    try:
+        _ensure_schema()
     except Exception as exc:
-        print(f"Initialisation immédiate du schéma SQLite échouée: {exc}")
+        logger.warning("Initialisation immédiate du schéma SQLite échouée: %s", exc)
 
 
 def get_db() -> Generator[Session, None, None]:
-    global _schema_initialized
     # Crée le schéma si on est en SQLite mémoire et pas encore initialisé
-    if engine.url.get_backend_name() == "sqlite" and not _schema_initialized:
+    if _IS_SQLITE and not _schema_initialized:
         try:
-            # Import des modèles pour que toutes les tables soient enregistrées
-            Base.metadata.create_all(bind=engine)
-            _schema_initialized = True
+            _ensure_schema()
         except Exception as exc:
-            print(f"Initialisation du schéma SQLite échouée: {exc}")
+            logger.warning("Initialisation du schéma SQLite échouée: %s", exc)
 
     db = SessionLocal()
     try:
@@ -113,12 +147,11 @@ def get_db() -> Generator[Session, None, None]:
 
 # Fournit une session tout en garantissant le schéma en mode SQLite mémoire
 def SessionLocal() -> Session:
-    global _schema_initialized
-    if engine.url.get_backend_name() == "sqlite":
+    if _IS_SQLITE and not _schema_initialized:
         try:
-            # create_all avec checkfirst garantit la présence des tables
-            Base.metadata.create_all(bind=engine)
-            _schema_initialized = True
+            _ensure_schema()
         except Exception as exc:
-            print(f"Initialisation à la volée du schéma SQLite échouée: {exc}")
+            logger.warning(
+                "Initialisation à la volée du schéma SQLite échouée: %s", exc
+            )
     return _SessionFactory()
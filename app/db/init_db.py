@@ -1,8 +1,31 @@
 # app/db/init_db.py
 
-from app.db.database import Base, engine
+from pathlib import Path
+
+from app.db.database import _IS_SQLITE, DATABASE_URL, Base, engine
+
+# Racine du projet (emplacement d'alembic.ini)
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
 
 def init_db():
-    # Crée toutes les tables définies dans les modèles
-    Base.metadata.create_all(bind=engine)
+    # SQLite (tests) : pas de migrations, création directe depuis les modèles
+    if _IS_SQLITE:
+        from app.models import load_all_models
+
+        load_all_models()
+        Base.metadata.create_all(bind=engine)
+        return
+
+    # Sinon le schéma est celui des migrations Alembic (index et contraintes
+    # compris), appliquées en une seule passe jusqu'à head
+    from alembic import command
+    from alembic.config import Config
+
+    cfg = Config(str(_PROJECT_ROOT / "alembic.ini"))
+    cfg.set_main_option(
+        "script_location", str(_PROJECT_ROOT / "app" / "db" / "migrations")
+    )
+    # Échappe les % pour l'interpolation ConfigParser
+    cfg.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
+    command.upgrade(cfg, "head")
@@ -2,10 +2,10 @@ import os
 import sys
 
 from alembic import context
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import engine_from_config, make_url, pool, text
 
 # Import models and Base for Alembic
-from app import models  # noqa: F401
+from app import models
 from app.db.database import Base
 
 # Ajouter le chemin racine du projet pour les imports "app.*"
@@ -20,7 +20,8 @@ config = context.config
 # from app.models import user, technicien, equipement, intervention,
 #     document, notification, historique
 
-# Fournir à Alembic le metadata pour autogenerate
+# Fournir à Alembic le metadata pour autogenerate (tous les modèles chargés)
+models.load_all_models()
 target_metadata = Base.metadata
 
 # Permettre la surcharge de l'URL DB via la variable d'environnement DATABASE_URL
@@ -28,6 +29,19 @@ db_url_env = os.getenv("DATABASE_URL")
 if db_url_env:
     config.set_main_option("sqlalchemy.url", db_url_env)
 
+# Attente maximale d'un verrou par une migration PostgreSQL : un ALTER bloqué
+# échoue vite au lieu de mettre en file toutes les requêtes derrière lui
+LOCK_TIMEOUT = os.getenv("MIGRATION_LOCK_TIMEOUT", "1s")
+
+# Clé du verrou consultatif PostgreSQL partagé par tous les processus qui
+# lancent les migrations (workers démarrés en parallèle)
+MIGRATION_ADVISORY_LOCK_KEY = 720_112_001
+
+
+def _is_postgresql() -> bool:
+    url = make_url(config.get_main_option("sqlalchemy.url"))
+    return url.get_backend_name() == "postgresql"
+
 
 def run_migrations_offline() -> None:
     """Exécuter les migrations en mode 'offline' (sans DB connectée)."""
@@ -40,6 +54,10 @@ def run_migrations_offline() -> None:
     )
 
     with context.begin_transaction():
+        # En SQL généré, un RESET lock_timeout revient à la valeur du serveur :
+        # exécuter le script avec PGOPTIONS="-c lock_timeout=..." pour la garder
+        if _is_postgresql():
+            context.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
         context.run_migrations()
 
 
@@ -48,7 +66,17 @@ def run_migrations_online() -> None:
     connectable = engine_from_config(
         config.get_section(config.config_ini_section),
         prefix="sqlalchemy.",
+        # Toutes les migrations s'exécutent sur l'unique connexion ouverte
+        # ci-dessous ; NullPool garantit seulement qu'elle est fermée à la fin
+        # au lieu de rester dans un pool inutilisé.
         poolclass=pool.NullPool,
+        # Valeur par défaut de la session : conservée à travers les blocs
+        # autocommit et rétablie par RESET lock_timeout
+        connect_args=(
+            {"options": f"-c lock_timeout={LOCK_TIMEOUT}"}
+            if _is_postgresql()
+            else {}
+        ),
     )
 
     with connectable.connect() as connection:
@@ -62,8 +90,27 @@ def run_migrations_online() -> None:
             render_as_batch=render_as_batch,  # de type de colonnes
         )
 
-        with context.begin_transaction():
-            context.run_migrations()
+        # Un seul processus migre à la fois ; les suivants attendent puis ne
+        # trouvent plus rien à appliquer
+        use_lock = connection.dialect.name == "postgresql"
+        if use_lock:
+            # Attente assumée ici : lock_timeout levé le temps d'acquérir
+            connection.execute(text("SET LOCAL lock_timeout = 0"))
+            connection.execute(
+                text("SELECT pg_advisory_lock(:key)"),
+                {"key": MIGRATION_ADVISORY_LOCK_KEY},
+            )
+            connection.commit()
+        try:
+            with context.begin_transaction():
+                context.run_migrations()
+        finally:
+            if use_lock:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"),
+                    {"key": MIGRATION_ADVISORY_LOCK_KEY},
+                )
+                connection.commit()
 
 
 if context.is_offline_mode():
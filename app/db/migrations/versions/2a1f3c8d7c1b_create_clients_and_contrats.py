@@ -43,11 +43,13 @@ def upgrade() -> None:
         sa.Column("date_modification", sa.DateTime(), nullable=True),
         sa.Column("user_id", sa.Integer(), nullable=False),
         sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
-        sa.UniqueConstraint("email"),
         sa.UniqueConstraint("user_id"),
+        # Index déclarés avec la table : créés dans la même opération.
+        # L'unicité de l'email repose uniquement sur ix_clients_email (pas de
+        # UniqueConstraint en double, qui doublerait la maintenance d'index).
+        sa.Index(op.f("ix_clients_id"), "id"),
+        sa.Index("ix_clients_email", "email", unique=True),
     )
-    op.create_index(op.f("ix_clients_id"), "clients", ["id"], unique=False)
-    op.create_index("ix_clients_email", "clients", ["email"], unique=True)
 
     # Create contrats table (minimal viable schema)
     op.create_table(
@@ -70,9 +72,9 @@ def upgrade() -> None:
         sa.Column("client_id", sa.Integer(), nullable=False),
         sa.ForeignKeyConstraint(["client_id"], ["clients.id"], ondelete="CASCADE"),
         sa.UniqueConstraint("numero_contrat"),
+        sa.Index(op.f("ix_contrats_id"), "id"),
+        sa.Index("ix_contrats_client", "client_id"),
     )
-    op.create_index(op.f("ix_contrats_id"), "contrats", ["id"], unique=False)
-    op.create_index("ix_contrats_client", "contrats", ["client_id"], unique=False)
 
 
 def downgrade() -> None:
@@ -573,7 +573,9 @@ def upgrade() -> None:
         existing_type=postgresql.TIMESTAMP(),
         nullable=False,
     )
-    op.drop_constraint(op.f("clients_email_key"), "clients", type_="unique")
+    # clients_email_key n'est plus créée par 2a1f3c8d7c1b (doublon de
+    # ix_clients_email) : ne la supprime que si une base ancienne la possède
+    op.execute("ALTER TABLE clients DROP CONSTRAINT IF EXISTS clients_email_key")
     op.drop_constraint(op.f("clients_user_id_key"), "clients", type_="unique")
     op.create_index(
         "idx_client_actif_creation",
@@ -1902,12 +1904,6 @@ def downgrade() -> None:
         ["user_id"],
         postgresql_nulls_not_distinct=False,
     )
-    op.create_unique_constraint(
-        op.f("clients_email_key"),
-        "clients",
-        ["email"],
-        postgresql_nulls_not_distinct=False,
-    )
     op.alter_column(
         "clients",
         "date_modification",
@@ -6,11 +6,12 @@ Create Date: 2025-09-07 18:44:29.437618
 
 """
 
+from contextlib import nullcontext
 from typing import Sequence, Union
 
 import sqlalchemy as sa
-from alembic import op
-from sqlalchemy.dialects import postgresql
+from alembic import context, op
+from sqlalchemy.schema import CreateColumn
 
 # revision identifiers, used by Alembic.
 revision: str = "8cafe646bd2e"
@@ -18,190 +19,323 @@ down_revision: Union[str, Sequence[str], None] = "df44b376bc8a"
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+# Taille des lots des backfills (frequence_entretien_jours, statut, criticite)
+_BACKFILL_BATCH_SIZE = 5000
 
-def upgrade() -> None:
-    """Upgrade schema."""
-    # Create ENUM types first
-    op.execute(
-        """
-    DO $$
-    BEGIN
-        IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'statutequipement') THEN
-            CREATE TYPE statutequipement AS ENUM (
-                'operationnel', 'maintenance', 'panne', 'retire'
-            );
-        END IF;
-    END$$;
+# (nom, colonnes) des index créés sur equipements
+_EQUIPEMENT_INDEXES = (
+    ("idx_equipement_numero_serie", ["numero_serie"]),
+    ("idx_equipement_code_interne", ["code_interne"]),
+    ("idx_equipement_type_localisation", ["type_equipement", "localisation"]),
+    ("idx_equipement_statut_criticite", ["statut", "criticite"]),
+    ("idx_equipement_client_statut", ["client_id", "statut"]),
+    ("idx_equipement_created_type", ["created_at", "type_equipement"]),
+)
+
+# (nom, condition) des CHECK remplaçant les types ENUM de statut / criticite :
+# ajouter une valeur revient à remplacer la contrainte, sans ALTER TYPE
+_EQUIPEMENT_CHECKS = (
+    (
+        "ck_equipements_statut",
+        "statut IN ('operationnel', 'maintenance', 'panne', 'retire')",
+    ),
+    (
+        "ck_equipements_criticite",
+        "criticite IN ('critique', 'important', 'standard', 'non_critique')",
+    ),
+)
+
+
+def _inspector():
+    """Inspecteur du schéma courant, None en mode --sql (pas de base à lire)."""
+    return None if context.is_offline_mode() else sa.inspect(op.get_bind())
+
+
+def _add_columns(columns) -> None:
+    """Ajoute les colonnes à equipements, en un seul ALTER TABLE sous PostgreSQL."""
+    # Révision sœur de a30f987678fe (même down_revision) : les colonnes déjà
+    # ajoutées par une autre branche sont ignorées
+    inspector = _inspector()
+    if inspector is not None:
+        existing = {c["name"] for c in inspector.get_columns("equipements")}
+        columns = [column for column in columns if column.name not in existing]
+    if not columns:
+        return
+
+    dialect = op.get_bind().dialect
+    if dialect.name == "postgresql":
+        # Un verrou et un aller-retour au lieu d'un par colonne
+        op.execute(
+            "ALTER TABLE equipements "
+            + ", ".join(
+                f"ADD COLUMN {CreateColumn(column).compile(dialect=dialect)}"
+                for column in columns
+            )
+        )
+    else:
+        # SQLite refuse ADD COLUMN avec un défaut non constant
+        # (CURRENT_TIMESTAMP) sur une table non vide : recopie en une passe
+        with op.batch_alter_table("equipements") as batch_op:
+            for column in columns:
+                batch_op.add_column(column)
+
+
+def _has_fast_column_default() -> bool:
     """
-    )
+    Vrai si ADD COLUMN ... NOT NULL DEFAULT <constante> ne réécrit pas la table.
 
-    op.execute(
-        """
-    DO $$
-    BEGIN
-        IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'criticiteequipement') THEN
-            CREATE TYPE criticiteequipement AS ENUM (
-                'critique', 'important', 'standard', 'non_critique'
-            );
-        END IF;
-    END$$;
+    C'est le cas de SQLite et de PostgreSQL >= 11 (défaut stocké dans le
+    catalogue). Version inconnue (mode --sql) : chemin sans réécriture.
     """
-    )
+    dialect = op.get_bind().dialect
+    if dialect.name == "sqlite":
+        return True
+    version = dialect.server_version_info
+    return dialect.name == "postgresql" and version is not None and version >= (11,)
 
-    # Add missing columns to equipements table
-    op.add_column(
-        "equipements", sa.Column("numero_serie", sa.String(length=100), nullable=True)
-    )
-    op.add_column(
-        "equipements", sa.Column("code_interne", sa.String(length=50), nullable=True)
-    )
-    op.add_column(
-        "equipements", sa.Column("marque", sa.String(length=100), nullable=True)
-    )
-    op.add_column(
-        "equipements", sa.Column("modele", sa.String(length=100), nullable=True)
-    )
-    op.add_column(
-        "equipements", sa.Column("batiment", sa.String(length=100), nullable=True)
-    )
-    op.add_column(
-        "equipements", sa.Column("etage", sa.String(length=20), nullable=True)
-    )
-    op.add_column(
-        "equipements", sa.Column("zone", sa.String(length=100), nullable=True)
-    )
-    op.add_column(
-        "equipements",
-        sa.Column(
-            "statut",
-            postgresql.ENUM(
-                "operationnel",
-                "maintenance",
-                "panne",
-                "retire",
-                name="statutequipement",
-            ),
-            nullable=False,
-            server_default="operationnel",
-        ),
-    )
-    op.add_column(
-        "equipements",
-        sa.Column(
-            "criticite",
-            postgresql.ENUM(
-                "critique",
-                "important",
-                "standard",
-                "non_critique",
-                name="criticiteequipement",
-            ),
-            nullable=False,
-            server_default="standard",
-        ),
-    )
-    op.add_column("equipements", sa.Column("description", sa.Text(), nullable=True))
-    op.add_column(
-        "equipements", sa.Column("specifications_techniques", sa.Text(), nullable=True)
-    )
-    op.add_column(
-        "equipements",
-        sa.Column("puissance", sa.Numeric(precision=10, scale=2), nullable=True),
-    )
-    op.add_column(
-        "equipements",
-        sa.Column("poids", sa.Numeric(precision=10, scale=2), nullable=True),
-    )
-    op.add_column(
-        "equipements",
-        sa.Column("frequence_entretien_jours", sa.Integer(), nullable=True),
-    )
-    op.add_column(
-        "equipements", sa.Column("duree_garantie_mois", sa.Integer(), nullable=True)
-    )
-    op.add_column(
-        "equipements", sa.Column("cout_acquisition", sa.Integer(), nullable=True)
-    )
-    op.add_column(
-        "equipements", sa.Column("date_acquisition", sa.DateTime(), nullable=True)
-    )
-    op.add_column(
-        "equipements", sa.Column("date_mise_en_service", sa.DateTime(), nullable=True)
-    )
-    op.add_column(
-        "equipements", sa.Column("date_fin_garantie", sa.DateTime(), nullable=True)
-    )
-    op.add_column(
-        "equipements",
-        sa.Column(
-            "created_at",
-            sa.DateTime(),
-            nullable=False,
-            server_default=sa.text("CURRENT_TIMESTAMP"),
-        ),
-    )
-    op.add_column(
-        "equipements",
-        sa.Column(
-            "updated_at",
-            sa.DateTime(),
-            nullable=False,
-            server_default=sa.text("CURRENT_TIMESTAMP"),
-        ),
+
+def _backfill(column: str, default: str) -> None:
+    """Renseigne la valeur par défaut des lignes existantes où la colonne est NULL."""
+    update_all = f"UPDATE equipements SET {column} = '{default}' WHERE {column} IS NULL"
+    if op.get_bind().dialect.name != "postgresql" or context.is_offline_mode():
+        op.execute(update_all)
+        return
+
+    # Lots commités un à un : chaque verrou de ligne est relâché rapidement
+    bind = op.get_bind()
+    update_batch = sa.text(
+        f"UPDATE equipements SET {column} = '{default}' WHERE id IN ("
+        f"SELECT id FROM equipements WHERE {column} IS NULL "
+        f"LIMIT {_BACKFILL_BATCH_SIZE} FOR UPDATE SKIP LOCKED)"
     )
-    op.add_column("equipements", sa.Column("client_id", sa.Integer(), nullable=True))
-    op.add_column("equipements", sa.Column("contrat_id", sa.Integer(), nullable=True))
-
-    # Rename columns to match model
-    op.alter_column("equipements", "type", new_column_name="type_equipement")
-    op.alter_column(
-        "equipements",
-        "frequence_entretien",
-        new_column_name="frequence_entretien_old",
-        nullable=True,
+    with op.get_context().autocommit_block():
+        # Backfill rejouable (filtre IS NULL) : inutile d'attendre le fsync du
+        # WAL à chaque lot
+        bind.execute(sa.text("SET synchronous_commit = off"))
+        try:
+            while bind.execute(update_batch).rowcount:
+                pass
+            # Lignes sautées car verrouillées pendant les lots
+            bind.execute(sa.text(update_all))
+        finally:
+            bind.execute(sa.text("RESET synchronous_commit"))
+
+
+def _create_foreign_key(name: str, column: str, referent: str) -> None:
+    """Crée la FK equipements.column -> referent.id (ON DELETE SET NULL)."""
+    inspector = _inspector()
+    if inspector is not None and any(
+        fk["constrained_columns"] == [column] and fk["referred_table"] == referent
+        for fk in inspector.get_foreign_keys("equipements")
+    ):
+        return
+    if op.get_bind().dialect.name != "postgresql":
+        # SQLite : pas d'ALTER de contrainte, recopie de la table (batch)
+        with op.batch_alter_table("equipements") as batch_op:
+            batch_op.create_foreign_key(
+                name, referent, [column], ["id"], ondelete="SET NULL"
+            )
+        return
+
+    # NOT VALID : verrou exclusif limité à la mise à jour du catalogue ; la
+    # validation, commitée à part, ne bloque pas les écritures
+    op.execute(
+        f"ALTER TABLE equipements ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+        f"REFERENCES {referent} (id) ON DELETE SET NULL NOT VALID"
     )
+    with op.get_context().autocommit_block():
+        op.execute(f"ALTER TABLE equipements VALIDATE CONSTRAINT {name}")
+
+
+def _create_check_constraint(name: str, condition: str) -> None:
+    """Crée la contrainte CHECK name sur equipements si elle est absente."""
+    inspector = _inspector()
+    if inspector is not None and any(
+        ck["name"] == name for ck in inspector.get_check_constraints("equipements")
+    ):
+        return
+    if op.get_bind().dialect.name != "postgresql":
+        with op.batch_alter_table("equipements") as batch_op:
+            batch_op.create_check_constraint(name, condition)
+        return
+
+    # Même schéma que les FK : NOT VALID puis validation commitée à part,
+    # sans bloquer les écritures pendant le parcours de la table
     op.execute(
+        f"ALTER TABLE equipements ADD CONSTRAINT {name} CHECK ({condition}) NOT VALID"
+    )
+    with op.get_context().autocommit_block():
+        op.execute(f"ALTER TABLE equipements VALIDATE CONSTRAINT {name}")
+
+
+def _backfill_frequence_entretien() -> None:
+    """Reporte frequence_entretien_old (numérique) dans frequence_entretien_jours."""
+    if op.get_bind().dialect.name != "postgresql":
+        # Pas d'opérateur ~ hors PostgreSQL : chiffres uniquement via GLOB
+        op.execute(
+            "UPDATE equipements SET frequence_entretien_jours = "
+            "CAST(frequence_entretien_old AS INTEGER) WHERE "
+            "frequence_entretien_old <> '' AND "
+            "frequence_entretien_old NOT GLOB '*[^0-9]*'"
+        )
+        return
+    update_all = (
         "UPDATE equipements SET frequence_entretien_jours = "
         "CAST(frequence_entretien_old AS INTEGER) WHERE "
         "frequence_entretien_old ~ '^[0-9]+$'"
     )
-    op.drop_column("equipements", "frequence_entretien_old")
+    if context.is_offline_mode():
+        op.execute(update_all)
+        return
 
-    # Add foreign key constraints
-    op.create_foreign_key(
-        "fk_equipements_client_id",
-        "equipements",
-        "clients",
-        ["client_id"],
-        ["id"],
-        ondelete="SET NULL",
-    )
-    op.create_foreign_key(
-        "fk_equipements_contrat_id",
-        "equipements",
-        "contrats",
-        ["contrat_id"],
-        ["id"],
-        ondelete="SET NULL",
+    # Lots commités un à un : verrous de ligne et WAL bornés par transaction
+    bind = op.get_bind()
+    update_batch = sa.text(
+        "WITH cte AS (SELECT id FROM equipements "
+        "WHERE frequence_entretien_jours IS NULL "
+        "AND frequence_entretien_old ~ '^[0-9]+$' "
+        f"LIMIT {_BACKFILL_BATCH_SIZE}) "
+        "UPDATE equipements e SET frequence_entretien_jours = "
+        "CAST(e.frequence_entretien_old AS INTEGER) FROM cte WHERE e.id = cte.id"
     )
+    with op.get_context().autocommit_block():
+        # Un lot perdu au crash est simplement rejoué : commits asynchrones
+        bind.execute(sa.text("SET synchronous_commit = off"))
+        try:
+            while bind.execute(update_batch).rowcount:
+                pass
+        finally:
+            bind.execute(sa.text("RESET synchronous_commit"))
+
 
-    # Create indexes for better performance
-    op.create_index("idx_equipement_numero_serie", "equipements", ["numero_serie"])
-    op.create_index("idx_equipement_code_interne", "equipements", ["code_interne"])
-    op.create_index(
-        "idx_equipement_type_localisation",
-        "equipements",
-        ["type_equipement", "localisation"],
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Add missing columns to equipements table
+    fast_default = _has_fast_column_default()
+    _add_columns(
+        [
+            sa.Column("numero_serie", sa.String(length=100), nullable=True),
+            sa.Column("code_interne", sa.String(length=50), nullable=True),
+            sa.Column("marque", sa.String(length=100), nullable=True),
+            sa.Column("modele", sa.String(length=100), nullable=True),
+            sa.Column("batiment", sa.String(length=100), nullable=True),
+            sa.Column("etage", sa.String(length=20), nullable=True),
+            sa.Column("zone", sa.String(length=100), nullable=True),
+            sa.Column(
+                "statut",
+                sa.String(length=20),
+                nullable=not fast_default,
+                server_default="operationnel" if fast_default else None,
+            ),
+            sa.Column(
+                "criticite",
+                sa.String(length=20),
+                nullable=not fast_default,
+                server_default="standard" if fast_default else None,
+            ),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("specifications_techniques", sa.Text(), nullable=True),
+            sa.Column("puissance", sa.Numeric(precision=10, scale=2), nullable=True),
+            sa.Column("poids", sa.Numeric(precision=10, scale=2), nullable=True),
+            sa.Column("frequence_entretien_jours", sa.Integer(), nullable=True),
+            sa.Column("duree_garantie_mois", sa.Integer(), nullable=True),
+            sa.Column("cout_acquisition", sa.Integer(), nullable=True),
+            sa.Column("date_acquisition", sa.DateTime(), nullable=True),
+            sa.Column("date_mise_en_service", sa.DateTime(), nullable=True),
+            sa.Column("date_fin_garantie", sa.DateTime(), nullable=True),
+            sa.Column(
+                "created_at",
+                sa.DateTime(),
+                nullable=False,
+                server_default=sa.text("CURRENT_TIMESTAMP"),
+            ),
+            sa.Column(
+                "updated_at",
+                sa.DateTime(),
+                nullable=False,
+                server_default=sa.text("CURRENT_TIMESTAMP"),
+            ),
+            sa.Column("client_id", sa.Integer(), nullable=True),
+            sa.Column("contrat_id", sa.Integer(), nullable=True),
+        ]
     )
-    op.create_index(
-        "idx_equipement_statut_criticite", "equipements", ["statut", "criticite"]
+
+    # Sans défaut rapide, statut / criticite sont ajoutées nullables (pas de
+    # réécriture de la table) : défaut pour les nouvelles lignes, backfill par
+    # lots puis NOT NULL
+    if not fast_default:
+        for column, default in (("statut", "operationnel"), ("criticite", "standard")):
+            with op.batch_alter_table("equipements") as batch_op:
+                batch_op.alter_column(
+                    column, existing_type=sa.String(20), server_default=default
+                )
+            _backfill(column, default)
+            with op.batch_alter_table("equipements") as batch_op:
+                batch_op.alter_column(
+                    column, existing_type=sa.String(20), nullable=False
+                )
+
+    # Rename columns to match model. Révision sœur de a30f987678fe : si elle
+    # est passée avant, type_equipement existe déjà (vide) et reçoit les
+    # valeurs de type, supprimée ensuite au lieu d'être renommée
+    inspector = _inspector()
+    existing = (
+        None
+        if inspector is None
+        else {c["name"] for c in inspector.get_columns("equipements")}
     )
-    op.create_index(
-        "idx_equipement_client_statut", "equipements", ["client_id", "statut"]
+    if existing is None or "type_equipement" not in existing:
+        op.alter_column("equipements", "type", new_column_name="type_equipement")
+    elif "type" in existing:
+        op.execute(
+            "UPDATE equipements SET type_equipement = type "
+            "WHERE type_equipement IS NULL"
+        )
+        with op.batch_alter_table("equipements") as batch_op:
+            batch_op.drop_column("type")
+    if existing is None or "frequence_entretien" in existing:
+        with op.batch_alter_table("equipements") as batch_op:
+            batch_op.alter_column(
+                "frequence_entretien",
+                new_column_name="frequence_entretien_old",
+                existing_type=sa.String(),
+                nullable=True,
+            )
+        _backfill_frequence_entretien()
+        with op.batch_alter_table("equipements") as batch_op:
+            batch_op.drop_column("frequence_entretien_old")
+
+    # Add foreign key constraints
+    _create_foreign_key("fk_equipements_client_id", "client_id", "clients")
+    _create_foreign_key("fk_equipements_contrat_id", "contrat_id", "contrats")
+
+    # Valeurs autorisées de statut / criticite (VARCHAR + CHECK, comme le modèle)
+    for name, condition in _EQUIPEMENT_CHECKS:
+        _create_check_constraint(name, condition)
+
+    # Create indexes for better performance. Sous PostgreSQL, construction
+    # CONCURRENTLY hors transaction : les écritures sur equipements ne sont
+    # pas bloquées pendant le build
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+    index_kw = (
+        {"postgresql_concurrently": True, "if_not_exists": True} if is_postgres else {}
     )
-    op.create_index(
-        "idx_equipement_created_type", "equipements", ["created_at", "type_equipement"]
+    # Hors PostgreSQL (pas de IF NOT EXISTS) : index de la révision sœur ignorés
+    inspector = None if is_postgres else _inspector()
+    existing = (
+        set()
+        if inspector is None
+        else {ix["name"] for ix in inspector.get_indexes("equipements")}
     )
+    with op.get_context().autocommit_block() if is_postgres else nullcontext():
+        if is_postgres:
+            # Build long mais non bloquant : pas de lock_timeout ici
+            op.execute("SET lock_timeout = 0")
+        for name, columns in _EQUIPEMENT_INDEXES:
+            if name not in existing:
+                op.create_index(name, "equipements", columns, **index_kw)
+        if is_postgres:
+            op.execute("RESET lock_timeout")
 
 
 def downgrade() -> None:
@@ -233,6 +367,7 @@ def downgrade() -> None:
     op.drop_column("equipements", "puissance")
     op.drop_column("equipements", "specifications_techniques")
     op.drop_column("equipements", "description")
+    # Les CHECK ck_equipements_* tombent avec leurs colonnes
     op.drop_column("equipements", "criticite")
     op.drop_column("equipements", "statut")
     op.drop_column("equipements", "zone")
@@ -249,6 +384,6 @@ def downgrade() -> None:
         "equipements", sa.Column("frequence_entretien", sa.String(), nullable=True)
     )
 
-    # Drop ENUM types
+    # Types ENUM des bases migrées avant le passage en VARCHAR + CHECK
     op.execute("DROP TYPE IF EXISTS criticiteequipement")
     op.execute("DROP TYPE IF EXISTS statutequipement")
@@ -5,10 +5,12 @@ Revises: 34a6466da3d4
 Create Date: 2025-09-08 00:27:19.062482
 
 """
+from contextlib import nullcontext
 from typing import Sequence, Union
 
 import sqlalchemy as sa
-from alembic import op
+from alembic import context, op
+from sqlalchemy.schema import CreateColumn
 
 # revision identifiers, used by Alembic.
 revision: str = 'a30f987678fe'
@@ -16,54 +18,189 @@ down_revision: Union[str, Sequence[str], None] = 'df44b376bc8a'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+# Taille des lots de backfill des colonnes NOT NULL ajoutées
+_BACKFILL_BATCH_SIZE = 5000
+
+# (nom, colonnes, unique) des index créés sur equipements
+_EQUIPEMENT_INDEXES = (
+    ('ix_equipements_numero_serie', ['numero_serie'], True),
+    ('ix_equipements_code_interne', ['code_interne'], True),
+    ('ix_equipements_type_equipement', ['type_equipement'], False),
+    ('ix_equipements_contrat_id', ['contrat_id'], False),
+    ('ix_equipements_created_at', ['created_at'], False),
+    # Composite indexes : leur première colonne sert aussi les filtres sur
+    # statut et client_id seuls (pas d'index dédié à statut, criticite,
+    # client_id)
+    ('idx_equipement_type_localisation', ['type_equipement', 'localisation'], False),
+    ('idx_equipement_statut_criticite', ['statut', 'criticite'], False),
+    ('idx_equipement_client_statut', ['client_id', 'statut'], False),
+    ('idx_equipement_created_type', ['created_at', 'type_equipement'], False),
+)
+
+
+def _inspector():
+    """Inspecteur du schéma courant, None en mode --sql (pas de base à lire)."""
+    return None if context.is_offline_mode() else sa.inspect(op.get_bind())
+
+
+def _add_columns(columns) -> None:
+    """Ajoute les colonnes à equipements, en un seul ALTER TABLE sous PostgreSQL."""
+    # Révision sœur de 8cafe646bd2e (même down_revision) : les colonnes déjà
+    # ajoutées par une autre branche sont ignorées
+    inspector = _inspector()
+    if inspector is not None:
+        existing = {c['name'] for c in inspector.get_columns('equipements')}
+        columns = [column for column in columns if column.name not in existing]
+    if not columns:
+        return
+
+    dialect = op.get_bind().dialect
+    if dialect.name == 'postgresql':
+        # Un verrou et un aller-retour au lieu d'un par colonne
+        op.execute('ALTER TABLE equipements ' + ', '.join(
+            f'ADD COLUMN {CreateColumn(column).compile(dialect=dialect)}'
+            for column in columns
+        ))
+    else:
+        # SQLite refuse ADD COLUMN avec un défaut non constant
+        # (CURRENT_TIMESTAMP) sur une table non vide : recopie en une passe
+        with op.batch_alter_table('equipements') as batch_op:
+            for column in columns:
+                batch_op.add_column(column)
+
+
+def _has_fast_column_default() -> bool:
+    """
+    Vrai si ADD COLUMN ... NOT NULL DEFAULT <constante> ne réécrit pas la table.
+
+    C'est le cas de SQLite et de PostgreSQL >= 11 (défaut stocké dans le
+    catalogue). Version inconnue (mode --sql) : chemin sans réécriture.
+    """
+    dialect = op.get_bind().dialect
+    if dialect.name == 'sqlite':
+        return True
+    version = dialect.server_version_info
+    return dialect.name == 'postgresql' and version is not None and version >= (11,)
+
+
+def _backfill(column: str, default: str) -> None:
+    """Renseigne la valeur par défaut des lignes existantes où la colonne est NULL."""
+    update_all = f"UPDATE equipements SET {column} = '{default}' WHERE {column} IS NULL"
+    if op.get_bind().dialect.name != 'postgresql' or context.is_offline_mode():
+        op.execute(update_all)
+        return
+
+    # Lots commités un à un : chaque verrou de ligne est relâché rapidement
+    bind = op.get_bind()
+    update_batch = sa.text(
+        f"UPDATE equipements SET {column} = '{default}' WHERE id IN ("
+        f"SELECT id FROM equipements WHERE {column} IS NULL "
+        f"LIMIT {_BACKFILL_BATCH_SIZE} FOR UPDATE SKIP LOCKED)"
+    )
+    with op.get_context().autocommit_block():
+        # Backfill rejouable (filtre IS NULL) : inutile d'attendre le fsync du
+        # WAL à chaque lot
+        bind.execute(sa.text('SET synchronous_commit = off'))
+        try:
+            while bind.execute(update_batch).rowcount:
+                pass
+            # Lignes sautées car verrouillées pendant les lots
+            bind.execute(sa.text(update_all))
+        finally:
+            bind.execute(sa.text('RESET synchronous_commit'))
+
+
+def _create_foreign_key(name: str, column: str, referent: str) -> None:
+    """Crée la FK equipements.column -> referent.id (ON DELETE SET NULL)."""
+    inspector = _inspector()
+    if inspector is not None and any(
+        fk['constrained_columns'] == [column] and fk['referred_table'] == referent
+        for fk in inspector.get_foreign_keys('equipements')
+    ):
+        return
+    if op.get_bind().dialect.name != 'postgresql':
+        # SQLite : pas d'ALTER de contrainte, recopie de la table (batch)
+        with op.batch_alter_table('equipements') as batch_op:
+            batch_op.create_foreign_key(name, referent, [column], ['id'], ondelete='SET NULL')
+        return
+
+    # NOT VALID : verrou exclusif limité à la mise à jour du catalogue ; la
+    # validation, commitée à part, ne bloque pas les écritures
+    op.execute(
+        f'ALTER TABLE equipements ADD CONSTRAINT {name} FOREIGN KEY ({column}) '
+        f'REFERENCES {referent} (id) ON DELETE SET NULL NOT VALID'
+    )
+    with op.get_context().autocommit_block():
+        op.execute(f'ALTER TABLE equipements VALIDATE CONSTRAINT {name}')
+
 
 def upgrade() -> None:
     """Upgrade schema."""
     # Add missing columns to equipements table
-    op.add_column('equipements', sa.Column('numero_serie', sa.String(100), nullable=True))
-    op.add_column('equipements', sa.Column('code_interne', sa.String(50), nullable=True))
-    op.add_column('equipements', sa.Column('type_equipement', sa.String(100), nullable=True))
-    op.add_column('equipements', sa.Column('marque', sa.String(100), nullable=True))
-    op.add_column('equipements', sa.Column('modele', sa.String(100), nullable=True))
-    op.add_column('equipements', sa.Column('batiment', sa.String(100), nullable=True))
-    op.add_column('equipements', sa.Column('etage', sa.String(20), nullable=True))
-    op.add_column('equipements', sa.Column('zone', sa.String(100), nullable=True))
-    op.add_column('equipements', sa.Column('statut', sa.String(20), nullable=False, server_default='operationnel'))
-    op.add_column('equipements', sa.Column('criticite', sa.String(20), nullable=False, server_default='standard'))
-    op.add_column('equipements', sa.Column('description', sa.Text(), nullable=True))
-    op.add_column('equipements', sa.Column('specifications_techniques', sa.Text(), nullable=True))
-    op.add_column('equipements', sa.Column('puissance', sa.Numeric(10, 2), nullable=True))
-    op.add_column('equipements', sa.Column('poids', sa.Numeric(10, 2), nullable=True))
-    op.add_column('equipements', sa.Column('frequence_entretien_jours', sa.Integer(), nullable=True))
-    op.add_column('equipements', sa.Column('duree_garantie_mois', sa.Integer(), nullable=True))
-    op.add_column('equipements', sa.Column('cout_acquisition', sa.Integer(), nullable=True))
-    op.add_column('equipements', sa.Column('date_acquisition', sa.DateTime(), nullable=True))
-    op.add_column('equipements', sa.Column('date_mise_en_service', sa.DateTime(), nullable=True))
-    op.add_column('equipements', sa.Column('date_fin_garantie', sa.DateTime(), nullable=True))
-    op.add_column('equipements', sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')))
-    op.add_column('equipements', sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')))
-    op.add_column('equipements', sa.Column('client_id', sa.Integer(), nullable=True))
-    op.add_column('equipements', sa.Column('contrat_id', sa.Integer(), nullable=True))
+    fast_default = _has_fast_column_default()
+    _add_columns([
+        sa.Column('numero_serie', sa.String(100), nullable=True),
+        sa.Column('code_interne', sa.String(50), nullable=True),
+        sa.Column('type_equipement', sa.String(100), nullable=True),
+        sa.Column('marque', sa.String(100), nullable=True),
+        sa.Column('modele', sa.String(100), nullable=True),
+        sa.Column('batiment', sa.String(100), nullable=True),
+        sa.Column('etage', sa.String(20), nullable=True),
+        sa.Column('zone', sa.String(100), nullable=True),
+        sa.Column('statut', sa.String(20), nullable=not fast_default,
+                  server_default='operationnel' if fast_default else None),
+        sa.Column('criticite', sa.String(20), nullable=not fast_default,
+                  server_default='standard' if fast_default else None),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('specifications_techniques', sa.Text(), nullable=True),
+        sa.Column('puissance', sa.Numeric(10, 2), nullable=True),
+        sa.Column('poids', sa.Numeric(10, 2), nullable=True),
+        sa.Column('frequence_entretien_jours', sa.Integer(), nullable=True),
+        sa.Column('duree_garantie_mois', sa.Integer(), nullable=True),
+        sa.Column('cout_acquisition', sa.Integer(), nullable=True),
+        sa.Column('date_acquisition', sa.DateTime(), nullable=True),
+        sa.Column('date_mise_en_service', sa.DateTime(), nullable=True),
+        sa.Column('date_fin_garantie', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('client_id', sa.Integer(), nullable=True),
+        sa.Column('contrat_id', sa.Integer(), nullable=True),
+    ])
     
-    # Create indexes for better performance
-    op.create_index('ix_equipements_numero_serie', 'equipements', ['numero_serie'], unique=True)
-    op.create_index('ix_equipements_code_interne', 'equipements', ['code_interne'], unique=True)
-    op.create_index('ix_equipements_type_equipement', 'equipements', ['type_equipement'])
-    op.create_index('ix_equipements_statut', 'equipements', ['statut'])
-    op.create_index('ix_equipements_criticite', 'equipements', ['criticite'])
-    op.create_index('ix_equipements_client_id', 'equipements', ['client_id'])
-    op.create_index('ix_equipements_contrat_id', 'equipements', ['contrat_id'])
-    op.create_index('ix_equipements_created_at', 'equipements', ['created_at'])
+    # Sans défaut rapide, statut / criticite sont ajoutées nullables (pas de
+    # réécriture de la table) : défaut pour les nouvelles lignes, backfill par
+    # lots puis NOT NULL
+    if not fast_default:
+        for column, default in (('statut', 'operationnel'), ('criticite', 'standard')):
+            with op.batch_alter_table('equipements') as batch_op:
+                batch_op.alter_column(column, existing_type=sa.String(20), server_default=default)
+            _backfill(column, default)
+            with op.batch_alter_table('equipements') as batch_op:
+                batch_op.alter_column(column, existing_type=sa.String(20), nullable=False)
     
-    # Create composite indexes
-    op.create_index('idx_equipement_type_localisation', 'equipements', ['type_equipement', 'localisation'])
-    op.create_index('idx_equipement_statut_criticite', 'equipements', ['statut', 'criticite'])
-    op.create_index('idx_equipement_client_statut', 'equipements', ['client_id', 'statut'])
-    op.create_index('idx_equipement_created_type', 'equipements', ['created_at', 'type_equipement'])
+    # Create indexes for better performance. Sous PostgreSQL, construction
+    # CONCURRENTLY hors transaction : les écritures sur equipements ne sont
+    # pas bloquées pendant le build
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    index_kw = {'postgresql_concurrently': True, 'if_not_exists': True} if is_postgres else {}
+    # Hors PostgreSQL (pas de IF NOT EXISTS) : index de la révision sœur ignorés
+    inspector = None if is_postgres else _inspector()
+    existing = set() if inspector is None else {
+        ix['name'] for ix in inspector.get_indexes('equipements')
+    }
+    with op.get_context().autocommit_block() if is_postgres else nullcontext():
+        if is_postgres:
+            # Build long mais non bloquant : pas de lock_timeout ici
+            op.execute('SET lock_timeout = 0')
+        for name, columns, unique in _EQUIPEMENT_INDEXES:
+            if name not in existing:
+                op.create_index(name, 'equipements', columns, unique=unique, **index_kw)
+        if is_postgres:
+            op.execute('RESET lock_timeout')
     
     # Add foreign key constraints
-    op.create_foreign_key('fk_equipements_client_id', 'equipements', 'clients', ['client_id'], ['id'], ondelete='SET NULL')
-    op.create_foreign_key('fk_equipements_contrat_id', 'equipements', 'contrats', ['contrat_id'], ['id'], ondelete='SET NULL')
+    _create_foreign_key('fk_equipements_client_id', 'client_id', 'clients')
+    _create_foreign_key('fk_equipements_contrat_id', 'contrat_id', 'contrats')
 
 
 def downgrade() -> None:
@@ -79,9 +216,6 @@ def downgrade() -> None:
     op.drop_index('idx_equipement_type_localisation', table_name='equipements')
     op.drop_index('ix_equipements_created_at', table_name='equipements')
     op.drop_index('ix_equipements_contrat_id', table_name='equipements')
-    op.drop_index('ix_equipements_client_id', table_name='equipements')
-    op.drop_index('ix_equipements_criticite', table_name='equipements')
-    op.drop_index('ix_equipements_statut', table_name='equipements')
     op.drop_index('ix_equipements_type_equipement', table_name='equipements')
     op.drop_index('ix_equipements_code_interne', table_name='equipements')
     op.drop_index('ix_equipements_numero_serie', table_name='equipements')
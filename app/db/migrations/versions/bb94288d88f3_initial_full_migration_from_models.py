@@ -18,6 +18,25 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+def _replace_foreign_key(table: str, column: str, referent: str, ondelete: str) -> None:
+    """
+    Remplace la FK PostgreSQL ``{table}_{column}_fkey`` par une version ON DELETE.
+
+    L'ancienne contrainte est renommée et reste active jusqu'à ce que la
+    nouvelle (NOT VALID) soit validée : aucune fenêtre sans FK, et la
+    validation, commitée à part, ne bloque pas les écritures.
+    """
+    name = f"{table}_{column}_fkey"
+    op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {name} TO {name}_old")
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+        f"REFERENCES {referent} (id) ON DELETE {ondelete} NOT VALID"
+    )
+    with op.get_context().autocommit_block():
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+    op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {name}_old")
+
+
 def upgrade() -> None:
     """Upgrade schema."""
     # Use batch operations for SQLite compatibility
@@ -34,17 +53,7 @@ def upgrade() -> None:
             batch_op.alter_column("user_id", existing_type=sa.INTEGER(), nullable=False)
     else:
         # documents: FK to interventions with CASCADE
-        op.drop_constraint(
-            op.f("documents_intervention_id_fkey"), "documents", type_="foreignkey"
-        )
-        op.create_foreign_key(
-            None,
-            "documents",
-            "interventions",
-            ["intervention_id"],
-            ["id"],
-            ondelete="CASCADE",
-        )
+        _replace_foreign_key("documents", "intervention_id", "interventions", "CASCADE")
 
         # historiques_interventions: set NOT NULL and cascade FKs
         op.alter_column(
@@ -59,133 +68,39 @@ def upgrade() -> None:
             existing_type=sa.INTEGER(),
             nullable=False,
         )
-        op.drop_constraint(
-            op.f("historiques_interventions_intervention_id_fkey"),
-            "historiques_interventions",
-            type_="foreignkey",
-        )
-        op.drop_constraint(
-            op.f("historiques_interventions_user_id_fkey"),
-            "historiques_interventions",
-            type_="foreignkey",
-        )
-        op.create_foreign_key(
-            None,
-            "historiques_interventions",
-            "interventions",
-            ["intervention_id"],
-            ["id"],
-            ondelete="CASCADE",
-        )
-        op.create_foreign_key(
-            None,
-            "historiques_interventions",
-            "users",
-            ["user_id"],
-            ["id"],
-            ondelete="CASCADE",
+        _replace_foreign_key(
+            "historiques_interventions", "intervention_id", "interventions", "CASCADE"
         )
+        _replace_foreign_key("historiques_interventions", "user_id", "users", "CASCADE")
 
         # interventions: adjust FKs
-        op.drop_constraint(
-            op.f("interventions_equipement_id_fkey"),
-            "interventions",
-            type_="foreignkey",
-        )
-        op.drop_constraint(
-            op.f("interventions_technicien_id_fkey"),
-            "interventions",
-            type_="foreignkey",
-        )
-        op.create_foreign_key(
-            None,
-            "interventions",
-            "techniciens",
-            ["technicien_id"],
-            ["id"],
-            ondelete="SET NULL",
-        )
-        op.create_foreign_key(
-            None,
-            "interventions",
-            "equipements",
-            ["equipement_id"],
-            ["id"],
-            ondelete="CASCADE",
+        _replace_foreign_key(
+            "interventions", "technicien_id", "techniciens", "SET NULL"
         )
+        _replace_foreign_key("interventions", "equipement_id", "equipements", "CASCADE")
 
         # notifications: cascade FKs
-        op.drop_constraint(
-            op.f("notifications_intervention_id_fkey"),
-            "notifications",
-            type_="foreignkey",
-        )
-        op.drop_constraint(
-            op.f("notifications_user_id_fkey"), "notifications", type_="foreignkey"
-        )
-        op.create_foreign_key(
-            None, "notifications", "users", ["user_id"], ["id"], ondelete="CASCADE"
-        )
-        op.create_foreign_key(
-            None,
-            "notifications",
-            "interventions",
-            ["intervention_id"],
-            ["id"],
-            ondelete="CASCADE",
+        _replace_foreign_key("notifications", "user_id", "users", "CASCADE")
+        _replace_foreign_key(
+            "notifications", "intervention_id", "interventions", "CASCADE"
         )
 
         # plannings: cascade FK to equipements
-        op.drop_constraint(
-            op.f("plannings_equipement_id_fkey"), "plannings", type_="foreignkey"
-        )
-        op.create_foreign_key(
-            None,
-            "plannings",
-            "equipements",
-            ["equipement_id"],
-            ["id"],
-            ondelete="CASCADE",
-        )
+        _replace_foreign_key("plannings", "equipement_id", "equipements", "CASCADE")
 
         # technicien_competence: cascade FKs
-        op.drop_constraint(
-            op.f("technicien_competence_competence_id_fkey"),
-            "technicien_competence",
-            type_="foreignkey",
-        )
-        op.drop_constraint(
-            op.f("technicien_competence_technicien_id_fkey"),
-            "technicien_competence",
-            type_="foreignkey",
-        )
-        op.create_foreign_key(
-            None,
-            "technicien_competence",
-            "competences",
-            ["competence_id"],
-            ["id"],
-            ondelete="CASCADE",
+        _replace_foreign_key(
+            "technicien_competence", "competence_id", "competences", "CASCADE"
         )
-        op.create_foreign_key(
-            None,
-            "technicien_competence",
-            "techniciens",
-            ["technicien_id"],
-            ["id"],
-            ondelete="CASCADE",
+        _replace_foreign_key(
+            "technicien_competence", "technicien_id", "techniciens", "CASCADE"
         )
 
         # techniciens: set NOT NULL and cascade FK to users
         op.alter_column(
             "techniciens", "user_id", existing_type=sa.INTEGER(), nullable=False
         )
-        op.drop_constraint(
-            op.f("techniciens_user_id_fkey"), "techniciens", type_="foreignkey"
-        )
-        op.create_foreign_key(
-            None, "techniciens", "users", ["user_id"], ["id"], ondelete="CASCADE"
-        )
+        _replace_foreign_key("techniciens", "user_id", "users", "CASCADE")
 
 
 def downgrade() -> None:
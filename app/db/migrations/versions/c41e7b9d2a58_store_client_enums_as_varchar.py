@@ -0,0 +1,89 @@
+"""store client type_client / niveau_service as varchar
+
+Revision ID: c41e7b9d2a58
+Revises: 8d613628ccb0
+Create Date: 2026-10-17 10:12:04.318275
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c41e7b9d2a58"
+down_revision: Union[str, Sequence[str], None] = "8d613628ccb0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (colonne, type ENUM PostgreSQL, valeurs autorisées)
+_CLIENT_ENUMS = (
+    (
+        "type_client",
+        "typeclient",
+        ("entreprise", "collectivite", "association", "particulier"),
+    ),
+    ("niveau_service", "niveauservice", ("premium", "standard", "basique")),
+)
+
+
+def _check_name(column: str) -> str:
+    return f"ck_clients_{column}"
+
+
+def _check_condition(column: str, values) -> str:
+    return f"{column} IN ({', '.join(repr(value) for value in values)})"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        # Enum non natif : déjà VARCHAR, seule la contrainte CHECK manque
+        with op.batch_alter_table("clients") as batch_op:
+            for column, _, values in _CLIENT_ENUMS:
+                batch_op.create_check_constraint(
+                    _check_name(column), _check_condition(column, values)
+                )
+        return
+
+    # Table clients de faible volume : réécriture en un seul ALTER TABLE
+    op.execute(
+        "ALTER TABLE clients "
+        + ", ".join(
+            f"ALTER COLUMN {column} TYPE VARCHAR(20) USING {column}::text"
+            for column, _, _ in _CLIENT_ENUMS
+        )
+    )
+    for column, _, values in _CLIENT_ENUMS:
+        # Même schéma que les CHECK d'equipements : NOT VALID puis validation
+        # commitée à part
+        op.execute(
+            f"ALTER TABLE clients ADD CONSTRAINT {_check_name(column)} "
+            f"CHECK ({_check_condition(column, values)}) NOT VALID"
+        )
+        with op.get_context().autocommit_block():
+            op.execute(f"ALTER TABLE clients VALIDATE CONSTRAINT {_check_name(column)}")
+    for _, enum_name, _ in _CLIENT_ENUMS:
+        op.execute(f"DROP TYPE IF EXISTS {enum_name}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        with op.batch_alter_table("clients") as batch_op:
+            for column, _, _ in _CLIENT_ENUMS:
+                batch_op.drop_constraint(_check_name(column), type_="check")
+        return
+
+    for column, _, _ in _CLIENT_ENUMS:
+        op.drop_constraint(_check_name(column), "clients", type_="check")
+    for column, enum_name, values in _CLIENT_ENUMS:
+        sa.Enum(*values, name=enum_name).create(op.get_bind(), checkfirst=True)
+    op.execute(
+        "ALTER TABLE clients "
+        + ", ".join(
+            f"ALTER COLUMN {column} TYPE {enum_name} USING {column}::{enum_name}"
+            for column, enum_name, _ in _CLIENT_ENUMS
+        )
+    )
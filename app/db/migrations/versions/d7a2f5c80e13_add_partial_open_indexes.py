@@ -0,0 +1,60 @@
+"""add partial indexes for open interventions and active contracts
+
+Revision ID: d7a2f5c80e13
+Revises: c41e7b9d2a58
+Create Date: 2026-10-17 11:03:41.527906
+
+"""
+
+from contextlib import nullcontext
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7a2f5c80e13"
+down_revision: Union[str, Sequence[str], None] = "c41e7b9d2a58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nom, table, colonnes, condition) des index partiels (complets hors PostgreSQL)
+_PARTIAL_INDEXES = (
+    (
+        "idx_intervention_client_open",
+        "interventions",
+        ["client_id", "statut"],
+        "statut IN ('ouverte', 'affectee', 'en_cours', 'en_attente')",
+    ),
+    ("idx_contrat_client_actif", "contrats", ["client_id"], "statut = 'en_cours'"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Sous PostgreSQL, construction CONCURRENTLY hors transaction : les
+    # écritures sur interventions / contrats ne sont pas bloquées
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block() if is_postgres else nullcontext():
+        if is_postgres:
+            # Build long mais non bloquant : pas de lock_timeout ici
+            op.execute("SET lock_timeout = 0")
+        for name, table, columns, condition in _PARTIAL_INDEXES:
+            index_kw = (
+                {
+                    "postgresql_concurrently": True,
+                    "postgresql_where": sa.text(condition),
+                    "if_not_exists": True,
+                }
+                if is_postgres
+                else {}
+            )
+            op.create_index(name, table, columns, **index_kw)
+        if is_postgres:
+            op.execute("RESET lock_timeout")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _, _ in reversed(_PARTIAL_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,77 @@
+"""consolidate clients indexes
+
+Revision ID: e93b06d4f71a
+Revises: d7a2f5c80e13
+Create Date: 2026-10-17 11:48:26.904117
+
+"""
+
+from contextlib import nullcontext
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e93b06d4f71a"
+down_revision: Union[str, Sequence[str], None] = "d7a2f5c80e13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nom, colonnes) des index redondants supprimés :
+# - ix_clients_id double la clé primaire
+# - secteur_activite, type_client, is_active : première colonne d'un composite
+# - niveau_service : faible cardinalité, jamais filtré seul
+# - idx_client_nom_email : nom_entreprise a son index, email son index unique
+_REDUNDANT_INDEXES = (
+    ("ix_clients_id", ["id"]),
+    ("ix_clients_secteur_activite", ["secteur_activite"]),
+    ("ix_clients_type_client", ["type_client"]),
+    ("ix_clients_niveau_service", ["niveau_service"]),
+    ("ix_clients_is_active", ["is_active"]),
+    ("idx_client_nom_email", ["nom_entreprise", "email"]),
+)
+
+# Colonnes des listes de clients actifs portées par idx_client_actif_creation
+_ACTIF_CREATION_INCLUDE = ["nom_entreprise", "ville", "email"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    is_postgres = op.get_bind().dialect.name == "postgresql"
+    # Sous PostgreSQL, DROP / CREATE INDEX CONCURRENTLY hors transaction
+    drop_kw = {"postgresql_concurrently": True, "if_exists": True} if is_postgres else {}
+    with op.get_context().autocommit_block() if is_postgres else nullcontext():
+        if is_postgres:
+            # Build long mais non bloquant : pas de lock_timeout ici
+            op.execute("SET lock_timeout = 0")
+        for name, _ in _REDUNDANT_INDEXES:
+            op.drop_index(name, table_name="clients", **drop_kw)
+
+        if is_postgres:
+            # Nouvel index construit avant la suppression de l'ancien : les
+            # listes restent indexées pendant l'opération
+            op.create_index(
+                "idx_client_actif_creation_incl",
+                "clients",
+                ["is_active", "date_creation"],
+                postgresql_include=_ACTIF_CREATION_INCLUDE,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.drop_index("idx_client_actif_creation", table_name="clients", **drop_kw)
+            op.execute(
+                "ALTER INDEX idx_client_actif_creation_incl "
+                "RENAME TO idx_client_actif_creation"
+            )
+            op.execute("RESET lock_timeout")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("idx_client_actif_creation", table_name="clients")
+        op.create_index(
+            "idx_client_actif_creation", "clients", ["is_active", "date_creation"]
+        )
+    for name, columns in reversed(_REDUNDANT_INDEXES):
+        op.create_index(name, "clients", columns)
@@ -0,0 +1,57 @@
+"""add partial is_active indexes on clients and contrats
+
+Revision ID: f2b7c9a1d3e6
+Revises: e93b06d4f71a
+Create Date: 2026-10-17 14:21:37.604815
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b7c9a1d3e6"
+down_revision: Union[str, Sequence[str], None] = "e93b06d4f71a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nom, table) des index partiels sur le filtre par défaut (enregistrements
+# actifs) : plus petits, ils restent chauds dans le cache de PostgreSQL
+_ACTIVE_INDEXES = (
+    ("ix_clients_active", "clients"),
+    ("ix_contrats_active", "contrats"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Index partiels propres à PostgreSQL, rien à faire ailleurs
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    # Construction CONCURRENTLY hors transaction : pas de verrou d'écriture
+    with op.get_context().autocommit_block():
+        # Build long mais non bloquant : pas de lock_timeout ici
+        op.execute("SET lock_timeout = 0")
+        for name, table in _ACTIVE_INDEXES:
+            op.create_index(
+                name,
+                table,
+                ["id"],
+                postgresql_where=sa.text("is_active = true"),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        op.execute("RESET lock_timeout")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        for name, table in reversed(_ACTIVE_INDEXES):
+            op.drop_index(
+                name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
@@ -1,203 +1,270 @@
 # app/main.py
 
+import importlib
+import json
 import os
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from app.api.middleware import CorrelationIdMiddleware, register_exception_handlers
+from app.api.middleware import (
+    CorrelationIdMiddleware,
+    LegacyPathRewriteMiddleware,
+    RequestClockMiddleware,
+    register_exception_handlers,
+)
 from app.api.middleware.observability import ObservabilityMiddleware, set_observability_middleware
 from app.core.tracing import initialize_tracing, shutdown_tracing
 from app.core.config import settings
 from app.core.logging import get_logger, setup_logging
 
-# Optional scheduler
-try:
-    from app.tasks.scheduler import run_planning_generation, scheduler
-except Exception:
-    scheduler = None
-
 # Setup logging first
 setup_logging()
 logger = get_logger(__name__)
 
-# Optional scheduler
-try:
-    from app.tasks.scheduler import run_planning_generation, scheduler
-except Exception:
-    scheduler = None
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    logger.info(f"🚀 {settings.PROJECT_NAME} démarré!")
-    logger.info("📚 Documentation disponible sur: http://localhost:8000/docs")
+    logger.info(
+        "%s démarré",
+        settings.PROJECT_NAME,
+        extra={"extra_fields": {"event": "startup", "project": settings.PROJECT_NAME}},
+    )
+    if settings.DEBUG and settings.ENABLE_OPENAPI:
+        logger.info("📚 Documentation disponible sur: http://localhost:8000/docs")
     
     # Initialiser le tracing OpenTelemetry
     initialize_tracing(app)
     
-    # Start scheduler if enabled
-    if getattr(settings, "ENABLE_SCHEDULER", False) and scheduler:
+    # Start scheduler if enabled : APScheduler n'est importé que dans ce cas
+    app.state.scheduler = None
+    if settings.ENABLE_SCHEDULER:
         try:
+            from app.tasks.scheduler import run_planning_generation, scheduler
+
             # register the job if not already
-            if not any(job.id == "planning_job" for job in scheduler.get_jobs()):
+            if scheduler.get_job("planning_job") is None:
                 scheduler.add_job(
                     run_planning_generation, "interval", hours=1, id="planning_job"
                 )
             scheduler.start()
-            logger.info("⏱️ Scheduler started")
+            app.state.scheduler = scheduler
+            logger.info("Scheduler started")
         except Exception as e:
-            logger.warning(f"⚠️ Scheduler not started: {e}")
+            logger.warning("Scheduler not started: %s", e)
     try:
         yield
     finally:
         # Shutdown
-        if getattr(settings, "ENABLE_SCHEDULER", False) and scheduler:
+        if app.state.scheduler is not None:
             try:
-                scheduler.shutdown(wait=False)
-                logger.info("⏹️ Scheduler stopped")
+                app.state.scheduler.shutdown(wait=False)
+                logger.info("Scheduler stopped")
             except Exception:
                 pass
         
         # Fermer le tracing
         shutdown_tracing()
         
-        logger.info("👋 Arrêt de l'application...")
+        logger.info(
+            "Arrêt de l'application",
+            extra={
+                "extra_fields": {"event": "shutdown", "project": settings.PROJECT_NAME}
+            },
+        )
 
 
-# Création de l'application FastAPI avec gestionnaire de cycle de vie
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    version="1.0.0",
-    description="Backend ERP pour la gestion des interventions industrielles",
-    lifespan=lifespan,
-)
+# Racine du dépôt, calculée une fois à l'import
+_PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
-if not settings.DEBUG and "*" in settings.CORS_ALLOW_ORIGINS:
-    raise ValueError(
-        "CORS_ALLOW_ORIGINS ne doit pas contenir '*' en production. Configurez des origines explicites."
-    )
 
-# Configuration CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ALLOW_ORIGINS,
-    allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
-    allow_methods=settings.CORS_ALLOW_METHODS,
-    allow_headers=settings.CORS_ALLOW_HEADERS,
-    expose_headers=settings.CORS_EXPOSE_HEADERS,
-)
+@lru_cache(maxsize=1)
+def _resolve_upload_dir(raw_upload: str) -> Path:
+    """Normalise UPLOAD_DIRECTORY en chemin absolu et crée le dossier au besoin."""
+    configured = Path(raw_upload)
 
-# Gestion uniformisée des erreurs et observabilité
-observability_middleware = ObservabilityMiddleware(app)
-app.add_middleware(ObservabilityMiddleware)
-set_observability_middleware(observability_middleware)
-
-register_exception_handlers(app)
-
-# Rate limiting middleware
-if not settings.DEBUG:  # Only in production
-    from app.core.ratelimit import RateLimitMiddleware
-
-    app.add_middleware(RateLimitMiddleware)
-
-# We want /static to point to the parent of the uploads dir so that
-# /static/uploads/* is served
-project_root = Path(__file__).resolve().parents[1]  # repo root
-raw_upload = str(settings.UPLOAD_DIRECTORY)
-configured = Path(raw_upload)
-
-# Normalize configured path robustly
-parts = configured.parts
-root_indicators = (os.sep, "/", "\\")
-starts_with_root = parts and parts[0] in root_indicators
-
-# Case 1: values like "/app/static/uploads" or "\\app\\static\\uploads" from Docker .env
-# -> map to project_root/app/static/uploads
-if starts_with_root and len(parts) >= 2 and parts[1].lower() == "app":
-    # On Windows, absolute paths starting with \app or /app are likely stray;
-    # remap to project root.
-    # On Linux (e.g., Docker), '/app/...' is the valid project root inside the
-    # container; keep as-is.
+    # Windows uniquement : "/app/static/uploads" ou "\\app\\static\\uploads" issus du
+    # .env Docker sont des chemins parasites, remappés sous la racine du projet.
+    # Sous Linux (conteneur), '/app/...' est la racine valide : gardé tel quel
     if os.name == "nt":
-        configured = project_root.joinpath(*parts[1:])
-# Case 2: relative path -> make it relative to project root
-elif not configured.is_absolute():
-    configured = project_root / configured
-
-uploads_dir = configured.resolve()
-# Ensure directories exist to avoid StaticFiles check_dir errors
-uploads_dir.mkdir(parents=True, exist_ok=True)
-static_root = uploads_dir.parent
-
-# Propagate normalized absolute path back to settings so services use the same directory
-try:
-    settings.UPLOAD_DIRECTORY = str(uploads_dir)
-except Exception:
-    pass
-
-app.mount(
-    "/static", StaticFiles(directory=str(static_root), check_dir=True), name="static"
+        parts = configured.parts
+        starts_with_root = parts and parts[0] in (os.sep, "/", "\\")
+        if starts_with_root and len(parts) >= 2 and parts[1].lower() == "app":
+            configured = _PROJECT_ROOT.joinpath(*parts[1:])
+    # Relative path -> make it relative to project root
+    if not configured.is_absolute():
+        configured = _PROJECT_ROOT / configured
+
+    uploads_dir = configured.resolve()
+    # Ensure directories exist to avoid StaticFiles check_dir errors ; un seul
+    # stat quand le dossier existe déjà (redémarrages à chaud)
+    if not uploads_dir.is_dir():
+        uploads_dir.mkdir(parents=True, exist_ok=True)
+    return uploads_dir
+
+
+# Routeurs v1 (modules app.api.v1.*), montés dans cet ordre
+API_ROUTERS = (
+    "auth",
+    "users",
+    "techniciens",
+    "equipements",
+    "interventions",
+    "planning",
+    "notifications",
+    "documents",
+    "filters",
+    "dashboard",
+    "health",
 )
 
-# Import des routes v1
-try:
-    from app.api.v1 import auth as auth
-    from app.api.v1 import dashboard as dashboard
-    from app.api.v1 import documents as documents
-    from app.api.v1 import equipements as equipements
-    from app.api.v1 import filters as filters
-    from app.api.v1 import health as health
-    from app.api.v1 import interventions as interventions
-    from app.api.v1 import notifications as notifications
-    from app.api.v1 import planning as planning
-    from app.api.v1 import techniciens as techniciens
-    from app.api.v1 import users as users
-
-    api_prefix = settings.API_V1_STR
-    # Mount under /api/v1/*
-    app.include_router(auth.router, prefix=api_prefix)
-    app.include_router(users.router, prefix=api_prefix)
-    app.include_router(techniciens.router, prefix=api_prefix)
-    app.include_router(equipements.router, prefix=api_prefix)
-    app.include_router(interventions.router, prefix=api_prefix)
-    app.include_router(planning.router, prefix=api_prefix)
-    app.include_router(notifications.router, prefix=api_prefix)
-    app.include_router(documents.router, prefix=api_prefix)
-    app.include_router(filters.router, prefix=api_prefix)
-    app.include_router(dashboard.router, prefix=api_prefix)
-    app.include_router(health.router, prefix=api_prefix)
-    # Backward-compatible mounts at root for existing tests/tools
-    app.include_router(auth.router)
-    app.include_router(users.router)
-    app.include_router(techniciens.router)
-    app.include_router(equipements.router)
-    app.include_router(interventions.router)
-    app.include_router(planning.router)
-    app.include_router(notifications.router)
-    app.include_router(documents.router)
-    app.include_router(filters.router)
-    app.include_router(dashboard.router)
-    app.include_router(health.router)
-
-except ImportError as e:
-    print(f"Erreur lors de l'import des routes: {e}")
-    print("Certaines routes peuvent ne pas être disponibles.")
+# Import des routes v1 : un routeur en échec n'empêche pas le montage des autres
+api_routers = {}
+for name in API_ROUTERS:
+    try:
+        api_routers[name] = importlib.import_module(f"app.api.v1.{name}")
+    except ImportError as e:
+        logger.error(
+            "Erreur lors de l'import du routeur %s, ses routes ne seront pas "
+            "disponibles: %s",
+            name,
+            e,
+        )
 
 
-# Route de base pour vérifier que l'API fonctionne
-@app.get("/")
-def read_root():
-    return {
+def _include_routers(app: FastAPI, routers: dict, mount_legacy: bool) -> None:
+    """Monte les routeurs sous API_V1_STR, chemins racine legacy réécrits au besoin."""
+    for module in routers.values():
+        app.include_router(module.router, prefix=settings.API_V1_STR)
+
+    # Sondes (/health, /live, /ready) toujours exposées à la racine
+    if "health" in routers:
+        app.include_router(routers["health"].router)
+    # Backward-compatible root paths for existing tests/tools : réécrits vers
+    # API_V1_STR plutôt que montés une seconde fois (routes dupliquées)
+    if mount_legacy:
+        app.add_middleware(
+            LegacyPathRewriteMiddleware,
+            prefixes=[
+                module.router.prefix
+                for name, module in routers.items()
+                if name != "health"
+            ],
+            target_prefix=settings.API_V1_STR,
+        )
+
+
+# Corps constant de la route racine, sérialisé une seule fois (souvent sondée
+# par les health checkers)
+_ROOT_BODY = json.dumps(
+    {
         "message": "Bienvenue sur l'API ERP MIF Maroc",
         "version": "1.0.0",
         "docs": "/docs",
         "redoc": "/redoc",
     }
+).encode()
+
+
+# Route de base pour vérifier que l'API fonctionne
+def read_root():
+    return Response(content=_ROOT_BODY, media_type="application/json")
+
+
+@lru_cache(maxsize=1)
+def create_app() -> FastAPI:
+    """Construit l'application (une seule fois par process, voir cache_clear)."""
+    if not settings.DEBUG and "*" in settings.cors_allow_origins_set:
+        raise ValueError(
+            "CORS_ALLOW_ORIGINS ne doit pas contenir '*' en production. Configurez des origines explicites."
+        )
+
+    # Création de l'application FastAPI avec gestionnaire de cycle de vie
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        version="1.0.0",
+        description="Backend ERP pour la gestion des interventions industrielles",
+        lifespan=lifespan,
+        # Sans OpenAPI, ni schéma ni documentation interactive ne sont exposés
+        openapi_url="/openapi.json" if settings.ENABLE_OPENAPI else None,
+    )
+
+    if settings.ENABLE_OPENAPI and settings.OPENAPI_SCHEMA_FILE:
+        try:
+            app.openapi_schema = json.loads(
+                Path(settings.OPENAPI_SCHEMA_FILE).read_bytes()
+            )
+        except (OSError, ValueError) as e:
+            # Repli sur la génération paresseuse par FastAPI
+            logger.warning(
+                "Schéma OpenAPI pré-généré illisible (%s): %s",
+                settings.OPENAPI_SCHEMA_FILE,
+                e,
+            )
+
+    # Configuration CORS : origines en frozenset, test d'appartenance en O(1) à
+    # chaque requête portant un en-tête Origin
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_allow_origins_set,
+        allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
+        allow_methods=settings.CORS_ALLOW_METHODS,
+        allow_headers=settings.CORS_ALLOW_HEADERS,
+        expose_headers=settings.CORS_EXPOSE_HEADERS,
+    )
+
+    # Gestion uniformisée des erreurs et observabilité
+    observability_middleware = ObservabilityMiddleware(app)
+    app.add_middleware(ObservabilityMiddleware)
+    set_observability_middleware(observability_middleware)
+
+    register_exception_handlers(app)
+
+    # Instant de référence unique par requête (app.core.clock.utcnow)
+    app.add_middleware(RequestClockMiddleware)
+
+    # Identifiant de corrélation (X-Request-ID) : ajouté après l'observabilité,
+    # donc exécuté avant elle ; l'id généré lui parvient comme en-tête entrant
+    app.add_middleware(CorrelationIdMiddleware)
+
+    # Rate limiting middleware : ajouté en dernier, donc exécuté en premier ; les
+    # requêtes rejetées ne traversent aucun autre middleware
+    if not settings.DEBUG:  # Only in production
+        from app.core.ratelimit import RateLimitMiddleware
+
+        app.add_middleware(RateLimitMiddleware)
+
+    # We want /static to point to the parent of the uploads dir so that
+    # /static/uploads/* is served
+    uploads_dir = _resolve_upload_dir(str(settings.UPLOAD_DIRECTORY))
+    static_root = uploads_dir.parent
+
+    # Propagate normalized absolute path back to settings so services use the same
+    # directory (rien à faire si la valeur est déjà normalisée)
+    if settings.UPLOAD_DIRECTORY != str(uploads_dir):
+        try:
+            settings.UPLOAD_DIRECTORY = str(uploads_dir)
+        except Exception:
+            pass
+
+    # static_root existe déjà (créé par _resolve_upload_dir) : pas de revérification
+    app.mount(
+        "/static",
+        StaticFiles(directory=str(static_root), check_dir=False),
+        name="static",
+    )
+
+    _include_routers(app, api_routers, settings.MOUNT_LEGACY_ROUTES)
+    app.get("/")(read_root)
+    return app
+
+
+app = create_app()
 
 
 # Les événements startup/shutdown sont maintenant gérés par lifespan ci-dessus
@@ -26,53 +26,117 @@ NOTE: Tous les modèles suivent les conventions d'excellence :
 - Cascade et contraintes d'intégrité robustes
 """
 
-# Modèles clients et relations commerciales
-from .client import Client, NiveauService, TypeClient
+import importlib
+from typing import TYPE_CHECKING
+
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper
+
+if TYPE_CHECKING:
+    from .client import Client, NiveauService, TypeClient
+    from .contrat import Contrat, Facture, StatutContrat, TypeContrat
+    from .document import Document
+    from .equipement import CriticiteEquipement, Equipement, StatutEquipement
+    from .historique import HistoriqueIntervention
+    from .intervention import (
+        Intervention,
+        InterventionType,
+        PrioriteIntervention,
+        StatutIntervention,
+    )
+    from .notification import Notification
+    from .planning import Planning
+    from .refresh_token import RefreshToken
+    from .report import Report, ReportFormat, ReportSchedule, ReportStatus, ReportType
+    from .stock import InterventionPiece, MouvementStock, PieceDetachee, TypeMouvement
+    from .technicien import (
+        Competence,
+        DisponibiliteTechnicien,
+        NiveauCompetence,
+        Technicien,
+        technicien_competence,
+    )
+    from .user import User, UserRole
+
+# Nom exporté -> sous-module qui le définit ; importé au premier accès
+# (PEP 562) plutôt qu'à l'import du package
+_LAZY = {
+    # Modèles clients et relations commerciales
+    "Client": "client",
+    "NiveauService": "client",
+    "TypeClient": "client",
+    # Modèles contractuels et commerciaux
+    "Contrat": "contrat",
+    "Facture": "contrat",
+    "StatutContrat": "contrat",
+    "TypeContrat": "contrat",
+    # Modèles documentation et fichiers
+    "Document": "document",
+    # Modèles équipements et patrimoine
+    "CriticiteEquipement": "equipement",
+    "Equipement": "equipement",
+    "StatutEquipement": "equipement",
+    # Modèles audit et traçabilité
+    "HistoriqueIntervention": "historique",
+    # Modèles interventions - cœur métier
+    "Intervention": "intervention",
+    "InterventionType": "intervention",
+    "PrioriteIntervention": "intervention",
+    "StatutIntervention": "intervention",
+    # Modèles notification et communication
+    "Notification": "notification",
+    # Modèles planification et organisation
+    "Planning": "planning",
+    "RefreshToken": "refresh_token",
+    # Modèles reporting et business intelligence
+    "Report": "report",
+    "ReportFormat": "report",
+    "ReportSchedule": "report",
+    "ReportStatus": "report",
+    "ReportType": "report",
+    # Modèles stock et logistique
+    "InterventionPiece": "stock",
+    "MouvementStock": "stock",
+    "PieceDetachee": "stock",
+    "TypeMouvement": "stock",
+    # Modèles techniciens et compétences
+    "Competence": "technicien",
+    "DisponibiliteTechnicien": "technicien",
+    "NiveauCompetence": "technicien",
+    "Technicien": "technicien",
+    "technicien_competence": "technicien",
+    # Modèles utilisateurs et authentification
+    "User": "user",
+    "UserRole": "user",
+}
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    obj = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = obj
+    return obj
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+def load_all_models() -> None:
+    """Importe tous les modèles : metadata complète (create_all, Alembic)."""
+    for module_name in set(_LAZY.values()):
+        importlib.import_module(f".{module_name}", __name__)
+
+
+# Les relations sont déclarées par nom de classe : tous les modèles doivent
+# être enregistrés avant la configuration des mappers (premier usage ORM)
+@event.listens_for(Mapper, "before_configured")
+def _load_models_before_configure() -> None:
+    load_all_models()
 
-# Modèles contractuels et commerciaux
-from .contrat import Contrat, Facture, StatutContrat, TypeContrat
-
-# Modèles documentation et fichiers
-from .document import Document
-
-# Modèles équipements et patrimoine
-from .equipement import CriticiteEquipement, Equipement, StatutEquipement
-
-# Modèles audit et traçabilité
-from .historique import HistoriqueIntervention
-
-# Modèles interventions - cœur métier
-from .intervention import (
-    Intervention,
-    InterventionType,
-    PrioriteIntervention,
-    StatutIntervention,
-)
-
-# Modèles notification et communication
-from .notification import Notification
-
-# Modèles planification et organisation
-from .planning import Planning
-from .refresh_token import RefreshToken
-
-# Modèles reporting et business intelligence
-from .report import Report, ReportFormat, ReportSchedule, ReportStatus, ReportType
-
-# Modèles stock et logistique
-from .stock import InterventionPiece, MouvementStock, PieceDetachee, TypeMouvement
-
-# Modèles techniciens et compétences
-from .technicien import (
-    Competence,
-    DisponibiliteTechnicien,
-    NiveauCompetence,
-    Technicien,
-    technicien_competence,
-)
-
-# Modèles utilisateurs et authentification
-from .user import User, UserRole
 
 # Export des classes principales pour utilisation externe
 __all__ = [
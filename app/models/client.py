@@ -16,36 +16,212 @@ Architecture:
 - Index de performance sur secteur et ville
 - Propriétés calculées pour KPI commerciaux
 - Interface to_dict() standardisée pour API
+
+Chargement :
+- Les collections interventions / contrats / equipements sont en
+  lazy="raise" : tout accès non préchargé lève une erreur au lieu d'émettre
+  une requête cachée (N+1).
+- Détail d'un client : session.scalars(Client.query_with_kpis().where(...))
+  charge les trois collections par selectinload ; les propriétés KPI
+  travaillent ensuite sur ces listes en mémoire.
+- Listes de clients : appeler Client.load_kpis(session, clients) (et
+  Client.load_latest pour les relations résumées) avant to_dict() ; les
+  KPI de toute la page sont alors chargés en trois requêtes agrégées, sans
+  charger les collections. Seules les relations détaillées
+  (include_relations) exigent les collections.
+- Après une écriture (flush) touchant un client ou ses interventions /
+  contrats / équipements, les KPI de ce client sont oubliés : rappeler
+  Client.load_kpis pour lui avant to_dict() s'il vient de base_select.
 """
 
 import enum
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from functools import lru_cache, wraps
+from itertools import chain
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
 
 from sqlalchemy import (
     Boolean,
     Column,
     DateTime,
-    Enum,
     ForeignKey,
     Index,
     Integer,
     Numeric,
+    Select,
     String,
     Text,
+    case,
+    event,
+    extract,
+    func,
+    select,
+)
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import (
+    Session,
+    aliased,
+    lazyload,
+    object_session,
+    raiseload,
+    relationship,
+    selectinload,
+    validates,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm.util import identity_key
 
+from app.core.clock import utcnow
 from app.db.database import Base
 
+# Imports directs : ces modules n'importent pas client (pas de cycle)
+from .contrat import Contrat, StatutContrat
+from .equipement import Equipement, StatutEquipement
+from .intervention import (
+    Intervention,
+    InterventionType,
+    PrioriteIntervention,
+    StatutIntervention,
+)
+
 # NOTE: Import conditionnel pour éviter les imports circulaires
 if TYPE_CHECKING:
-    from .contrat import Contrat
-    from .equipement import Equipement
     from .user import User
 
-# Import direct nécessaire pour les filtres
-from .intervention import Intervention
+# Statuts / priorités utilisés par les KPI, construits une fois à l'import
+_OPEN_STATUSES = frozenset(
+    {
+        StatutIntervention.ouverte,
+        StatutIntervention.affectee,
+        StatutIntervention.en_cours,
+        StatutIntervention.en_attente,
+    }
+)
+_URGENT_STATUSES = frozenset(
+    {
+        StatutIntervention.ouverte,
+        StatutIntervention.affectee,
+        StatutIntervention.en_cours,
+    }
+)
+_URGENT_PRIORITIES = frozenset(
+    {PrioriteIntervention.urgente, PrioriteIntervention.haute}
+)
+
+
+# Délai SLA en heures par priorité (cf. Intervention.calculer_sla_respect) ;
+# NULL pour les interventions programmées, sans SLA
+_SLA_HEURES = case(
+    (Intervention.priorite == PrioriteIntervention.urgente, 2),
+    (Intervention.priorite == PrioriteIntervention.haute, 24),
+    (Intervention.priorite == PrioriteIntervention.normale, 72),
+    (Intervention.priorite == PrioriteIntervention.basse, 168),
+    else_=None,
+)
+
+
+def _duree_heures(debut, fin, dialect_name: str):
+    """Expression SQL de la durée fin - debut en heures (NULL si fin est NULL)."""
+    if dialect_name == "postgresql":
+        return extract("epoch", fin - debut) / 3600
+    # SQLite : pas de soustraction de dates, passage par les jours juliens
+    return (func.julianday(fin) - func.julianday(debut)) * 24
+
+
+# Champs sérialisés par Client.to_dict(), lus en un appel d'attrgetter
+_BASIC_FIELDS = (
+    "id",
+    "nom_entreprise",
+    "nom_commercial",
+    "nom_affichage",
+    "type_client",
+    "secteur_activite",
+    "niveau_service",
+    "nom_contact",
+    "nom_complet_contact",
+    "fonction_contact",
+    "email",
+    "telephone_principal",
+    "ville",
+    "code_postal",
+    "pays",
+    "is_active",
+    "date_creation",
+    "est_client_premium",
+)
+_BASIC_GETTER = attrgetter(*_BASIC_FIELDS)
+
+# KPI d'activité de to_dict : collections préchargées ou load_kpis requis
+_KPI_FIELDS = (
+    "statut_commercial",
+    "nb_interventions_total",
+    "nb_interventions_ouvertes",
+    "nb_equipements_total",
+    "derniere_intervention_date",
+)
+_KPI_GETTER = attrgetter(*_KPI_FIELDS)
+
+_SENSITIVE_FIELDS = (
+    "date_modification",
+    "numero_siret",
+    "numero_tva",
+    "code_ape",
+    "identifiant_legal",
+    "taille_entreprise",
+    "chiffre_affaires_annuel",
+    "nb_employes",
+    "telephone",
+    "telephone_mobile",
+    "fax",
+    "adresse_ligne1",
+    "adresse_ligne2",
+    "adresse_complete",
+    "region",
+    "notes_commerciales",
+    "instructions_particulieres",
+    "niveau_priorite_commerciale",
+    "nb_contrats_actifs",
+    "nb_interventions_mois_courant",
+    "nb_equipements_operationnels",
+    "taux_satisfaction_moyen",
+    "cout_maintenance_total",
+    "cout_maintenance_annuel",
+    "delai_moyen_intervention",
+    "date_premier_contrat",
+    "date_derniere_intervention",
+)
+_SENSITIVE_GETTER = attrgetter(*_SENSITIVE_FIELDS)
+
+# Relations lues par to_dict(include_relations=True), chargées par full_select
+_RELATIONS_DETAIL = frozenset({"user", "interventions", "contrats", "equipements"})
+
+
+@lru_cache(maxsize=1)
+def _debut_mois_de(annee: int, mois: int) -> datetime:
+    return datetime(annee, mois, 1)
+
+
+def _debut_mois(now: datetime) -> datetime:
+    """Premier instant du mois de now (un seul objet construit par mois)."""
+    return _debut_mois_de(now.year, now.month)
+
+
+def _kpi_property(compute):
+    """Propriété KPI calculée au plus une fois par instance (voir _kpi_cache)."""
+    name = compute.__name__
+
+    @wraps(compute)
+    def getter(self):
+        cache = self._kpi_cache
+        if cache is None:
+            cache = self._kpi_cache = {}
+        if name not in cache:
+            cache[name] = compute(self)
+        return cache[name]
+
+    return property(getter)
 
 
 class TypeClient(str, enum.Enum):
@@ -97,8 +273,8 @@ class Client(Base):
     - 1:N avec Equipements (parc client)
 
     Performances :
-    - Index composites sur secteur+ville, type+niveau_service
-    - Relations lazy=dynamic pour collections volumineuses
+    - Index composites sur secteur+ville, type+niveau_service, actif+création
+    - Relations lazy=raise : collections chargées explicitement (selectinload)
     - Propriétés calculées pour KPI commerciaux
     """
 
@@ -106,24 +282,34 @@ class Client(Base):
     # Autorise les annotations non-Mapped legacy (compat SQLAlchemy 2.0)
     __allow_unmapped__ = True
 
-    # NOTE: Index composites pour requêtes commerciales fréquentes
+    # NOTE: Index composites pour requêtes commerciales fréquentes ; leur
+    # première colonne sert aussi les filtres sur secteur_activite,
+    # type_client et is_active seuls (pas d'index dédié)
     __table_args__ = (
         Index("idx_client_secteur_ville", "secteur_activite", "ville"),
         Index("idx_client_type_niveau", "type_client", "niveau_service"),
-        Index("idx_client_actif_creation", "is_active", "date_creation"),
-        Index("idx_client_nom_email", "nom_entreprise", "email"),
+        # Listes de clients actifs : colonnes affichées en INCLUDE sous
+        # PostgreSQL (parcours d'index seul)
+        Index(
+            "idx_client_actif_creation",
+            "is_active",
+            "date_creation",
+            postgresql_include=["nom_entreprise", "ville", "email"],
+        ),
     )
 
-    # Clé primaire
-    id = Column(Integer, primary_key=True, index=True)
+    # Clé primaire (déjà indexée par la contrainte PRIMARY KEY)
+    id = Column(Integer, primary_key=True)
 
     # Informations légales et entreprise
     nom_entreprise = Column(String(255), nullable=False, index=True)
     nom_commercial = Column(String(255), nullable=True)  # Enseigne commerciale
+    # VARCHAR + CHECK (ck_clients_type_client) : chargé tel quel, sans
+    # conversion en membre d'Enum à chaque ligne
     type_client = Column(
-        Enum(TypeClient), default=TypeClient.entreprise, nullable=False, index=True
+        String(20), default=TypeClient.entreprise.value, nullable=False
     )
-    secteur_activite = Column(String(100), nullable=True, index=True)
+    secteur_activite = Column(String(100), nullable=True)
     taille_entreprise = Column(String(50), nullable=True)  # TPE, PME, ETI, GE
 
     # Identifiants légaux
@@ -150,13 +336,13 @@ class Client(Base):
 
     # Service et commercial
     niveau_service = Column(
-        Enum(NiveauService), default=NiveauService.standard, nullable=False, index=True
+        String(20), default=NiveauService.standard.value, nullable=False
     )
     chiffre_affaires_annuel = Column(Numeric(12, 2), nullable=True)  # En euros
     nb_employes = Column(Integer, nullable=True)
 
     # Statut et métadonnées
-    is_active = Column(Boolean, default=True, nullable=False, index=True)
+    is_active = Column(Boolean, default=True, nullable=False)
     date_creation = Column(
         DateTime, default=datetime.utcnow, nullable=False, index=True
     )
@@ -184,12 +370,12 @@ class Client(Base):
     # Relation principale avec utilisateur (1:1)
     user: "User" = relationship("User", back_populates="client", lazy="select")
 
-    # Relations métier (1:N) - lazy dynamic pour performances
+    # Relations métier (1:N) - lazy raise : chargement explicite obligatoire
     interventions = relationship(
         "Intervention",
         back_populates="client",
         cascade="all, delete-orphan",
-        lazy="dynamic",
+        lazy="raise",
         order_by="desc(Intervention.date_creation)",
     )
 
@@ -197,7 +383,7 @@ class Client(Base):
         "Contrat",
         back_populates="client",
         cascade="all, delete-orphan",
-        lazy="dynamic",
+        lazy="raise",
         order_by="desc(Contrat.date_debut)",
     )
 
@@ -205,10 +391,24 @@ class Client(Base):
         "Equipement",
         back_populates="client",
         cascade="all, delete-orphan",
-        lazy="dynamic",
+        lazy="raise",
         order_by="Equipement.nom",
     )
 
+    @validates("type_client")
+    def _valider_type_client(self, key: str, value: str) -> str:
+        """Refuse les valeurs hors TypeClient et stocke la valeur brute."""
+        return TypeClient(value).value
+
+    @validates("niveau_service")
+    def _valider_niveau_service(self, key: str, value: str) -> str:
+        """Refuse les valeurs hors NiveauService et stocke la valeur brute."""
+        return NiveauService(value).value
+
+    # Valeurs KPI de l'instance : préchargées par load_kpis ou mémorisées au
+    # premier accès ; remises à None après un flush qui touche ce client
+    _kpi_cache: Optional[Dict[str, Any]] = None
+
     def __repr__(self) -> str:
         """Représentation concise pour debugging."""
         return (
@@ -218,13 +418,26 @@ class Client(Base):
 
     # 🏷️ Propriétés métier et KPI commerciaux
 
-    @property
+    # Propriétés hybrides : utilisables aussi dans select() / where / order_by
+
+    @hybrid_property
     def nom_complet_contact(self) -> str:
         """Nom complet du contact principal."""
         if self.prenom_contact:
             return f"{self.prenom_contact} {self.nom_contact}"
         return self.nom_contact
 
+    @nom_complet_contact.inplace.expression
+    @classmethod
+    def _nom_complet_contact_expression(cls):
+        return case(
+            (
+                func.coalesce(cls.prenom_contact, "") != "",
+                cls.prenom_contact + " " + cls.nom_contact,
+            ),
+            else_=cls.nom_contact,
+        )
+
     @property
     def adresse_complete(self) -> str:
         """Adresse complète formatée."""
@@ -239,87 +452,81 @@ class Client(Base):
             parts.append(self.pays)
         return "\n".join(parts)
 
-    @property
+    @hybrid_property
     def nom_affichage(self) -> str:
         """Nom d'affichage préféré (commercial ou entreprise)."""
         return self.nom_commercial or self.nom_entreprise
 
+    @nom_affichage.inplace.expression
+    @classmethod
+    def _nom_affichage_expression(cls):
+        return func.coalesce(func.nullif(cls.nom_commercial, ""), cls.nom_entreprise)
+
     @property
     def anciennete_jours(self) -> int:
         """Ancienneté du client en jours."""
-        return (datetime.utcnow() - self.date_creation).days
+        return (utcnow() - self.date_creation).days
 
     @property
     def anciennete_annees(self) -> float:
         """Ancienneté du client en années."""
         return round(self.anciennete_jours / 365.25, 1)
 
-    @property
+    @hybrid_property
     def est_nouveau_client(self) -> bool:
         """Vérifie si c'est un nouveau client (< 6 mois)."""
         return self.anciennete_jours < 180
 
-    @property
+    @est_nouveau_client.inplace.expression
+    @classmethod
+    def _est_nouveau_client_expression(cls):
+        return cls.date_creation > utcnow() - timedelta(days=180)
+
+    @hybrid_property
     def est_client_premium(self) -> bool:
         """Vérifie si c'est un client premium."""
         return self.niveau_service == NiveauService.premium
 
-    @property
+    @_kpi_property
     def nb_interventions_total(self) -> int:
         """Nombre total d'interventions pour ce client."""
-        return self.interventions.count()
+        return len(self.interventions)
 
-    @property
+    @_kpi_property
     def nb_interventions_ouvertes(self) -> int:
         """Nombre d'interventions actuellement ouvertes."""
-        from app.models.intervention import StatutIntervention
-
-        return self.interventions.filter(
-            Intervention.statut.in_(
-                [
-                    StatutIntervention.ouverte,
-                    StatutIntervention.affectee,
-                    StatutIntervention.en_cours,
-                    StatutIntervention.en_attente,
-                ]
-            )
-        ).count()
+        return sum(1 for i in self.interventions if i.statut in _OPEN_STATUSES)
 
-    @property
+    @_kpi_property
     def nb_interventions_mois_courant(self) -> int:
         """Nombre d'interventions du mois en cours."""
-        debut_mois = datetime.utcnow().replace(
-            day=1, hour=0, minute=0, second=0, microsecond=0
-        )
-        return self.interventions.filter(
-            Intervention.date_creation >= debut_mois
-        ).count()
+        debut_mois = _debut_mois(utcnow())
+        return sum(1 for i in self.interventions if i.date_creation >= debut_mois)
 
-    @property
+    @_kpi_property
     def nb_contrats_actifs(self) -> int:
         """Nombre de contrats actuellement actifs."""
-        from app.models.contrat import StatutContrat
+        return sum(1 for c in self.contrats if c.statut == StatutContrat.en_cours)
 
-        return self.contrats.filter_by(statut=StatutContrat.actif).count()
-
-    @property
+    @_kpi_property
     def nb_equipements_total(self) -> int:
         """Nombre total d'équipements sous contrat."""
-        return self.equipements.count()
+        return len(self.equipements)
 
-    @property
+    @_kpi_property
     def nb_equipements_operationnels(self) -> int:
         """Nombre d'équipements opérationnels."""
-        from app.models.equipement import StatutEquipement
-
-        return self.equipements.filter_by(statut=StatutEquipement.operationnel).count()
+        return sum(
+            1 for e in self.equipements if e.statut == StatutEquipement.operationnel
+        )
 
-    @property
+    @_kpi_property
     def derniere_intervention(self) -> Optional["Intervention"]:
         """Dernière intervention créée pour ce client."""
-        return self.interventions.first()
+        # Collection triée par date_creation décroissante (order_by)
+        return self.interventions[0] if self.interventions else None
 
-    @property
+    @_kpi_property
     def derniere_intervention_date(self) -> Optional[datetime]:
         """Date de la dernière intervention."""
         derniere = self.derniere_intervention
@@ -330,29 +537,28 @@ class Client(Base):
         """Temps écoulé depuis la dernière intervention."""
         if not self.derniere_intervention_date:
             return None
-        return datetime.utcnow() - self.derniere_intervention_date
+        return utcnow() - self.derniere_intervention_date
 
-    @property
+    @_kpi_property
     def contrat_principal(self) -> Optional["Contrat"]:
         """Contrat principal actif (le plus récent)."""
-        from app.models.contrat import StatutContrat
-
-        return self.contrats.filter_by(statut=StatutContrat.actif).first()
+        return next(
+            (c for c in self.contrats if c.statut == StatutContrat.en_cours), None
+        )
 
-    @property
+    @_kpi_property
     def taux_satisfaction_moyen(self) -> Optional[float]:
         """Taux de satisfaction moyen basé sur les interventions."""
-        interventions_avec_note = self.interventions.filter(
-            Intervention.satisfaction_client.isnot(None)
-        ).all()
-
-        if not interventions_avec_note:
+        notes = [
+            i.satisfaction_client
+            for i in self.interventions
+            if i.satisfaction_client is not None
+        ]
+        if not notes:
             return None
+        return round(sum(notes) / len(notes), 2)
 
-        total = sum(i.satisfaction_client for i in interventions_avec_note)
-        return round(total / len(interventions_avec_note), 2)
-
-    @property
+    @_kpi_property
     def cout_maintenance_total(self) -> float:
         """Coût total de maintenance facturé (basé sur interventions)."""
         total_centimes = 0
@@ -361,23 +567,23 @@ class Client(Base):
                 total_centimes += intervention.cout_reel
         return round(total_centimes / 100, 2)
 
-    @property
+    @_kpi_property
     def cout_maintenance_annuel(self) -> float:
         """Coût de maintenance des 12 derniers mois."""
-        un_an_ago = datetime.utcnow() - timedelta(days=365)
-        interventions_recentes = self.interventions.filter(
-            Intervention.date_creation >= un_an_ago
-        ).all()
-
-        total_centimes = sum(i.cout_reel for i in interventions_recentes if i.cout_reel)
+        un_an_ago = utcnow() - timedelta(days=365)
+        total_centimes = sum(
+            i.cout_reel
+            for i in self.interventions
+            if i.cout_reel and i.date_creation >= un_an_ago
+        )
         return round(total_centimes / 100, 2)
 
-    @property
+    @_kpi_property
     def delai_moyen_intervention(self) -> Optional[float]:
         """Délai moyen de traitement des interventions (en heures)."""
-        interventions_terminees = self.interventions.filter(
-            Intervention.date_cloture.isnot(None)
-        ).all()
+        interventions_terminees = [
+            i for i in self.interventions if i.date_cloture is not None
+        ]
 
         if not interventions_terminees:
             return None
@@ -388,7 +594,7 @@ class Client(Base):
         ]
         return round(sum(delais) / len(delais), 1)
 
-    @property
+    @hybrid_property
     def niveau_priorite_commerciale(self) -> int:
         """Niveau de priorité commerciale calculé (1-5)."""
         score = 1
@@ -413,6 +619,31 @@ class Client(Base):
 
         return min(score, 5)
 
+    @niveau_priorite_commerciale.inplace.expression
+    @classmethod
+    def _niveau_priorite_commerciale_expression(cls):
+        # Même barème en SQL : score de toute une base client sans charger
+        # les lignes (rapports, tri des listes)
+        score = (
+            1
+            + case(
+                (cls.niveau_service == NiveauService.premium.value, 2),
+                (cls.niveau_service == NiveauService.standard.value, 1),
+                else_=0,
+            )
+            + case(
+                (cls.chiffre_affaires_annuel >= 1000000, 2),
+                (cls.chiffre_affaires_annuel >= 100000, 1),
+                else_=0,
+            )
+            # anciennete_annees (arrondie au dixième) >= 5 : au moins 4,95 ans
+            + case(
+                (cls.date_creation <= utcnow() - timedelta(days=4.95 * 365.25), 1),
+                else_=0,
+            )
+        )
+        return case((score > 5, 5), else_=score)
+
     @property
     def statut_commercial(self) -> str:
         """Statut commercial calculé."""
@@ -427,16 +658,269 @@ class Client(Base):
         else:
             return "Actif"
 
-    @property
+    @hybrid_property
     def telephone_principal(self) -> Optional[str]:
         """Téléphone principal (mobile prioritaire)."""
         return self.telephone_mobile or self.telephone
 
-    @property
+    @telephone_principal.inplace.expression
+    @classmethod
+    def _telephone_principal_expression(cls):
+        return func.coalesce(func.nullif(cls.telephone_mobile, ""), cls.telephone)
+
+    @hybrid_property
     def identifiant_legal(self) -> Optional[str]:
         """Identifiant légal principal (SIRET prioritaire)."""
         return self.numero_siret or self.numero_tva
 
+    @identifiant_legal.inplace.expression
+    @classmethod
+    def _identifiant_legal_expression(cls):
+        return func.coalesce(func.nullif(cls.numero_siret, ""), cls.numero_tva)
+
+    # 📊 Chargement des collections et des KPI
+
+    @classmethod
+    def query_with_kpis(cls) -> Select:
+        """
+        Select de clients avec les collections utilisées par les KPI.
+
+        Les trois collections sont chargées par selectinload (une requête
+        IN par collection pour tout le résultat), prérequis des propriétés
+        KPI calculées en mémoire.
+        """
+        return select(cls).options(*cls.kpi_loaders())
+
+    @classmethod
+    def kpi_loaders(cls) -> tuple:
+        """
+        Options selectinload des collections KPI.
+
+        Utilisables sous un autre chargement, ex. pour le client d'un contrat :
+        selectinload(Contrat.client).options(*Client.kpi_loaders()).
+        """
+        return (
+            selectinload(cls.interventions),
+            selectinload(cls.contrats),
+            selectinload(cls.equipements),
+        )
+
+    @classmethod
+    def base_select(cls) -> Select:
+        """
+        Select de clients pour les listes : aucune relation chargeable.
+
+        raiseload("*") fait échouer tout accès paresseux (compte utilisateur
+        compris) ; les KPI viennent de load_kpis / load_latest.
+        """
+        return select(cls).options(raiseload("*"))
+
+    @classmethod
+    def full_select(cls) -> Select:
+        """
+        Select de clients pour les vues détail : to_dict(include_relations=True).
+
+        Collections KPI et compte utilisateur par selectinload ; toute autre
+        relation lève au lieu d'être chargée à la volée.
+        """
+        return cls.query_with_kpis().options(selectinload(cls.user), raiseload("*"))
+
+    @classmethod
+    def load_kpis(cls, session: Session, clients: Iterable["Client"]) -> None:
+        """
+        Précharge les KPI de plusieurs clients en trois requêtes agrégées.
+
+        Une requête GROUP BY client_id par table (interventions, contrats,
+        équipements) remplace les COUNT/SUM émis par propriété et par client.
+        Les propriétés KPI lisent ensuite les valeurs stockées sur l'instance.
+
+        Args:
+            session: Session SQLAlchemy active
+            clients: Clients à enrichir (typiquement une page de liste)
+        """
+        by_id = {client.id: client for client in clients}
+        if not by_id:
+            return
+
+        now = utcnow()
+        debut_mois = _debut_mois(now)
+        un_an_ago = now - timedelta(days=365)
+        six_mois_ago = now - timedelta(days=180)
+        duree_heures = _duree_heures(
+            Intervention.date_creation,
+            Intervention.date_cloture,
+            session.get_bind().dialect.name,
+        )
+
+        kpis = {
+            client_id: {
+                "nb_interventions_total": 0,
+                "nb_interventions_ouvertes": 0,
+                "nb_interventions_mois_courant": 0,
+                "derniere_intervention_date": None,
+                "taux_satisfaction_moyen": None,
+                "cout_maintenance_total": 0.0,
+                "cout_maintenance_annuel": 0.0,
+                "delai_moyen_intervention": None,
+                "sla_global": None,
+                "nb_contrats_actifs": 0,
+                "nb_equipements_total": 0,
+                "nb_equipements_operationnels": 0,
+            }
+            for client_id in by_id
+        }
+
+        interventions = session.execute(
+            select(
+                Intervention.client_id,
+                func.count(Intervention.id),
+                func.sum(case((Intervention.statut.in_(_OPEN_STATUSES), 1), else_=0)),
+                func.sum(case((Intervention.date_creation >= debut_mois, 1), else_=0)),
+                func.max(Intervention.date_creation),
+                func.avg(Intervention.satisfaction_client),
+                func.sum(Intervention.cout_reel),
+                func.sum(
+                    case(
+                        (
+                            Intervention.date_creation >= un_an_ago,
+                            Intervention.cout_reel,
+                        ),
+                        else_=0,
+                    )
+                ),
+                # Interventions non clôturées : durée NULL, ignorée par AVG
+                func.avg(duree_heures),
+                # SLA (6 derniers mois) : interventions clôturées / dans les délais
+                func.sum(
+                    case(
+                        (
+                            (Intervention.date_creation >= six_mois_ago)
+                            & Intervention.date_cloture.isnot(None),
+                            1,
+                        ),
+                        else_=0,
+                    )
+                ),
+                func.sum(
+                    case(
+                        (
+                            (Intervention.date_creation >= six_mois_ago)
+                            & (duree_heures <= _SLA_HEURES),
+                            1,
+                        ),
+                        else_=0,
+                    )
+                ),
+            )
+            .where(Intervention.client_id.in_(by_id))
+            .group_by(Intervention.client_id)
+        )
+        for (
+            client_id,
+            total,
+            ouvertes,
+            mois,
+            derniere,
+            satisfaction,
+            cout,
+            cout_an,
+            delai,
+            sla_total,
+            sla_respectes,
+        ) in interventions:
+            kpis[client_id].update(
+                nb_interventions_total=total,
+                nb_interventions_ouvertes=ouvertes or 0,
+                nb_interventions_mois_courant=mois or 0,
+                derniere_intervention_date=derniere,
+                taux_satisfaction_moyen=(
+                    round(float(satisfaction), 2) if satisfaction is not None else None
+                ),
+                cout_maintenance_total=round((cout or 0) / 100, 2),
+                cout_maintenance_annuel=round((cout_an or 0) / 100, 2),
+                delai_moyen_intervention=(
+                    round(float(delai), 1) if delai is not None else None
+                ),
+                sla_global=(
+                    round(sla_respectes / sla_total * 100, 1) if sla_total else None
+                ),
+            )
+
+        contrats = session.execute(
+            select(Contrat.client_id, func.count(Contrat.id))
+            .where(
+                Contrat.client_id.in_(by_id),
+                Contrat.statut == StatutContrat.en_cours,
+            )
+            .group_by(Contrat.client_id)
+        )
+        for client_id, actifs in contrats:
+            kpis[client_id]["nb_contrats_actifs"] = actifs
+
+        equipements = session.execute(
+            select(
+                Equipement.client_id,
+                func.count(Equipement.id),
+                func.sum(
+                    case(
+                        (Equipement.statut == StatutEquipement.operationnel.value, 1),
+                        else_=0,
+                    )
+                ),
+            )
+            .where(Equipement.client_id.in_(by_id))
+            .group_by(Equipement.client_id)
+        )
+        for client_id, total, operationnels in equipements:
+            kpis[client_id].update(
+                nb_equipements_total=total,
+                nb_equipements_operationnels=operationnels or 0,
+            )
+
+        for client_id, client in by_id.items():
+            if client._kpi_cache:
+                client._kpi_cache.update(kpis[client_id])
+            else:
+                client._kpi_cache = kpis[client_id]
+
+    @classmethod
+    def load_latest(cls, session: Session, clients: Iterable["Client"]) -> None:
+        """
+        Précharge la dernière intervention et le contrat principal de clients.
+
+        Deux requêtes pour toute la page (ROW_NUMBER() par client) au lieu
+        d'un ORDER BY ... LIMIT 1 par client ; derniere_intervention et
+        contrat_principal lisent ensuite le résultat sur l'instance.
+
+        Args:
+            session: Session SQLAlchemy active
+            clients: Clients à enrichir (typiquement une page de liste)
+        """
+        by_id = {client.id: client for client in clients}
+        if not by_id:
+            return
+
+        latest = {
+            "derniere_intervention": _first_per_client(
+                session,
+                Intervention,
+                Intervention.client_id.in_(by_id),
+                Intervention.date_creation.desc(),
+            ),
+            "contrat_principal": _first_per_client(
+                session,
+                Contrat,
+                Contrat.client_id.in_(by_id)
+                & (Contrat.statut == StatutContrat.en_cours),
+                Contrat.date_debut.desc(),
+            ),
+        }
+        for client_id, client in by_id.items():
+            if client._kpi_cache is None:
+                client._kpi_cache = {}
+            for name, par_client in latest.items():
+                client._kpi_cache[name] = par_client.get(client_id)
+
     # 🔧 Méthodes métier pour gestion client
 
     def desactiver(self, raison: str = None) -> None:
@@ -467,36 +951,26 @@ class Client(Base):
 
     def get_interventions_urgentes(self) -> List["Intervention"]:
         """Retourne les interventions urgentes en cours."""
-        from app.models.intervention import PrioriteIntervention, StatutIntervention
-
-        return list(
-            self.interventions.filter(
-                Intervention.statut.in_(
-                    [
-                        StatutIntervention.ouverte,
-                        StatutIntervention.affectee,
-                        StatutIntervention.en_cours,
-                    ]
-                ),
-                Intervention.priorite.in_(
-                    [PrioriteIntervention.urgente, PrioriteIntervention.haute]
-                ),
-            ).all()
-        )
+        return [
+            i
+            for i in self.interventions
+            if i.statut in _URGENT_STATUSES and i.priorite in _URGENT_PRIORITIES
+        ]
 
     def get_equipements_en_panne(self) -> List["Equipement"]:
         """Retourne les équipements actuellement en panne."""
-        from app.models.equipement import StatutEquipement
-
-        return list(self.equipements.filter_by(statut=StatutEquipement.panne).all())
+        return [e for e in self.equipements if e.statut == StatutEquipement.panne]
 
     def calculer_sla_global(self) -> Optional[float]:
         """Calcule le respect global des SLA sur les 6 derniers mois."""
-        six_mois_ago = datetime.utcnow() - timedelta(days=180)
-        interventions_recentes = self.interventions.filter(
-            Intervention.date_creation >= six_mois_ago,
-            Intervention.date_cloture.isnot(None),
-        ).all()
+        if self._kpi_cache is not None and "sla_global" in self._kpi_cache:
+            return self._kpi_cache["sla_global"]
+        six_mois_ago = utcnow() - timedelta(days=180)
+        interventions_recentes = [
+            i
+            for i in self.interventions
+            if i.date_creation >= six_mois_ago and i.date_cloture is not None
+        ]
 
         if not interventions_recentes:
             return None
@@ -517,20 +991,52 @@ class Client(Base):
         Returns:
             Dict avec les KPI d'activité
         """
-        date_debut = datetime.utcnow() - timedelta(days=nb_mois * 30)
-
-        interventions_periode = self.interventions.filter(
-            Intervention.date_creation >= date_debut
-        ).all()
+        date_debut = utcnow() - timedelta(days=nb_mois * 30)
+
+        # Comptages et coût de la période en une requête agrégée
+        nb_interventions, nb_preventives, nb_correctives, cout_centimes = (
+            object_session(self)
+            .execute(
+                select(
+                    func.count(Intervention.id),
+                    func.sum(
+                        case(
+                            (
+                                Intervention.type_intervention
+                                == InterventionType.preventive,
+                                1,
+                            ),
+                            else_=0,
+                        )
+                    ),
+                    func.sum(
+                        case(
+                            (
+                                Intervention.type_intervention
+                                == InterventionType.corrective,
+                                1,
+                            ),
+                            else_=0,
+                        )
+                    ),
+                    func.sum(
+                        func.coalesce(Intervention.cout_main_oeuvre, 0)
+                        + func.coalesce(Intervention.cout_pieces, 0)
+                    ),
+                ).where(
+                    Intervention.client_id == self.id,
+                    Intervention.date_creation >= date_debut,
+                )
+            )
+            .one()
+        )
 
         return {
             "periode_mois": nb_mois,
-            "nb_interventions": len(interventions_periode),
-            "nb_preventives": sum(1 for i in interventions_periode if i.est_preventive),
-            "nb_correctives": sum(1 for i in interventions_periode if i.est_corrective),
-            "cout_total": sum(
-                i.cout_total_reel for i in interventions_periode if i.cout_total_reel
-            ),
+            "nb_interventions": nb_interventions,
+            "nb_preventives": nb_preventives or 0,
+            "nb_correctives": nb_correctives or 0,
+            "cout_total": round((cout_centimes or 0) / 100, 2),
             "delai_moyen_heures": self.delai_moyen_intervention,
             "taux_satisfaction": self.taux_satisfaction_moyen,
             "sla_respect": self.calculer_sla_global(),
@@ -539,7 +1045,11 @@ class Client(Base):
         }
 
     def to_dict(
-        self, include_sensitive: bool = False, include_relations: bool = False
+        self,
+        include_sensitive: bool = False,
+        include_relations: bool = False,
+        include_computed: bool = False,
+        include_kpis: bool = True,
     ) -> Dict[str, Any]:
         """
         Sérialisation harmonisée en dictionnaire.
@@ -547,99 +1057,44 @@ class Client(Base):
         Args:
             include_sensitive: Inclut données sensibles/commerciales (admin/responsable)
             include_relations: Inclut les données des relations liées
+            include_computed: Inclut l'ancienneté calculée (vues détail)
+            include_kpis: Inclut les KPI d'activité (collections préchargées ou
+                load_kpis requis) ; False pour un client imbriqué dans la
+                sérialisation d'un autre modèle
 
         Returns:
-            Dict contenant les données sérialisées
+            Dict contenant les données sérialisées ; les dates restent des
+            datetime, converties en ISO 8601 par l'encodeur JSON de FastAPI
 
         NOTE: Interface standardisée pour tous les modèles ERP
         """
+        if include_relations:
+            # Échec explicite plutôt qu'une erreur lazy="raise" en cours de route
+            non_chargees = _RELATIONS_DETAIL & sa_inspect(self).unloaded
+            if non_chargees:
+                raise InvalidRequestError(
+                    "Client.to_dict(include_relations=True) requiert "
+                    f"Client.full_select() (non chargées : {sorted(non_chargees)})"
+                )
+
         # Données de base (toujours incluses)
-        data = {
-            "id": self.id,
-            "nom_entreprise": self.nom_entreprise,
-            "nom_commercial": self.nom_commercial,
-            "nom_affichage": self.nom_affichage,
-            "type_client": self.type_client.value,
-            "secteur_activite": self.secteur_activite,
-            "niveau_service": self.niveau_service.value,
-            "nom_contact": self.nom_contact,
-            "nom_complet_contact": self.nom_complet_contact,
-            "fonction_contact": self.fonction_contact,
-            "email": self.email,
-            "telephone_principal": self.telephone_principal,
-            "ville": self.ville,
-            "code_postal": self.code_postal,
-            "pays": self.pays,
-            "is_active": self.is_active,
-            "date_creation": (
-                self.date_creation.isoformat() if self.date_creation else None
-            ),
-            # Propriétés calculées utiles
-            "statut_commercial": self.statut_commercial,
-            "anciennete_annees": self.anciennete_annees,
-            "est_nouveau_client": self.est_nouveau_client,
-            "est_client_premium": self.est_client_premium,
-            "nb_interventions_total": self.nb_interventions_total,
-            "nb_interventions_ouvertes": self.nb_interventions_ouvertes,
-            "nb_equipements_total": self.nb_equipements_total,
-            "derniere_intervention_date": (
-                self.derniere_intervention_date.isoformat()
-                if self.derniere_intervention_date
-                else None
-            ),
-        }
+        data = dict(zip(_BASIC_FIELDS, _BASIC_GETTER(self)))
+        if include_kpis:
+            data.update(zip(_KPI_FIELDS, _KPI_GETTER(self)))
+
+        # Ancienneté : calculée, omise des listes
+        if include_computed:
+            data["anciennete_annees"] = self.anciennete_annees
+            data["est_nouveau_client"] = self.est_nouveau_client
 
         # Données sensibles (commerciales, financières)
         if include_sensitive:
-            data.update(
-                {
-                    "date_modification": (
-                        self.date_modification.isoformat()
-                        if self.date_modification
-                        else None
-                    ),
-                    "numero_siret": self.numero_siret,
-                    "numero_tva": self.numero_tva,
-                    "code_ape": self.code_ape,
-                    "identifiant_legal": self.identifiant_legal,
-                    "taille_entreprise": self.taille_entreprise,
-                    "chiffre_affaires_annuel": (
-                        float(self.chiffre_affaires_annuel)
-                        if self.chiffre_affaires_annuel
-                        else None
-                    ),
-                    "nb_employes": self.nb_employes,
-                    "telephone": self.telephone,
-                    "telephone_mobile": self.telephone_mobile,
-                    "fax": self.fax,
-                    "adresse_ligne1": self.adresse_ligne1,
-                    "adresse_ligne2": self.adresse_ligne2,
-                    "adresse_complete": self.adresse_complete,
-                    "region": self.region,
-                    "notes_commerciales": self.notes_commerciales,
-                    "instructions_particulieres": self.instructions_particulieres,
-                    # KPI commerciaux
-                    "niveau_priorite_commerciale": self.niveau_priorite_commerciale,
-                    "nb_contrats_actifs": self.nb_contrats_actifs,
-                    "nb_interventions_mois_courant": self.nb_interventions_mois_courant,
-                    "nb_equipements_operationnels": self.nb_equipements_operationnels,
-                    "taux_satisfaction_moyen": self.taux_satisfaction_moyen,
-                    "cout_maintenance_total": self.cout_maintenance_total,
-                    "cout_maintenance_annuel": self.cout_maintenance_annuel,
-                    "delai_moyen_intervention": self.delai_moyen_intervention,
-                    "sla_global": self.calculer_sla_global(),
-                    "date_premier_contrat": (
-                        self.date_premier_contrat.isoformat()
-                        if self.date_premier_contrat
-                        else None
-                    ),
-                    "date_derniere_intervention": (
-                        self.date_derniere_intervention.isoformat()
-                        if self.date_derniere_intervention
-                        else None
-                    ),
-                }
-            )
+            data.update(zip(_SENSITIVE_FIELDS, _SENSITIVE_GETTER(self)))
+            if data["chiffre_affaires_annuel"]:
+                data["chiffre_affaires_annuel"] = float(data["chiffre_affaires_annuel"])
+            else:
+                data["chiffre_affaires_annuel"] = None
+            data["sla_global"] = self.calculer_sla_global()
 
         # Relations détaillées (pour vues complètes)
         if include_relations:
@@ -680,3 +1135,73 @@ class Client(Base):
             )
 
         return data
+
+
+def _first_per_client(session: Session, model, criteria, order) -> Dict[int, Any]:
+    """Première ligne de model par client_id selon order, indexée par client_id."""
+    rang = (
+        select(
+            model,
+            func.row_number()
+            .over(partition_by=model.client_id, order_by=order)
+            .label("rang"),
+        )
+        .where(criteria)
+        .subquery()
+    )
+    premiere = aliased(model, rang)
+    # Client déjà en session : relu dans l'identity map (Contrat.client en raise)
+    rows = session.scalars(
+        select(premiere).where(rang.c.rang == 1).options(lazyload(premiere.client))
+    )
+    return {row.client_id: row for row in rows}
+
+
+# Modèles dont les modifications invalident les KPI clients
+_KPI_SOURCES = (Client, Intervention, Contrat, Equipement)
+
+
+def _clients_touches(objets: Iterable[Any]) -> Optional[set]:
+    """
+    Ids des clients dont les KPI dépendent des lignes flushées.
+
+    client_id ancien et nouveau (historique d'attribut) pour les
+    interventions / contrats / équipements ; une ligne sans client (avant
+    comme après) n'en touche aucun. None si un client_id est inconnu
+    (attribut non chargé), auquel cas tous les clients sont visés.
+    """
+    ids = set()
+    for obj in objets:
+        if isinstance(obj, Client):
+            ids.add(obj.id)
+        elif isinstance(obj, _KPI_SOURCES):
+            etat = sa_inspect(obj)
+            if "client_id" in etat.unloaded:
+                # Nouvelle ligne sans client_id renseigné : NULL, aucun client
+                if etat.pending:
+                    continue
+                return None
+            ids.update(set(etat.attrs.client_id.history.sum()) - {None})
+    return ids
+
+
+@event.listens_for(Session, "after_flush")
+def _invalider_kpis(session: Session, flush_context) -> None:
+    """
+    Oublie les KPI mémorisés des seuls clients touchés par le flush.
+
+    Les KPI préchargés des autres clients de la session restent valables ;
+    ceux d'un client touché sont recalculés à l'accès (collections chargées)
+    ou rechargés par un nouvel appel à Client.load_kpis.
+    """
+    ids = _clients_touches(chain(session.new, session.dirty, session.deleted))
+    if ids is None:
+        clients = (obj for obj in session.identity_map.values())
+    else:
+        clients = (
+            session.identity_map.get(identity_key(Client, client_id))
+            for client_id in ids
+        )
+    for client in clients:
+        if isinstance(client, Client):
+            client._kpi_cache = None
@@ -2,7 +2,7 @@
 
 import enum
 from datetime import date, datetime
-from typing import TYPE_CHECKING, Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from sqlalchemy import (
     Boolean,
@@ -14,11 +14,15 @@ from sqlalchemy import (
     Index,
     Integer,
     Numeric,
+    Select,
     String,
     Text,
+    select,
+    text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Session, raiseload, relationship, selectinload
 
+from app.core.clock import today
 from app.db.database import Base
 
 
@@ -73,6 +77,12 @@ class Contrat(Base):
     __table_args__ = (
         Index("idx_contrat_client_dates", "client_id", "date_debut", "date_fin"),
         Index("idx_contrat_statut", "statut"),
+        # Partiel sous PostgreSQL : contrats en cours par client
+        Index(
+            "idx_contrat_client_actif",
+            "client_id",
+            postgresql_where=text("statut = 'en_cours'"),
+        ),
     )
 
     id: int = Column(Integer, primary_key=True, index=True)
@@ -128,24 +138,25 @@ class Contrat(Base):
         nullable=False,
         index=True,
     )
-    client: "Client" = relationship("Client", back_populates="contrats", lazy="joined")
+    # Relations - client en lazy raise : chargement explicite (full_select)
+    client: "Client" = relationship("Client", back_populates="contrats", lazy="raise")
     equipements = relationship(
         "Equipement",
         back_populates="contrat",
         cascade="all, delete-orphan",
-        lazy="dynamic",
+        lazy="select",
     )
     interventions = relationship(
         "Intervention",
         back_populates="contrat",
         cascade="all, delete-orphan",
-        lazy="dynamic",
+        lazy="select",
     )
     factures = relationship(
         "Facture",
         back_populates="contrat",
         cascade="all, delete-orphan",
-        lazy="dynamic",
+        lazy="select",
     )
 
     def __repr__(self) -> str:
@@ -156,21 +167,21 @@ class Contrat(Base):
 
     @property
     def est_actif(self) -> bool:
-        today = date.today()
+        jour = today()
         return (
             self.statut == StatutContrat.en_cours
-            and self.date_debut <= today <= self.date_fin
+            and self.date_debut <= jour <= self.date_fin
         )
 
     @property
     def est_expire(self) -> bool:
-        return date.today() > self.date_fin
+        return today() > self.date_fin
 
     @property
     def jours_restants(self) -> int:
         if self.est_expire:
             return 0
-        return (self.date_fin - date.today()).days
+        return (self.date_fin - today()).days
 
     @property
     def pourcentage_interventions_utilisees(self) -> float:
@@ -220,6 +231,70 @@ class Contrat(Base):
         if self.heures_maintenance_incluses and heures_travaillees > 0:
             self.heures_maintenance_utilisees += heures_travaillees
 
+    @classmethod
+    def full_select(cls) -> Select:
+        """
+        Select de contrats pour to_dict(include_relations=True).
+
+        Client et ses collections KPI (Client.kpi_loaders, requises par le
+        to_dict du client) par selectinload ; toute autre relation du contrat
+        lève au lieu d'être chargée à la volée.
+        """
+        from .client import Client
+
+        return select(cls).options(
+            selectinload(cls.client).options(*Client.kpi_loaders()),
+            raiseload("*"),
+        )
+
+    @classmethod
+    def list_as_dicts(cls, session: Session, **filters: Any) -> List[Dict[str, Any]]:
+        """
+        Liste de contrats en dicts, sans instancier de modèles.
+
+        Projection des colonnes de liste (mappings) : ni objets suivis ni
+        identity map. Les indicateurs d'échéance sont calculés en une passe
+        avec la date de la requête.
+
+        Args:
+            session: Session SQLAlchemy active
+            **filters: Égalités sur les colonnes (filter_by), ex. client_id=3
+        """
+        rows = session.execute(
+            select(
+                cls.id,
+                cls.numero_contrat,
+                cls.nom_contrat,
+                cls.type_contrat,
+                cls.statut,
+                cls.date_debut,
+                cls.date_fin,
+                cls.montant_annuel,
+                cls.devise,
+                cls.is_active,
+                cls.client_id,
+            )
+            .filter_by(**filters)
+            .order_by(cls.date_debut.desc(), cls.id)
+        ).mappings()
+        jour = today()
+        contrats = []
+        for row in rows:
+            data = dict(row)
+            data["type_contrat"] = row["type_contrat"].value
+            data["statut"] = row["statut"].value
+            data["montant_annuel"] = (
+                float(row["montant_annuel"]) if row["montant_annuel"] else None
+            )
+            data["est_actif"] = (
+                row["statut"] == StatutContrat.en_cours
+                and row["date_debut"] <= jour <= row["date_fin"]
+            )
+            data["est_expire"] = jour > row["date_fin"]
+            data["jours_restants"] = max((row["date_fin"] - jour).days, 0)
+            contrats.append(data)
+        return contrats
+
     def to_dict(
         self, include_sensitive: bool = False, include_relations: bool = False
     ) -> Dict[str, Any]:
@@ -229,16 +304,10 @@ class Contrat(Base):
             "nom_contrat": self.nom_contrat,
             "type_contrat": self.type_contrat.value,
             "statut": self.statut.value,
-            "date_signature": (
-                self.date_signature.isoformat() if self.date_signature else None
-            ),
-            "date_debut": self.date_debut.isoformat() if self.date_debut else None,
-            "date_fin": self.date_fin.isoformat() if self.date_fin else None,
-            "date_renouvellement": (
-                self.date_renouvellement.isoformat()
-                if self.date_renouvellement
-                else None
-            ),
+            "date_signature": self.date_signature,
+            "date_debut": self.date_debut,
+            "date_fin": self.date_fin,
+            "date_renouvellement": self.date_renouvellement,
             "montant_annuel": (
                 float(self.montant_annuel) if self.montant_annuel else None
             ),
@@ -263,12 +332,8 @@ class Contrat(Base):
             "contact_client": self.contact_client,
             "contact_responsable": self.contact_responsable,
             "is_active": self.is_active,
-            "date_creation": (
-                self.date_creation.isoformat() if self.date_creation else None
-            ),
-            "date_modification": (
-                self.date_modification.isoformat() if self.date_modification else None
-            ),
+            "date_creation": self.date_creation,
+            "date_modification": self.date_modification,
             "client_id": self.client_id,
             "est_actif": self.est_actif,
             "est_expire": self.est_expire,
@@ -335,7 +400,7 @@ class Facture(Base):
         index=True,
     )
     contrat: "Contrat" = relationship(
-        "Contrat", back_populates="factures", lazy="joined"
+        "Contrat", back_populates="factures", lazy="raise"
     )
 
     def __repr__(self) -> str:
@@ -348,42 +413,76 @@ class Facture(Base):
     def est_en_retard(self) -> bool:
         return (
             self.statut_paiement != StatutPaiement.payee
-            and date.today() > self.date_echeance
+            and today() > self.date_echeance
         )
 
     @property
     def jours_retard(self) -> int:
         if self.est_en_retard:
-            return (date.today() - self.date_echeance).days
+            return (today() - self.date_echeance).days
         return 0
 
+    @classmethod
+    def full_select(cls) -> Select:
+        """Select de factures avec leur contrat (to_dict(include_relations=True))."""
+        return select(cls).options(selectinload(cls.contrat), raiseload("*"))
+
+    @classmethod
+    def list_as_dicts(cls, session: Session, **filters: Any) -> List[Dict[str, Any]]:
+        """
+        Liste de factures en dicts, sans instancier de modèles.
+
+        Même principe que Contrat.list_as_dicts : projection des colonnes de
+        liste, retard calculé en une passe avec la date de la requête.
+        """
+        rows = session.execute(
+            select(
+                cls.id,
+                cls.numero_facture,
+                cls.date_emission,
+                cls.date_echeance,
+                cls.montant_ttc,
+                cls.statut_paiement,
+                cls.date_paiement,
+                cls.contrat_id,
+            )
+            .filter_by(**filters)
+            .order_by(cls.date_echeance.desc(), cls.id)
+        ).mappings()
+        jour = today()
+        factures = []
+        for row in rows:
+            data = dict(row)
+            data["montant_ttc"] = float(row["montant_ttc"])
+            data["statut_paiement"] = row["statut_paiement"].value
+            en_retard = (
+                row["statut_paiement"] != StatutPaiement.payee
+                and jour > row["date_echeance"]
+            )
+            data["est_en_retard"] = en_retard
+            data["jours_retard"] = (
+                (jour - row["date_echeance"]).days if en_retard else 0
+            )
+            factures.append(data)
+        return factures
+
     def to_dict(
         self, include_sensitive: bool = False, include_relations: bool = False
     ) -> Dict[str, Any]:
         data = {
             "id": self.id,
             "numero_facture": self.numero_facture,
-            "date_emission": (
-                self.date_emission.isoformat() if self.date_emission else None
-            ),
-            "date_echeance": (
-                self.date_echeance.isoformat() if self.date_echeance else None
-            ),
+            "date_emission": self.date_emission,
+            "date_echeance": self.date_echeance,
             "montant_ht": float(self.montant_ht),
             "taux_tva": float(self.taux_tva),
             "montant_ttc": float(self.montant_ttc),
             "statut_paiement": self.statut_paiement.value,
-            "date_paiement": (
-                self.date_paiement.isoformat() if self.date_paiement else None
-            ),
+            "date_paiement": self.date_paiement,
             "description": self.description,
-            "periode_debut": (
-                self.periode_debut.isoformat() if self.periode_debut else None
-            ),
-            "periode_fin": self.periode_fin.isoformat() if self.periode_fin else None,
-            "date_creation": (
-                self.date_creation.isoformat() if self.date_creation else None
-            ),
+            "periode_debut": self.periode_debut,
+            "periode_fin": self.periode_fin,
+            "date_creation": self.date_creation,
             "contrat_id": self.contrat_id,
             "est_en_retard": self.est_en_retard,
             "jours_retard": self.jours_retard,
@@ -5,10 +5,19 @@ Exemple : utilisé pour stocker et référencer les documents opérationnels dan
 """
 
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Select,
+    String,
+    select,
+)
+from sqlalchemy.orm import Session, raiseload, relationship, selectinload
 
 from app.db.database import Base
 
@@ -16,6 +25,15 @@ if TYPE_CHECKING:
     from .intervention import Intervention
 
 
+def _url_publique(chemin: Optional[str]) -> str:
+    # URL d'accès public au document (pour l'API ou le front).
+    # Les fichiers sont servis depuis /static, et `chemin` est relatif
+    # (ex: "static/uploads/<uuid>.ext").
+    # Normalise pour éviter les doubles slash/backslashes.
+    rel = (chemin or "").lstrip("/\\")
+    return f"/{rel}" if rel else "/static/uploads"
+
+
 class Document(Base):
     """
     Modèle Document - Gestion des fichiers liés à une intervention.
@@ -57,7 +75,7 @@ class Document(Base):
         index=True,
     )
     intervention: "Intervention" = relationship(
-        "Intervention", back_populates="documents", lazy="select"
+        "Intervention", back_populates="documents", lazy="raise"
     )
 
     def __repr__(self) -> str:
@@ -68,12 +86,38 @@ class Document(Base):
 
     @property
     def url(self) -> str:
-        # URL d'accès public au document (pour l'API ou le front).
-        # Les fichiers sont servis depuis /static, et `chemin` est relatif
-        # (ex: "static/uploads/<uuid>.ext").
-        # Normalise pour éviter les doubles slash/backslashes.
-        rel = (self.chemin or "").lstrip("/\\")
-        return f"/{rel}" if rel else "/static/uploads"
+        return _url_publique(self.chemin)
+
+    @classmethod
+    def full_select(cls) -> Select:
+        """Select de documents avec leur intervention (to_dict(include_relations=True))."""
+        return select(cls).options(selectinload(cls.intervention), raiseload("*"))
+
+    @classmethod
+    def list_as_dicts(cls, session: Session, **filters: Any) -> List[Dict[str, Any]]:
+        """
+        Liste de documents en dicts (champs de DocumentOut + url), sans
+        instancier de modèles.
+
+        Args:
+            session: Session SQLAlchemy active
+            **filters: Égalités sur les colonnes (filter_by), ex. intervention_id=3
+        """
+        rows = session.execute(
+            select(
+                cls.id,
+                cls.nom_fichier,
+                cls.chemin,
+                cls.date_upload,
+                cls.intervention_id,
+            ).filter_by(**filters)
+        ).mappings()
+        documents = []
+        for row in rows:
+            data = dict(row)
+            data["url"] = _url_publique(row["chemin"])
+            documents.append(data)
+        return documents
 
     def to_dict(
         self, include_sensitive: bool = False, include_relations: bool = False
@@ -82,7 +126,7 @@ class Document(Base):
             "id": self.id,
             "nom_fichier": self.nom_fichier,
             "chemin": self.chemin if include_sensitive else None,
-            "date_upload": self.date_upload.isoformat() if self.date_upload else None,
+            "date_upload": self.date_upload,
             "url": self.url,
             "intervention_id": self.intervention_id,
         }
@@ -131,18 +131,17 @@ class Equipement(Base):
     etage = Column(String(20), nullable=True)
     zone = Column(String(100), nullable=True)
 
-    # Statut opérationnel
+    # Statut opérationnel (indexés via les composites
+    # idx_equipement_statut_criticite et idx_equipement_client_statut)
     statut = Column(
         String(20),
         default="operationnel",
         nullable=False,
-        index=True,
     )
     criticite = Column(
         String(20),
         default="standard",
         nullable=False,
-        index=True,
     )
 
     # Caractéristiques techniques
@@ -170,7 +169,6 @@ class Equipement(Base):
         Integer,
         ForeignKey("clients.id", ondelete="SET NULL"),
         nullable=True,
-        index=True,
     )
     contrat_id = Column(
         Integer,
@@ -612,7 +610,9 @@ class Equipement(Base):
         if include_relations:
             data.update(
                 {
-                    "client": self.client.to_dict() if self.client else None,
+                    "client": (
+                        self.client.to_dict(include_kpis=False) if self.client else None
+                    ),
                     "contrat": self.contrat.to_dict() if self.contrat else None,
                     "client_id": self.client_id,
                     "contrat_id": self.contrat_id,
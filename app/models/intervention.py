@@ -33,6 +33,7 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    text,
 )
 from sqlalchemy.orm import relationship
 
@@ -145,6 +146,16 @@ class Intervention(Base):
         # La colonne DB est nommée "type" (attribut Python: type_intervention)
         Index("idx_intervention_equipement_type", "equipement_id", "type"),
         Index("idx_intervention_client_statut", "client_id", "statut"),
+        # Partiel sous PostgreSQL : seules les interventions ouvertes (comptage
+        # des interventions ouvertes d'un client) ; index complet sous SQLite
+        Index(
+            "idx_intervention_client_open",
+            "client_id",
+            "statut",
+            postgresql_where=text(
+                "statut IN ('ouverte', 'affectee', 'en_cours', 'en_attente')"
+            ),
+        ),
         Index("idx_intervention_dates", "date_creation", "date_limite"),
         Index("idx_intervention_type_urgence", "type", "urgence"),
     )
@@ -1005,7 +1016,9 @@ class Intervention(Base):
                     "technicien": (
                         self.technicien.to_dict() if self.technicien else None
                     ),
-                    "client": self.client.to_dict() if self.client else None,
+                    "client": (
+                        self.client.to_dict(include_kpis=False) if self.client else None
+                    ),
                     "contrat": self.contrat.to_dict() if self.contrat else None,
                     "created_by": (
                         self.created_by.to_dict() if self.created_by else None
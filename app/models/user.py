@@ -417,7 +417,9 @@ class User(Base):
                     "technicien": (
                         self.technicien.to_dict() if self.technicien else None
                     ),
-                    "client": self.client.to_dict() if self.client else None,
+                    "client": (
+                        self.client.to_dict(include_kpis=False) if self.client else None
+                    ),
                     # Permissions calculées
                     "permissions": {
                         "can_manage_users": self.can_manage_users,
@@ -8,10 +8,13 @@ from fastapi import HTTPException
 from jinja2 import Environment, FileSystemLoader, TemplateNotFound
 from sqlalchemy.orm import Session
 
+from app.core.logging import get_logger
 from app.models.notification import Notification
 from app.models.user import User
 from app.schemas.notification import NotificationCreate
 
+logger = get_logger(__name__)
+
 # Configuration des templates Jinja
 env = Environment(loader=FileSystemLoader("app/templates"))
 
@@ -37,7 +40,7 @@ def send_email_notification(email_to: str, notification: Notification, env_param
         html_content = template.render(notification=notification, recipient=email_to)
 
         # Envoi de l'email (simulation pour les tests)
-        print(f"Email envoyé à {email_to} avec template {template_name}")
+        logger.info("Email envoyé à %s avec template %s", email_to, template_name)
 
         # Simuler l'envoi SMTP pour les tests
         # Ces appels SMTP peuvent être mockés dans les tests
@@ -105,6 +108,6 @@ def create_notification(db: Session, data: NotificationCreate) -> Notification:
             except Exception as _e:
                 # Log doux: on ne fait pas échouer la requête si l'email
                 # ne part pas
-                print(f"Envoi email échoué (non bloquant): {_e}")
+                logger.warning("Envoi email échoué (non bloquant): %s", _e)
 
     return notif
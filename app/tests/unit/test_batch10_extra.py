@@ -35,18 +35,21 @@ def test_upload_document_alias_calls_service(monkeypatch):
 
 def test_list_documents_returns_all():
     db = MagicMock()
-    db.query.return_value.all.return_value = ["d1", "d2"]
+    db.execute.return_value.mappings.return_value = [
+        {"id": 1, "chemin": "static/uploads/a.pdf"},
+        {"id": 2, "chemin": None},
+    ]
     res = documents_router.list_documents(db=db)
-    assert res == ["d1", "d2"]
+    assert [d["url"] for d in res] == ["/static/uploads/a.pdf", "/static/uploads"]
 
 
 def test_list_documents_by_intervention_filters():
     db = MagicMock()
-    q = MagicMock()
-    db.query.return_value = q
-    q.filter.return_value.all.return_value = ["d"]
+    db.execute.return_value.mappings.return_value = [{"id": 1, "chemin": "x"}]
     res = documents_router.list_documents_by_intervention(intervention_id=5, db=db)
-    assert res == ["d"]
+    assert res == [{"id": 1, "chemin": "x", "url": "/x"}]
+    (stmt,), _ = db.execute.call_args
+    assert "documents.intervention_id = " in str(stmt)
 
 
 def test_delete_document_not_found():
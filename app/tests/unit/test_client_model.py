@@ -0,0 +1,475 @@
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, select
+from sqlalchemy.exc import InvalidRequestError
+
+from app.models.client import Client, TypeClient
+from app.models.contrat import Contrat, Facture, StatutContrat, TypeContrat
+from app.models.equipement import (
+    CriticiteEquipement,
+    Equipement,
+    StatutEquipement,
+)
+from app.models.intervention import (
+    Intervention,
+    InterventionType,
+    PrioriteIntervention,
+    StatutIntervention,
+)
+from app.models.user import User, UserRole
+
+
+@pytest.fixture(autouse=True)
+def _purge_clients(db_session):
+    """Supprime les clients et comptes créés ici (base SQLite partagée)."""
+    yield
+    db_session.rollback()
+    for client in db_session.scalars(
+        select(Client).where(Client.email.like("%@example.ma"))
+    ):
+        db_session.delete(client)
+    db_session.execute(delete(User).where(User.username.like("client_%")))
+    db_session.commit()
+
+
+def _make_user(db, suffix):
+    user = User(
+        username=f"client_{suffix}",
+        email=f"client_{suffix}@example.ma",
+        hashed_password="x",
+        role=UserRole.client,
+    )
+    db.add(user)
+    db.flush()
+    return user
+
+
+def _make_client(db):
+    suffix = uuid4().hex[:8]
+    user = _make_user(db, suffix)
+    client = Client(
+        nom_entreprise=f"Entreprise {suffix}",
+        nom_contact="Contact",
+        email=f"entreprise_{suffix}@example.ma",
+        user_id=user.id,
+    )
+    db.add(client)
+    db.flush()
+
+    now = datetime.utcnow()
+    for k, (statut, cout, note, age) in enumerate(
+        [
+            (StatutIntervention.ouverte, None, None, 2),
+            (StatutIntervention.cloturee, 12345, 4, 2),
+            (StatutIntervention.cloturee, 5000, 2, 400),
+        ]
+    ):
+        db.add(
+            Intervention(
+                titre=f"i{k}",
+                type_intervention=InterventionType.corrective,
+                priorite=PrioriteIntervention.haute,
+                statut=statut,
+                cout_reel=cout,
+                satisfaction_client=note,
+                client_id=client.id,
+                date_creation=now - timedelta(days=age),
+                date_cloture=(
+                    None
+                    if statut == StatutIntervention.ouverte
+                    else now - timedelta(days=age, hours=-12)
+                ),
+            )
+        )
+    db.add(
+        Contrat(
+            numero_contrat=f"K-{suffix}",
+            nom_contrat="Contrat",
+            type_contrat=TypeContrat.contrat_cadre,
+            statut=StatutContrat.en_cours,
+            date_debut=date.today() - timedelta(days=10),
+            date_fin=date.today() + timedelta(days=10),
+            client_id=client.id,
+        )
+    )
+    for nom, statut in (("eq1", "operationnel"), ("eq2", "panne")):
+        db.add(
+            Equipement(
+                nom=nom,
+                type="t",
+                type_equipement="t",
+                localisation="l",
+                client_id=client.id,
+                statut=statut,
+            )
+        )
+    db.commit()
+    return client
+
+
+def test_load_kpis_matches_in_memory_properties(db_session):
+    ids = [_make_client(db_session).id, _make_client(db_session).id]
+    db_session.expire_all()
+    loaded = db_session.scalars(
+        Client.query_with_kpis().where(Client.id.in_(ids)).order_by(Client.id)
+    ).all()
+    expected = [c.to_dict(include_sensitive=True) for c in loaded]
+    delais = [c.delai_moyen_intervention for c in loaded]
+    assert loaded[0].nb_interventions_ouvertes == 1
+    assert loaded[0].nb_contrats_actifs == 1
+    assert loaded[0].nb_equipements_operationnels == 1
+    assert loaded[0].cout_maintenance_total == 173.45
+    assert loaded[0].cout_maintenance_annuel == 123.45
+
+    db_session.expire_all()
+    clients = db_session.scalars(
+        select(Client).where(Client.id.in_(ids)).order_by(Client.id)
+    ).all()
+    Client.load_kpis(db_session, clients)
+
+    assert [c.to_dict(include_sensitive=True) for c in clients] == expected
+    assert expected[0]["sla_global"] == 100.0
+    assert [c.nb_contrats_actifs for c in clients] == [1, 1]
+    assert [c.cout_maintenance_total for c in clients] == [173.45, 173.45]
+    assert [c.delai_moyen_intervention for c in clients] == delais
+
+
+def test_unloaded_collections_raise(db_session):
+    client_id = _make_client(db_session).id
+    db_session.expire_all()
+    client = db_session.get(Client, client_id)
+
+    with pytest.raises(InvalidRequestError):
+        client.nb_interventions_total
+
+
+def test_load_kpis_defaults_for_client_without_activity(db_session):
+    suffix = uuid4().hex[:8]
+    client = Client(
+        nom_entreprise=f"Vide {suffix}",
+        nom_contact="Contact",
+        email=f"vide_{suffix}@example.ma",
+        user_id=_make_user(db_session, suffix).id,
+    )
+    db_session.add(client)
+    db_session.commit()
+
+    Client.load_kpis(db_session, [client])
+
+    assert client.nb_interventions_total == 0
+    assert client.taux_satisfaction_moyen is None
+    assert client.cout_maintenance_total == 0.0
+
+
+def test_type_client_and_niveau_service_stored_as_plain_values():
+    client = Client(type_client=TypeClient.collectivite, niveau_service="premium")
+
+    assert client.type_client == "collectivite"
+    assert type(client.type_client) is str
+    assert client.est_client_premium
+    with pytest.raises(ValueError):
+        client.niveau_service = "platine"
+
+
+def test_to_dict_includes_seniority_only_on_request(db_session):
+    client_id = _make_client(db_session).id
+    db_session.expire_all()
+    client = db_session.scalars(
+        Client.query_with_kpis().where(Client.id == client_id)
+    ).one()
+
+    assert "anciennete_annees" not in client.to_dict()
+    data = client.to_dict(include_computed=True)
+    assert data["anciennete_annees"] == 0.0
+    assert data["est_nouveau_client"] is True
+    # Dates laissées en datetime, encodées en ISO 8601 par FastAPI
+    assert isinstance(data["date_creation"], datetime)
+    assert jsonable_encoder(data)["date_creation"] == data["date_creation"].isoformat()
+
+
+def test_generer_rapport_activite_aggregates_period(db_session):
+    client_id = _make_client(db_session).id
+    db_session.expire_all()
+    client = db_session.scalars(
+        Client.query_with_kpis().where(Client.id == client_id)
+    ).one()
+
+    rapport = client.generer_rapport_activite(nb_mois=12)
+
+    # L'intervention vieille de 400 jours est hors période
+    assert rapport["nb_interventions"] == 2
+    assert rapport["nb_correctives"] == 2
+    assert rapport["nb_preventives"] == 0
+    assert rapport["equipements_operationnels"] == 1
+
+
+def test_kpis_memoized_until_flush(db_session):
+    client_id = _make_client(db_session).id
+    db_session.expire_all()
+    client = db_session.scalars(
+        Client.query_with_kpis().where(Client.id == client_id)
+    ).one()
+    assert client.nb_interventions_ouvertes == 1
+    assert client._kpi_cache["nb_interventions_ouvertes"] == 1
+
+    db_session.add(
+        Intervention(
+            titre="nouvelle",
+            type_intervention=InterventionType.corrective,
+            priorite=PrioriteIntervention.haute,
+            statut=StatutIntervention.ouverte,
+            client=client,
+        )
+    )
+    db_session.flush()
+
+    assert client._kpi_cache is None
+    assert client.nb_interventions_ouvertes == 2
+
+
+
+def test_flush_only_forgets_kpis_of_touched_clients(db_session):
+    ids = [_make_client(db_session).id, _make_client(db_session).id]
+    db_session.expire_all()
+    touche, autre = db_session.scalars(
+        Client.base_select().where(Client.id.in_(ids)).order_by(Client.id)
+    ).all()
+    Client.load_kpis(db_session, [touche, autre])
+
+    intervention = db_session.scalars(
+        select(Intervention).where(
+            Intervention.client_id == touche.id,
+            Intervention.statut == StatutIntervention.ouverte,
+        )
+    ).one()
+    intervention.statut = StatutIntervention.en_cours
+    db_session.flush()
+
+    # KPI préchargés conservés pour le client non touché
+    assert autre.to_dict()["nb_interventions_ouvertes"] == 1
+    # Client touché : KPI oubliés, à recharger (base_select lève sinon)
+    assert touche._kpi_cache is None
+    with pytest.raises(InvalidRequestError):
+        touche.to_dict()
+    Client.load_kpis(db_session, [touche])
+    assert touche.to_dict()["nb_interventions_ouvertes"] == 1
+
+
+def test_flush_of_unassigned_or_moved_rows_keeps_other_clients_kpis(db_session):
+    ids = [_make_client(db_session).id for _ in range(3)]
+    db_session.expire_all()
+    ancien, nouveau, autre = db_session.scalars(
+        Client.base_select().where(Client.id.in_(ids)).order_by(Client.id)
+    ).all()
+    Client.load_kpis(db_session, [ancien, nouveau, autre])
+
+    # Équipement sans client : aucun KPI client n'est oublié
+    db_session.add(
+        Equipement(nom="libre", type="t", type_equipement="t", localisation="l")
+    )
+    db_session.flush()
+    assert all(c._kpi_cache is not None for c in (ancien, nouveau, autre))
+
+    # Équipement réaffecté : ancien et nouveau client oubliés, pas le troisième
+    equipement = db_session.scalars(
+        select(Equipement).where(Equipement.client_id == ancien.id)
+    ).first()
+    equipement.client_id = nouveau.id
+    db_session.flush()
+    assert ancien._kpi_cache is None and nouveau._kpi_cache is None
+    assert autre._kpi_cache is not None
+
+
+    premium = _make_client(db_session)
+    premium.niveau_service = "premium"
+    premium.nom_commercial = "AAA Enseigne"
+    premium.telephone_mobile = "0600000000"
+    other = _make_client(db_session)
+    db_session.commit()
+
+    rows = db_session.execute(
+        select(Client.id, Client.nom_affichage, Client.telephone_principal)
+        .where(Client.id.in_([premium.id, other.id]))
+        .order_by(Client.nom_affichage)
+    ).all()
+    assert rows[0] == (premium.id, "AAA Enseigne", "0600000000")
+    assert rows[1].nom_affichage == other.nom_entreprise
+
+    premium_ids = db_session.scalars(
+        select(Client.id).where(
+            Client.id.in_([premium.id, other.id]),
+            Client.est_client_premium,
+            Client.est_nouveau_client,
+        )
+    ).all()
+    assert premium_ids == [premium.id]
+
+
+def test_niveau_priorite_commerciale_sql_matches_python(db_session):
+    clients = [_make_client(db_session) for _ in range(3)]
+    clients[0].niveau_service = "premium"
+    clients[0].chiffre_affaires_annuel = 2000000
+    clients[0].date_creation = datetime.utcnow() - timedelta(days=6 * 365)
+    clients[1].niveau_service = "basique"
+    clients[1].chiffre_affaires_annuel = 150000
+    db_session.commit()
+
+    ids = [c.id for c in clients]
+    scores = dict(
+        db_session.execute(
+            select(Client.id, Client.niveau_priorite_commerciale).where(
+                Client.id.in_(ids)
+            )
+        ).all()
+    )
+    assert scores == {c.id: c.niveau_priorite_commerciale for c in clients}
+    assert [scores[i] for i in ids] == [5, 2, 2]
+
+
+def test_load_latest_prefetches_last_intervention_and_main_contract(db_session):
+    ids = [_make_client(db_session).id, _make_client(db_session).id]
+    db_session.expire_all()
+    loaded = db_session.scalars(
+        Client.query_with_kpis().where(Client.id.in_(ids)).order_by(Client.id)
+    ).all()
+    expected = [(c.derniere_intervention.id, c.contrat_principal.id) for c in loaded]
+
+    db_session.expire_all()
+    clients = db_session.scalars(
+        select(Client).where(Client.id.in_(ids)).order_by(Client.id)
+    ).all()
+    Client.load_latest(db_session, clients)
+
+    assert [
+        (c.derniere_intervention.id, c.contrat_principal.id) for c in clients
+    ] == expected
+
+
+def test_base_select_refuses_lazy_loads_and_detail_serialisation(db_session):
+    client_id = _make_client(db_session).id
+    db_session.expire_all()
+    client = db_session.scalars(
+        Client.base_select().where(Client.id == client_id)
+    ).one()
+
+    with pytest.raises(InvalidRequestError):
+        client.user
+    with pytest.raises(InvalidRequestError, match="full_select"):
+        client.to_dict(include_relations=True)
+
+    db_session.expire_all()
+    detail = db_session.scalars(
+        Client.full_select().where(Client.id == client_id)
+    ).one()
+    assert detail.user is not None
+    assert detail.nb_equipements_total == 2
+
+
+def test_contrat_full_select_serialises_client_without_lazy_loads(db_session):
+    client_id = _make_client(db_session).id
+    db_session.expire_all()
+
+    contrat = db_session.scalars(
+        select(Contrat).where(Contrat.client_id == client_id)
+    ).one()
+    with pytest.raises(InvalidRequestError):
+        contrat.client
+
+    contrat = db_session.scalars(
+        Contrat.full_select().where(Contrat.client_id == client_id)
+    ).one()
+    data = contrat.to_dict(include_relations=True)
+    assert data["client"]["id"] == client_id
+    assert data["client"]["nb_interventions_total"] == 3
+
+
+
+def test_contrat_full_select_serialises_established_client(db_session):
+    client = _make_client(db_session)
+    client_id = client.id
+    # Client ancien : statut_commercial lit nb_contrats_actifs
+    client.date_creation = datetime.utcnow() - timedelta(days=400)
+    db_session.commit()
+    db_session.expire_all()
+
+    contrat = db_session.scalars(
+        Contrat.full_select().where(Contrat.client_id == client_id)
+    ).one()
+    data = contrat.to_dict(include_relations=True)
+    assert data["client"]["statut_commercial"] == "Actif"
+
+def test_contrat_list_as_dicts_matches_to_dict(db_session):
+    client_id = _make_client(db_session).id
+    db_session.expire_all()
+
+    (row,) = Contrat.list_as_dicts(db_session, client_id=client_id)
+    contrat = db_session.get(Contrat, row["id"])
+    expected = contrat.to_dict()
+    for key, value in row.items():
+        assert value == expected[key], key
+    assert row["est_actif"] is True
+    assert row["jours_restants"] == 10
+
+
+def test_facture_list_as_dicts_computes_delay(db_session):
+    client_id = _make_client(db_session).id
+    contrat_id = db_session.scalar(
+        select(Contrat.id).where(Contrat.client_id == client_id)
+    )
+    db_session.add(
+        Facture(
+            numero_facture=f"F-{uuid4().hex[:8]}",
+            date_emission=date.today() - timedelta(days=40),
+            date_echeance=date.today() - timedelta(days=5),
+            montant_ht=100,
+            montant_ttc=120,
+            contrat_id=contrat_id,
+        )
+    )
+    db_session.commit()
+
+    (row,) = Facture.list_as_dicts(db_session, contrat_id=contrat_id)
+    assert row["statut_paiement"] == "en_attente"
+    assert row["montant_ttc"] == 120.0
+    assert (row["est_en_retard"], row["jours_retard"]) == (True, 5)
+
+
+@pytest.mark.parametrize("model", [Intervention, Equipement, User])
+def test_nested_client_serialises_without_kpi_collections(
+    db_session, model, monkeypatch
+):
+    # Parties sans lien avec le client, cassées indépendamment (Planning et
+    # Intervention non importés, colonne Notification.lue absente)
+    monkeypatch.setattr(Equipement, "get_planning_maintenance", lambda self: [])
+    monkeypatch.setattr(Equipement, "peut_etre_supprime", lambda self: False)
+    monkeypatch.setattr(User, "notifications_non_lues", 0)
+    client = _make_client(db_session)
+    client_id = client.id
+    db_session.expire_all()
+
+    if model is User:
+        obj = db_session.get(User, client.user_id)
+        obj.full_name = "Contact Client"
+    elif model is Equipement:
+        # statut / criticite en enum : to_dict lit .value
+        obj = Equipement(
+            nom="eq3",
+            type="t",
+            type_equipement="t",
+            localisation="l",
+            client_id=client_id,
+            statut=StatutEquipement.operationnel,
+            criticite=CriticiteEquipement.standard,
+        )
+        db_session.add(obj)
+        db_session.flush()
+    else:
+        obj = db_session.scalars(
+            select(Intervention).where(Intervention.client_id == client_id).limit(1)
+        ).first()
+    data = obj.to_dict(include_relations=True)
+    assert data["client"]["id"] == client_id
+    assert "nb_interventions_total" not in data["client"]
@@ -0,0 +1,8 @@
+from app.core.config import Settings
+
+
+def test_cors_lists_are_frozen_and_origins_exposed_as_set():
+    settings = Settings(CORS_ALLOW_ORIGINS=["https://a.ma", "https://b.ma"])
+    assert settings.CORS_ALLOW_ORIGINS == ("https://a.ma", "https://b.ma")
+    assert isinstance(settings.CORS_ALLOW_METHODS, tuple)
+    assert settings.cors_allow_origins_set == frozenset({"https://a.ma", "https://b.ma"})
@@ -0,0 +1,46 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.contrat import Facture, StatutPaiement
+from app.models.document import Document
+
+
+def _facture(**overrides):
+    values = dict(
+        id=1,
+        numero_facture="FAC-0001",
+        date_emission=date(2026, 1, 1),
+        date_echeance=date.today() + timedelta(days=30),
+        montant_ht=Decimal("100.00"),
+        taux_tva=Decimal("20.00"),
+        montant_ttc=Decimal("120.00"),
+        statut_paiement=StatutPaiement.en_attente,
+        date_creation=datetime(2026, 1, 1, 8, 30),
+        contrat_id=1,
+    )
+    values.update(overrides)
+    return Facture(**values)
+
+
+def test_facture_to_dict_keeps_dates_for_the_encoder():
+    data = _facture().to_dict()
+
+    # Dates laissées telles quelles, encodées en ISO 8601 par FastAPI
+    assert data["date_emission"] == date(2026, 1, 1)
+    assert data["date_paiement"] is None
+    encoded = jsonable_encoder(data)
+    assert encoded["date_emission"] == "2026-01-01"
+    assert encoded["date_creation"] == "2026-01-01T08:30:00"
+    assert encoded["montant_ttc"] == 120.0
+
+
+def test_document_to_dict_keeps_upload_date():
+    uploaded = datetime(2026, 2, 3, 4, 5, 6)
+    doc = Document(id=1, nom_fichier="a.pdf", chemin="static/uploads/a.pdf")
+    doc.date_upload = uploaded
+
+    data = doc.to_dict()
+    assert data["date_upload"] is uploaded
+    assert jsonable_encoder(data)["date_upload"] == uploaded.isoformat()
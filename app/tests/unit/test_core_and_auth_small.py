@@ -63,8 +63,8 @@ def test_decode_token_invalid(monkeypatch):
 
     monkeypatch.setattr(
         rbac,
-        "jwt",
-        type("J", (), {"decode": lambda *a, **k: (_ for _ in ()).throw(JWTError())}),
+        "decode_jwt",
+        lambda *a, **k: (_ for _ in ()).throw(JWTError()),
     )
     with pytest.raises(HTTPException):
         decode_token("bad-token")
@@ -82,6 +82,21 @@ def test_get_current_user_fallback(monkeypatch):
     assert user["user_id"] == 42
 
 
+
+def test_get_current_user_non_ascii_digit_sub_is_not_an_id(monkeypatch):
+    # "١٢".isdigit() est vrai et int("١٢") == 12 : ne doit pas viser l'id 12
+    monkeypatch.setattr(
+        "app.core.rbac.decode_token", lambda token: {"sub": "١٢", "role": "client"}
+    )
+    looked_up = []
+    monkeypatch.setattr(
+        "app.services.user_service.get_user_by_id",
+        lambda db, uid: looked_up.append(uid),
+    )
+    user = get_current_user(token="t", db=DummyDB())
+    assert looked_up == []
+    assert user["user_id"] is None
+    assert user["email"] == "١٢"
 # auth_service error paths
 def test_auth_service_invalid_password(monkeypatch):
     dummy = DummyUser()
@@ -0,0 +1,62 @@
+import json
+import logging
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.api.middleware import CorrelationIdMiddleware, get_correlation_id
+from app.core.correlation import correlation_id_var
+from app.core.logging import JSONFormatter
+
+
+def _client():
+    app = FastAPI()
+    app.add_middleware(CorrelationIdMiddleware)
+
+    @app.get("/ping")
+    def ping(request: Request):
+        return {"trace_id": request.state.trace_id, "context": get_correlation_id()}
+
+    return TestClient(app)
+
+
+def test_correlation_id_propagates_incoming_header():
+    response = _client().get("/ping", headers={"X-Request-ID": "abc-123"})
+    assert response.json() == {"trace_id": "abc-123", "context": "abc-123"}
+    assert response.headers["X-Request-ID"] == "abc-123"
+
+
+def test_correlation_id_generated_when_missing():
+    response = _client().get("/ping")
+    trace_id = response.json()["trace_id"]
+    assert trace_id
+    assert response.headers["X-Request-ID"] == trace_id
+
+
+def test_correlation_id_context_reset_after_request():
+    _client().get("/ping", headers={"X-Request-ID": "abc-123"})
+    assert get_correlation_id() == ""
+
+
+def test_app_returns_one_request_id_per_request(client):
+    assert CorrelationIdMiddleware in {m.cls for m in client.app.user_middleware}
+    response = client.get("/", headers={"X-Request-ID": "abc-123"})
+    assert response.headers["X-Request-ID"] == "abc-123"
+
+    # Id généré : le même dans l'en-tête et dans le corps d'erreur
+    response = client.get("/api/v1/documents/")
+    assert response.status_code == 401
+    assert response.headers["X-Request-ID"]
+    assert response.json()["error"]["trace_id"] == response.headers["X-Request-ID"]
+
+
+def test_json_log_carries_correlation_id():
+    record = logging.LogRecord("app", logging.INFO, __file__, 1, "msg", None, None)
+    assert "correlation_id" not in json.loads(JSONFormatter().format(record))
+
+    token = correlation_id_var.set("abc-123")
+    try:
+        entry = json.loads(JSONFormatter().format(record))
+    finally:
+        correlation_id_var.reset(token)
+    assert entry["correlation_id"] == "abc-123"
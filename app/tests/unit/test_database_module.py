@@ -38,3 +38,38 @@ def test_get_db_generator(monkeypatch):
             next(gen)
         except StopIteration:
             pass
+
+
+def test_sessionlocal_skips_create_all_once_schema_initialized(monkeypatch):
+    calls = []
+    monkeypatch.setattr(database, "_schema_initialized", True)
+    monkeypatch.setattr(
+        database.Base.metadata, "create_all", lambda *a, **k: calls.append(1)
+    )
+    sess = database.SessionLocal()
+    sess.close()
+    assert calls == []
+
+
+def test_sessionlocal_keeps_objects_loaded_after_commit():
+    sess = database.SessionLocal()
+    try:
+        assert sess.expire_on_commit is False
+    finally:
+        sess.close()
+
+
+def test_init_db_runs_alembic_upgrade_outside_sqlite(monkeypatch):
+    from alembic import command
+
+    from app.db import init_db as init_db_module
+
+    calls = []
+    monkeypatch.setattr(init_db_module, "_IS_SQLITE", False)
+    monkeypatch.setattr(
+        command, "upgrade", lambda cfg, rev: calls.append((cfg, rev))
+    )
+    init_db_module.init_db()
+    (cfg, rev), = calls
+    assert rev == "head"
+    assert cfg.get_main_option("script_location").endswith("migrations")
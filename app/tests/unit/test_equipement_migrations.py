@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config
+
+ROOT = Path(__file__).resolve().parents[3]
+
+
+@pytest.mark.parametrize(
+    "siblings",
+    [("a30f987678fe", "8cafe646bd2e"), ("8cafe646bd2e", "a30f987678fe")],
+)
+def test_equipement_sibling_revisions_run_in_either_order(
+    tmp_path, monkeypatch, siblings
+):
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    monkeypatch.chdir(ROOT)
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("sqlalchemy.url", url)
+
+    command.upgrade(config, "df44b376bc8a")
+    engine = sa.create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(
+            sa.text(
+                "INSERT INTO equipements (nom, type, localisation, "
+                "frequence_entretien) VALUES ('e1', 'pompe', 'l', '30')"
+            )
+        )
+    for revision in siblings:
+        command.upgrade(config, revision)
+
+    with engine.connect() as conn:
+        columns = {c["name"] for c in sa.inspect(conn).get_columns("equipements")}
+        row = conn.execute(
+            sa.text(
+                "SELECT type_equipement, frequence_entretien_jours FROM equipements"
+            )
+        ).one()
+    engine.dispose()
+    assert {"type", "frequence_entretien"}.isdisjoint(columns)
+    assert tuple(row) == ("pompe", 30)
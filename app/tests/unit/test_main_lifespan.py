@@ -0,0 +1,44 @@
+import sys
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+
+
+class _FakeScheduler:
+    def __init__(self):
+        self.jobs = {}
+        self.started = False
+        self.stopped = False
+
+    def get_job(self, job_id):
+        return self.jobs.get(job_id)
+
+    def add_job(self, func, trigger, hours, id):
+        self.jobs[id] = func
+
+    def start(self):
+        self.started = True
+
+    def shutdown(self, wait=True):
+        self.stopped = True
+
+
+def test_lifespan_starts_and_stops_scheduler_when_enabled(monkeypatch):
+    fake = _FakeScheduler()
+    module = SimpleNamespace(scheduler=fake, run_planning_generation=lambda: None)
+    monkeypatch.setitem(sys.modules, "app.tasks.scheduler", module)
+    monkeypatch.setattr(settings, "ENABLE_SCHEDULER", True)
+
+    with TestClient(app):
+        assert app.state.scheduler is fake
+        assert fake.started and "planning_job" in fake.jobs
+    assert fake.stopped
+
+
+def test_lifespan_skips_scheduler_when_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "ENABLE_SCHEDULER", False)
+    with TestClient(app):
+        assert app.state.scheduler is None
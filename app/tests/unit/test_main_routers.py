@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import _include_routers
+
+
+def _router(prefix, path):
+    router = APIRouter(prefix=prefix)
+
+    @router.get(path)
+    def endpoint():
+        return {}
+
+    return SimpleNamespace(router=router)
+
+
+def _client(mount_legacy):
+    app = FastAPI()
+    routers = {"users": _router("/users", "/me"), "health": _router("", "/health")}
+    _include_routers(app, routers, mount_legacy)
+    return TestClient(app)
+
+
+def test_include_routers_without_legacy_keeps_health_at_root():
+    client = _client(mount_legacy=False)
+    prefix = settings.API_V1_STR
+    assert client.get(f"{prefix}/users/me").status_code == 200
+    assert client.get(f"{prefix}/health").status_code == 200
+    assert client.get("/health").status_code == 200
+    assert client.get("/users/me").status_code == 404
+
+
+def test_include_routers_with_legacy_mounts_all_at_root():
+    client = _client(mount_legacy=True)
+    assert client.get("/users/me").status_code == 200
+    assert client.get("/health").status_code == 200
+
+
+def test_legacy_rewrite_ignores_unknown_segments():
+    client = _client(mount_legacy=True)
+    assert client.get("/usersx/me").status_code == 404
+
+
+def test_create_app_is_built_once():
+    from app.main import app, create_app
+
+    assert create_app() is app
@@ -0,0 +1,15 @@
+import pytest
+
+import app.models as models
+
+
+def test_lazy_exports_resolve_to_submodule_objects():
+    from app.models.contrat import Facture
+
+    assert models.Facture is Facture
+    assert set(models.__all__) <= set(dir(models))
+
+
+def test_unknown_export_raises_attribute_error():
+    with pytest.raises(AttributeError):
+        models.DoesNotExist
@@ -0,0 +1,20 @@
+from app.core.password_policy import is_password_valid, validate_password_strength
+
+
+def test_validate_password_strength_lists_every_failure():
+    errors = validate_password_strength("abc")
+    assert len(errors) == 4
+    assert validate_password_strength("Complexe123!") == []
+
+
+def test_is_password_valid_matches_strength_check():
+    for password in ("abc", "password", "Complexe123!", "NoDigits!!", "admin"):
+        assert is_password_valid(password) == (
+            validate_password_strength(password) == []
+        )
+
+
+def test_common_passwords_are_rejected_case_insensitively():
+    assert "Ce mot de passe est trop courant et n'est pas autorisé" in (
+        validate_password_strength("PassWord123")
+    )
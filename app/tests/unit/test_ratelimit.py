@@ -0,0 +1,42 @@
+from app.core import ratelimit
+
+
+def test_register_hit_limits_within_window(monkeypatch):
+    monkeypatch.setattr(ratelimit, "_hits", ratelimit.OrderedDict())
+    now = 1000.0
+    for _ in range(ratelimit.LIMIT):
+        assert ratelimit._register_hit("1.2.3.4", now) is False
+    assert ratelimit._register_hit("1.2.3.4", now) is True
+    # Once the window has elapsed the client is allowed again
+    assert ratelimit._register_hit("1.2.3.4", now + ratelimit.WINDOW) is False
+
+
+def test_register_hit_evicts_least_recent_clients(monkeypatch):
+    monkeypatch.setattr(ratelimit, "_hits", ratelimit.OrderedDict())
+    monkeypatch.setattr(ratelimit, "MAX_TRACKED_CLIENTS", 2)
+    ratelimit._register_hit("a", 1.0)
+    ratelimit._register_hit("b", 1.0)
+    ratelimit._register_hit("a", 2.0)
+    ratelimit._register_hit("c", 3.0)
+    assert list(ratelimit._hits) == ["a", "c"]
+
+
+def test_middleware_rejects_over_limit_with_retry_after(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(ratelimit, "_hits", ratelimit.OrderedDict())
+    monkeypatch.setattr(ratelimit, "LIMIT", 1)
+    app = FastAPI()
+    app.add_middleware(ratelimit.RateLimitMiddleware)
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert client.get("/ping").status_code == 200
+    response = client.get("/ping")
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Too Many Requests"}
+    assert response.headers["retry-after"] == str(ratelimit.WINDOW)
@@ -0,0 +1,40 @@
+from datetime import date, datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.middleware import RequestClockMiddleware
+from app.core.clock import request_now_var, request_today_var, today, utcnow
+
+
+def test_request_clock_freezes_now_for_the_request():
+    app = FastAPI()
+    app.add_middleware(RequestClockMiddleware)
+
+    @app.get("/now")
+    def now():
+        first = utcnow()
+        return {"stable": first == utcnow(), "set": request_now_var.get() is not None}
+
+    response = TestClient(app).get("/now")
+    assert response.json() == {"stable": True, "set": True}
+    assert request_now_var.get() is None
+
+
+def test_utcnow_outside_request_reads_the_clock():
+    before = datetime.utcnow()
+    assert before <= utcnow() <= datetime.utcnow()
+
+
+def test_today_is_frozen_for_the_request():
+    app = FastAPI()
+    app.add_middleware(RequestClockMiddleware)
+
+    @app.get("/today")
+    def current_day():
+        return {"stable": today() == today(), "set": request_today_var.get()}
+
+    response = TestClient(app).get("/today")
+    assert response.json()["stable"] is True
+    assert response.json()["set"] == date.today().isoformat()
+    assert request_today_var.get() is None
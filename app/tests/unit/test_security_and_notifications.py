@@ -3,6 +3,8 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 from fastapi import HTTPException
+from jose import JWTError, jws, jwt
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError
 
 from app.core import security
 
@@ -14,6 +16,12 @@ def test_password_hash_and_verify():
     assert security.verify_password(pw, h)
 
 
+def test_verify_password_rejects_wrong_password_and_accepts_bytes_hash():
+    h = security.get_password_hash("Secret123!")
+    assert not security.verify_password("Secret123?", h)
+    assert security.verify_password("Secret123!", h.encode())
+
+
 def test_password_policy_enforces_complexity():
     with pytest.raises(HTTPException):
         security.validate_password_policy("weakpass")
@@ -37,6 +45,70 @@ def test_verify_token_invalid():
         security.verify_token("invalid.token")
 
 
+def test_verify_token_rejects_expired_and_tampered_tokens():
+    expired = security.create_access_token(
+        {"sub": "1"}, expires_delta=timedelta(minutes=-1)
+    )
+    with pytest.raises(HTTPException):
+        security.verify_token(expired)
+
+    token = security.create_access_token({"sub": "1"})
+    header, payload, signature = token.split(".")
+    with pytest.raises(HTTPException):
+        security.verify_token(f"{header}.{payload}.{signature[::-1]}")
+
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [
+        {"sub": "1", "exp": 4102444800, "iat": 0, "nbf": 0},
+        {"sub": "1", "exp": 1},
+        {"sub": "1", "nbf": 4102444800},
+        {"sub": 1},
+        {"sub": "1", "exp": "demain"},
+        {"sub": "1", "aud": "autre-service"},
+    ],
+)
+def test_decode_jwt_validates_claims_like_jose(claims):
+    token = jwt.encode(claims, "cle", algorithm="HS256")
+    try:
+        expected = jwt.decode(token, "cle", algorithms=["HS256"])
+    except JWTError as exc:
+        with pytest.raises(type(exc)):
+            security.decode_jwt(token, "cle", algorithms=["HS256"])
+    else:
+        assert security.decode_jwt(token, "cle", algorithms=["HS256"]) == expected
+
+
+
+@pytest.mark.parametrize(
+    "claims, error, message",
+    [
+        ({"sub": "1", "exp": 1}, ExpiredSignatureError, "Signature has expired."),
+        ({"sub": "1", "nbf": 4102444800}, JWTClaimsError, "not yet valid"),
+        ({"sub": "1", "exp": "demain"}, JWTClaimsError, "exp must be an integer"),
+        ({"sub": "1", "iat": True}, JWTClaimsError, "iat must be an integer"),
+        ({"sub": 12}, JWTClaimsError, "Subject must be a string."),
+        ({"sub": "1", "aud": "autre-service"}, JWTClaimsError, "Invalid audience"),
+    ],
+)
+def test_decode_jwt_rejections_are_pinned(claims, error, message):
+    token = jwt.encode(claims, "cle", algorithm="HS256")
+    with pytest.raises(error, match=message):
+        security.decode_jwt(token, "cle", algorithms=["HS256"])
+
+
+def test_decode_jwt_rejects_bad_signature_and_non_object_payload():
+    token = jwt.encode({"sub": "1"}, "cle", algorithm="HS256")
+    with pytest.raises(JWTError):
+        security.decode_jwt(token, "autre-cle", algorithms=["HS256"])
+
+    not_a_dict = jws.sign(b"[1, 2]", "cle", algorithm="HS256")
+    with pytest.raises(JWTError, match="must be a json object"):
+        security.decode_jwt(not_a_dict, "cle", algorithms=["HS256"])
+
+
 def test_send_email_template_not_found():
     # Test that HTTPException is raised when template is not found
     from jinja2 import TemplateNotFound
@@ -88,4 +160,37 @@ def test_send_email_smtp_failure():
         with pytest.raises(HTTPException):
             send_email_notification(
                 "to@example.com", dummy, env_param=mock_env_instance
-            )
\ No newline at end of file
+            )
+
+def test_reload_keys_uses_rsa_key_files(tmp_path, monkeypatch):
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_path = tmp_path / "private.pem"
+    public_path = tmp_path / "public.pem"
+    private_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    public_path.write_bytes(
+        key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    monkeypatch.setattr(security.settings, "JWT_ALGORITHM", "RS256")
+    monkeypatch.setattr(security.settings, "JWT_PRIVATE_KEY_PATH", str(private_path))
+    monkeypatch.setattr(security.settings, "JWT_PUBLIC_KEY_PATH", str(public_path))
+    try:
+        security.reload_keys()
+        token = security.create_access_token({"sub": "1"})
+        assert security.verify_token(token)["sub"] == "1"
+        assert security._SIGNING_ALG == "RS256"
+    finally:
+        monkeypatch.undo()
+        security.reload_keys()
+    assert security._SIGNING_ALG == security.settings.ALGORITHM
@@ -0,0 +1,134 @@
+from app.core.span_processors import RoundRobinSpanProcessor
+
+
+class _RecordingProcessor:
+    def __init__(self):
+        self.spans = []
+        self.flushed = False
+        self.closed = False
+
+    def on_end(self, span):
+        self.spans.append(span)
+
+    def force_flush(self, timeout_millis=30000):
+        self.flushed = True
+        return True
+
+    def shutdown(self):
+        self.closed = True
+
+
+def test_round_robin_processor_spreads_spans_and_fans_out_lifecycle():
+    first, second = _RecordingProcessor(), _RecordingProcessor()
+    processor = RoundRobinSpanProcessor([first, second])
+    for span in ("a", "b", "c"):
+        processor.on_end(span)
+    assert first.spans == ["a", "c"]
+    assert second.spans == ["b"]
+
+    assert processor.force_flush() is True
+    processor.shutdown()
+    assert first.flushed and second.flushed
+    assert first.closed and second.closed
+
+
+def test_initialize_tracing_is_noop_under_pytest():
+    from app.core.tracing import TracingService
+
+    service = TracingService()
+    service.initialize_tracing()
+    assert service.instrumented is True
+    assert service.tracer_provider is None
+    span = service.create_span("noop")
+    assert span is not None and not span.is_recording()
+
+
+def test_instrumentation_skipped_without_exporter(monkeypatch):
+    import app.core.tracing as tracing
+
+    monkeypatch.delitem(tracing.sys.modules, "pytest")
+    monkeypatch.setattr(tracing.settings, "ENVIRONMENT", "development")
+    monkeypatch.setattr(tracing.settings, "DEBUG", False)
+    monkeypatch.setattr(tracing, "_OTLP_ENDPOINT", None)
+    monkeypatch.setattr(tracing.trace, "set_tracer_provider", lambda provider: None)
+    calls = []
+    monkeypatch.setattr(
+        tracing.TracingService,
+        "_setup_instrumentations",
+        lambda self, app=None: calls.append(app),
+    )
+
+    service = tracing.TracingService()
+    service.initialize_tracing()
+    assert service.instrumented is True
+    assert service._has_exporter is False
+    assert calls == []
+
+
+def test_add_span_attributes_sets_mapping_in_one_call():
+    from app.core.tracing import TracingService
+
+    class _Span:
+        def __init__(self):
+            self.calls = []
+
+        def set_attributes(self, attributes):
+            self.calls.append(attributes)
+
+    span = _Span()
+    TracingService().add_span_attributes(span, {"user.id": 1, "route": "/x"})
+    assert span.calls == [{"user.id": 1, "route": "/x"}]
+
+
+def test_fastapi_instrumentation_passes_excluded_urls_without_touching_env(
+    monkeypatch,
+):
+    import os
+
+    from opentelemetry.instrumentation import requests, sqlalchemy
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
+    from app.core.tracing import TracingService
+
+    monkeypatch.delenv("OTEL_PYTHON_FASTAPI_EXCLUDED_URLS", raising=False)
+    calls = []
+    monkeypatch.setattr(
+        FastAPIInstrumentor,
+        "instrument_app",
+        staticmethod(lambda app, **kwargs: calls.append(kwargs)),
+    )
+    monkeypatch.setattr(
+        sqlalchemy.SQLAlchemyInstrumentor, "instrument", lambda self, **kw: None
+    )
+    monkeypatch.setattr(
+        requests.RequestsInstrumentor, "instrument", lambda self, **kw: None
+    )
+
+    TracingService()._setup_instrumentations(app=object())
+    assert calls[0]["excluded_urls"] == "/health,/live,/ready,/metrics"
+    assert "OTEL_PYTHON_FASTAPI_EXCLUDED_URLS" not in os.environ
+
+
+
+def test_sdk_not_imported_without_exporter():
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    # Processus neuf : le SDK déjà chargé par les autres tests ne compte pas
+    code = (
+        "import sys\n"
+        "from app.core.tracing import TracingService\n"
+        "TracingService().initialize_tracing()\n"
+        "assert 'opentelemetry.sdk.trace' not in sys.modules\n"
+    )
+    env = {**os.environ, "OTEL_EXPORTER_OTLP_ENDPOINT": "", "DEBUG": "false"}
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parents[3],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
@@ -95,6 +95,7 @@ def test_update_deactivate_reactivate(monkeypatch):
 def test_database_create_engine_fallback(monkeypatch):
     # Simulate absence of pytest in sys.modules so function tries create_engine
     monkeypatch.delitem(__import__("sys").modules, "pytest", raising=False)
+    monkeypatch.delenv("PYTEST_CURRENT_TEST", raising=False)
     # Force sqlalchemy.create_engine to raise to trigger fallback
     import sqlalchemy
 
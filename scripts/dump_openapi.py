@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Script pour pré-générer le schéma OpenAPI de l'API (servi via OPENAPI_SCHEMA_FILE).
+Usage: python scripts/dump_openapi.py [chemin de sortie, défaut: openapi.json]
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.main import app  # noqa: E402
+
+
+def main():
+    output = Path(sys.argv[1] if len(sys.argv) > 1 else "openapi.json")
+    # Génération forcée : ignore un schéma déjà chargé depuis OPENAPI_SCHEMA_FILE
+    app.openapi_schema = None
+    output.write_text(
+        json.dumps(app.openapi(), ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    print(f"✅ Schéma OpenAPI écrit dans {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,3 +16,18 @@ def test_require_roles_denies_wrong_role():
     with pytest.raises(Exception):
         checker(current_user=user)
 
+
+
+def test_require_roles_returns_cached_checker_regardless_of_order():
+    assert require_roles("admin", "responsable") is require_roles(
+        "responsable", "admin"
+    )
+    assert require_roles("admin") is not require_roles("technicien")
+
+
+def test_require_roles_accepts_enum_roles():
+    from app.models.user import UserRole
+
+    checker = require_roles("admin")
+    user = {"role": UserRole.admin}
+    assert checker(current_user=user) is user